@@ -2,8 +2,10 @@
 Main application entry point.
 """
 
+import argparse
 import asyncio
 import sys
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
@@ -69,10 +71,86 @@ async def main() -> None:
         logger.info("Application shutdown complete")
 
 
+def _parse_datetime(value: str) -> datetime:
+    """Parse a CLI date or datetime argument."""
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"Invalid date: {value} (expected YYYY-MM-DD [HH:MM[:SS]])")
+
+
+def _parse_end_datetime(value: str) -> datetime:
+    """Parse a CLI range end; a bare date includes the whole day."""
+    moment = _parse_datetime(value)
+    if len(value.strip()) == len("YYYY-MM-DD"):
+        moment = moment.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return moment
+
+
+def _format_ts(ts: Optional[float]) -> str:
+    """Format a history timestamp for output."""
+    if ts is None:
+        return "?"
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _format_duration(seconds: float) -> str:
+    """Format a duration as days/hours/minutes."""
+    minutes = int(seconds // 60)
+    days, minutes = divmod(minutes, 24 * 60)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f"{days}d {hours}h {minutes}m"
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
+
+
+def run_history_command(args: argparse.Namespace) -> int:
+    """Answer stock history queries from the indexed history segments."""
+    from roblox_garden.history.index import HistoryIndex
+    
+    settings = Settings()
+    index = HistoryIndex(args.history_dir or settings.history_dir)
+    
+    if not index.segment_names:
+        print(f"No history found in {index.history_dir}")
+        return 1
+    
+    if args.query == "last":
+        postings = index.last_in_stock(args.item)
+        if postings is None:
+            print(f"{args.item}: never seen in stock")
+            return 1
+        
+        interval = postings.intervals[-1]
+        if interval.end is None:
+            print(f"{postings.name} [{postings.rarity}]: in stock since {_format_ts(interval.start)}")
+        else:
+            print(
+                f"{postings.name} [{postings.rarity}]: last in stock "
+                f"{_format_ts(interval.start)} - {_format_ts(interval.end)}"
+            )
+    
+    elif args.query == "appearances":
+        appearances = index.appearances(args.since, args.until, args.rarity, args.item)
+        for postings, interval in appearances:
+            end = "now" if interval.end is None else _format_ts(interval.end)
+            print(f"{_format_ts(interval.start)} - {end}  {postings.name} [{postings.rarity}]")
+        print(f"Total: {len(appearances)}")
+    
+    elif args.query == "droughts":
+        for postings, gap, ongoing in index.longest_droughts()[:args.top]:
+            suffix = " (ongoing)" if ongoing else ""
+            print(f"{postings.name} [{postings.rarity}]: {_format_duration(gap)}{suffix}")
+    
+    return 0
+
+
 def cli() -> None:
     """CLI entry point."""
-    import argparse
-    
     parser = argparse.ArgumentParser(description="Roblox Garden WebSocket Parser")
     parser.add_argument(
         "--debug",
@@ -80,8 +158,46 @@ def cli() -> None:
         help="Enable debug mode"
     )
     
+    subparsers = parser.add_subparsers(dest="command")
+    history_parser = subparsers.add_parser("history", help="Query stock history")
+    history_parser.add_argument(
+        "--history-dir",
+        help="History directory (defaults to HISTORY_DIR)"
+    )
+    queries = history_parser.add_subparsers(dest="query", required=True)
+    
+    last_parser = queries.add_parser("last", help="Last time an item was in stock")
+    last_parser.add_argument("item", help="Item name, e.g. \"Giant Pinecone\"")
+    
+    appearances_parser = queries.add_parser("appearances", help="Stock appearances in a time range")
+    appearances_parser.add_argument("--since", type=_parse_datetime, help="Start date (YYYY-MM-DD [HH:MM])")
+    appearances_parser.add_argument("--until", type=_parse_end_datetime, help="End date (YYYY-MM-DD [HH:MM])")
+    appearances_parser.add_argument("--rarity", help="Only items of this rarity, e.g. Prismatic")
+    appearances_parser.add_argument("--item", help="Only this item")
+    
+    droughts_parser = queries.add_parser("droughts", help="Longest time out of stock per item")
+    droughts_parser.add_argument("--top", type=int, default=50, help="Number of items to show")
+    
+    fake_api_parser = subparsers.add_parser("fake-api", help="Run a local fake Telegram Bot API server")
+    fake_api_parser.add_argument("--host", default="127.0.0.1")
+    fake_api_parser.add_argument("--port", type=int, default=8081)
+    fake_api_parser.add_argument("--latency", type=float, default=0.05, help="Answer delay in seconds")
+    fake_api_parser.add_argument("--jitter", type=float, default=0.02, help="Random extra delay in seconds")
+    
     args = parser.parse_args()
     
+    if args.command == "history":
+        sys.exit(run_history_command(args))
+    
+    if args.command == "fake-api":
+        from roblox_garden.telegram.fake_server import serve
+        
+        try:
+            asyncio.run(serve(args.host, args.port, args.latency, args.jitter))
+        except KeyboardInterrupt:
+            pass
+        return
+    
     if args.debug:
         import os
         os.environ["LOG_LEVEL"] = "DEBUG"
@@ -2,7 +2,7 @@
 Application settings and configuration.
 """
 
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
@@ -49,6 +49,34 @@ class Settings(BaseSettings):
     shop_update_interval: int = Field(default=300, alias="SHOP_UPDATE_INTERVAL")
     shop_check_interval: int = Field(default=30, alias="SHOP_CHECK_INTERVAL")
     
+    # Telegram rate limits applied by the delivery queue
+    telegram_global_rate: float = Field(
+        default=25.0,
+        alias="TELEGRAM_GLOBAL_RATE",
+        description="Messages per second across all chats"
+    )
+    telegram_chat_rate_per_minute: float = Field(default=20.0, alias="TELEGRAM_CHAT_RATE_PER_MINUTE")
+    telegram_chat_burst: float = Field(default=3.0, alias="TELEGRAM_CHAT_BURST")
+    telegram_send_workers: int = Field(default=4, alias="TELEGRAM_SEND_WORKERS")
+    # Bot API server, e.g. a local fake one (python -m roblox_garden fake-api)
+    telegram_api_url: Optional[str] = Field(default=None, alias="TELEGRAM_API_URL")
+    # Extra bot tokens sharing the load, e.g. TELEGRAM_EXTRA_BOT_TOKENS='["123:abc", "456:def"]'
+    telegram_extra_bot_tokens: List[str] = Field(default_factory=list, alias="TELEGRAM_EXTRA_BOT_TOKENS")
+    telegram_pool_throttle_threshold: float = Field(
+        default=10.0,
+        alias="TELEGRAM_POOL_THROTTLE_THRESHOLD",
+        description="Flood wait in seconds that, hitting several chats of a token at once, moves its chats to other tokens meanwhile"
+    )
+    telegram_broadcast_concurrency: int = Field(
+        default=10,
+        alias="TELEGRAM_BROADCAST_CONCURRENCY",
+        description="Chats a broadcast queues at the same time (calls in flight are bounded by TELEGRAM_SEND_WORKERS)"
+    )
+    
+    # Seconds after the first detection during which further new items are
+    # merged into the same alert (0 sends every detection right away)
+    alert_coalesce_window: float = Field(default=2.0, alias="ALERT_COALESCE_WINDOW")
+    
     # Report Configuration
     full_report_interval: int = Field(
         default=5, 
@@ -63,9 +91,103 @@ class Settings(BaseSettings):
         description="Seconds to wait after scheduled time to ensure data is updated"
     )
     
+    # Full report delivery: "post" sends a new message every interval,
+    # "edit" keeps one pinned message and edits it when the stock changes
+    full_report_mode: Literal["post", "edit"] = Field(default="post", alias="FULL_REPORT_MODE")
+    live_board_state_file: Optional[str] = Field(
+        default="data/live_board.json",
+        alias="LIVE_BOARD_STATE_FILE"
+    )
+    live_board_repost_on_rotation: bool = Field(
+        default=False,
+        alias="LIVE_BOARD_REPOST_ON_ROTATION",
+        description="In edit mode, post and pin a new message when the stock changed"
+    )
+    
+    # Restock forecast shown for out-of-stock items in full reports
+    shop_rotation_minutes: int = Field(
+        default=5,
+        alias="SHOP_ROTATION_MINUTES",
+        description="Length of one shop rotation (restock period), independent of the report interval"
+    )
+    forecast_enabled: bool = Field(default=True, alias="FORECAST_ENABLED")
+    forecast_horizon_rotations: int = Field(
+        default=3,
+        alias="FORECAST_HORIZON_ROTATIONS",
+        description="Number of upcoming shop rotations the restock odds cover"
+    )
+    forecast_min_rotations: int = Field(
+        default=12,
+        alias="FORECAST_MIN_ROTATIONS",
+        description="Observed rotations required before odds are shown"
+    )
+    forecast_state_file: Optional[str] = Field(
+        default="data/forecast_state.json",
+        alias="FORECAST_STATE_FILE"
+    )
+
+    # Declarative filter rules (JSON/YAML), reloaded on change or SIGHUP
+    filter_rules_file: Optional[str] = Field(default=None, alias="FILTER_RULES_FILE")
+    filter_rules_check_interval: int = Field(default=5, alias="FILTER_RULES_CHECK_INTERVAL")
+
+    # Per-node filter counters and timing, logged with every full report.
+    # While enabled the rules run as an uncompiled tree so every node is counted.
+    filter_stats_enabled: bool = Field(default=False, alias="FILTER_STATS_ENABLED")
+
+    # Per-channel subscriptions (JSON), matched through an inverted index
+    subscriptions_file: Optional[str] = Field(default=None, alias="SUBSCRIPTIONS_FILE")
+
+    # Subscriber mode: users DM the bot /subscribe <query> for personal alerts
+    subscriber_bot_enabled: bool = Field(default=False, alias="SUBSCRIBER_BOT_ENABLED")
+    subscriber_db_file: str = Field(default="data/subscribers.sqlite3", alias="SUBSCRIBER_DB_FILE")
+    subscriber_max_per_chat: int = Field(default=10, alias="SUBSCRIBER_MAX_PER_CHAT")
+
+    # Capacity of each event bus subscriber queue
+    event_queue_size: int = Field(default=100, alias="EVENT_QUEUE_SIZE")
+
+    # Stock history (used by `python -m roblox_garden history`)
+    history_enabled: bool = Field(default=True, alias="HISTORY_ENABLED")
+    history_dir: str = Field(default="data/history", alias="HISTORY_DIR")
+
+    # Language of the main channels and extra channels in other languages,
+    # e.g. LOCALE_CHANNELS='{"en": {"updates": "@garden_en", "full": "@garden_en_full"}}'
+    locale: str = Field(default="ru", alias="LOCALE")
+    locale_channels: Dict[str, Dict[str, str]] = Field(default_factory=dict, alias="LOCALE_CHANNELS")
+
+    # Durable outbox: rendered messages are stored before sending, retried
+    # while running and replayed on startup until Telegram acknowledges them
+    outbox_file: Optional[str] = Field(default="data/outbox.sqlite3", alias="OUTBOX_FILE")
+    outbox_replay_max_age: int = Field(
+        default=900,
+        alias="OUTBOX_REPLAY_MAX_AGE",
+        description="Seconds after which undelivered messages are dropped instead of replayed"
+    )
+    outbox_retry_interval: float = Field(
+        default=60.0,
+        alias="OUTBOX_RETRY_INTERVAL",
+        description="Seconds between retries of failed sends while running"
+    )
+
+    # Webhooks receiving stock events as JSON, e.g. WEBHOOK_URLS='["http://localhost:9000/garden"]'
+    webhook_urls: List[str] = Field(default_factory=list, alias="WEBHOOK_URLS")
+    webhook_secret: Optional[str] = Field(default=None, alias="WEBHOOK_SECRET")
+    webhook_batch_size: int = Field(default=50, alias="WEBHOOK_BATCH_SIZE")
+    webhook_flush_interval: float = Field(
+        default=1.0,
+        alias="WEBHOOK_FLUSH_INTERVAL",
+        description="Seconds events wait for more to share one POST"
+    )
+    webhook_timeout: float = Field(default=10.0, alias="WEBHOOK_TIMEOUT")
+
+    # Slowest alert cycles kept with their stage breakdown
+    latency_trace_slowest: int = Field(default=10, alias="LATENCY_TRACE_SLOWEST")
+
+    # Rendered messages kept per snapshot (LRU)
+    render_cache_size: int = Field(default=64, alias="RENDER_CACHE_SIZE")
+
     # Timezone
     timezone: str = Field(default="Europe/Moscow", alias="TIMEZONE")
-    
+
     # Logging Configuration
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
     log_file: Optional[str] = Field(default="logs/roblox_garden.log", alias="LOG_FILE")
@@ -4,8 +4,9 @@ Main application class that orchestrates all components.
 
 import asyncio
 import signal
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Set
+from typing import Optional, Dict, List, Set, Tuple
 
 try:
     from loguru import logger
@@ -15,10 +16,30 @@ except ImportError:
 
 from roblox_garden.config.settings import Settings
 from roblox_garden.models.shop import ShopItem, ShopData, ShopUpdate
-from roblox_garden.filters.item_filters import RobloxGardenFilter
+from roblox_garden.filters.rules import ReloadableFilter
+from roblox_garden.filters.subscriptions import SubscriptionIndex, SubscriptionsFile, SubscriptionStore
 from roblox_garden.websocket.client import WebSocketClient
 from roblox_garden.telegram.bot import TelegramBot
+from roblox_garden.telegram.delivery import Lane
+from roblox_garden.telegram.live_board import LiveBoard
+from roblox_garden.telegram.outbox import Outbox, OutboxEntry, make_key
+from roblox_garden.telegram.subscriber_bot import SubscriberBot
+from roblox_garden.sinks.base import FULL_REPORT, NEW_ITEMS, SUBSCRIPTION, SinkBatcher, SinkEvent
+from roblox_garden.sinks.webhook import WebhookSink
 from roblox_garden.utils.formatters import MessageFormatter
+from roblox_garden.utils.forecaster import RestockForecaster
+from roblox_garden.history.store import HistoryWriter
+from roblox_garden.core.coalescer import AlertCoalescer
+from roblox_garden.core.tracing import CycleTrace, LatencyTracer, current_trace
+from roblox_garden.core.events import (
+    Channel,
+    EventBus,
+    MessageRendered,
+    OverflowPolicy,
+    ReportDue,
+    SnapshotReceived,
+    StockChanged,
+)
 
 
 class RobloxGardenApp:
@@ -31,18 +52,89 @@ class RobloxGardenApp:
         # Core components
         self.websocket_client = WebSocketClient(settings)
         self.telegram_bot = TelegramBot(settings)
+        self.telegram_bot.on_chat_blocked = self._on_chat_blocked
         self.message_formatter = MessageFormatter(settings)
         
+        # Full report as a pinned message edited in place
+        self.live_board: Optional[LiveBoard] = None
+        if settings.full_report_mode == "edit":
+            self.live_board = LiveBoard(
+                self.telegram_bot,
+                settings.live_board_state_file,
+                repost_on_rotation=settings.live_board_repost_on_rotation
+            )
+        
+        # Rendered messages persisted until Telegram acknowledges them
+        self.outbox = Outbox(settings.outbox_file) if settings.outbox_file else None
+        # Outbox keys of messages being sent right now, skipped by retries
+        self._outbox_in_flight: Set[str] = set()
+        # Chats that blocked the bot, their pending DMs are given up
+        self._blocked_chats: Set[str] = set()
+        
         # Filters
-        self.item_filter = RobloxGardenFilter.create_combined_filter()
+        self.item_filter = ReloadableFilter(settings.filter_rules_file)
+        if settings.filter_stats_enabled:
+            self.item_filter.enable_stats()
+        
+        # Restock forecast model
+        self.forecaster = RestockForecaster.from_static_database(
+            rotation_minutes=settings.shop_rotation_minutes
+        )
+        if settings.forecast_enabled and settings.forecast_state_file:
+            self.forecaster.load(settings.forecast_state_file)
+        
+        # Stock history
+        self.history_writer = HistoryWriter(settings.history_dir) if settings.history_enabled else None
+        
+        # Per-channel subscriptions matched against raw stock changes
+        self.subscription_index = SubscriptionIndex()
+        if settings.subscriptions_file:
+            for subscription in SubscriptionsFile.load(settings.subscriptions_file).to_subscriptions():
+                self.subscription_index.add(subscription)
+            logger.info(f"Loaded {len(self.subscription_index)} channel subscriptions")
+        
+        # Personal subscriptions managed by users through bot commands
+        self.subscriber_bot: Optional[SubscriberBot] = None
+        if settings.subscriber_bot_enabled:
+            self.subscriber_bot = SubscriberBot(
+                self.telegram_bot,
+                SubscriptionStore(settings.subscriber_db_file),
+                self.subscription_index,
+                max_per_chat=settings.subscriber_max_per_chat
+            )
+            logger.info(f"Loaded {self.subscriber_bot.load()} user subscriptions")
+        
+        # Structured stock events for webhooks
+        self.sinks: List[SinkBatcher] = [
+            SinkBatcher(
+                WebhookSink(url, secret=settings.webhook_secret, timeout=settings.webhook_timeout),
+                batch_size=settings.webhook_batch_size,
+                flush_interval=settings.webhook_flush_interval
+            )
+            for url in settings.webhook_urls
+        ]
         
         # State tracking
         self.current_shop_data: Optional[ShopData] = None
         self.known_items: Dict[str, ShopItem] = {}
+        self.in_stock_names: Set[str] = set()
+        
+        # Fetch-to-acknowledgement latency of alerts
+        self.latency_tracer = LatencyTracer(settings.latency_trace_slowest)
+        
+        # New items detected within the window go out as one alert
+        self.alert_coalescer = AlertCoalescer(settings.alert_coalesce_window, self._send_new_items_update)
+        
+        # Event bus between ingestion, detection, rendering and delivery
+        self.event_bus = EventBus(default_maxsize=settings.event_queue_size)
+        self._setup_event_bus()
         
         # Tasks
         self.websocket_task: Optional[asyncio.Task] = None
         self.scheduler_task: Optional[asyncio.Task] = None
+        self.rules_watch_task: Optional[asyncio.Task] = None
+        self.subscriber_task: Optional[asyncio.Task] = None
+        self.outbox_retry_task: Optional[asyncio.Task] = None
         
         # Signal handling
         self._shutdown_event = asyncio.Event()
@@ -59,6 +151,14 @@ class RobloxGardenApp:
             
             # Initialize components
             await self.telegram_bot.initialize()
+            self.event_bus.start()
+            for sink in self.sinks:
+                await sink.start()
+            
+            # Resend messages left undelivered by the previous run
+            if self.outbox:
+                self.outbox.open()
+                await self._replay_outbox()
             
             # Send initial full report
             await self._send_initial_full_report()
@@ -66,6 +166,14 @@ class RobloxGardenApp:
             # Start background tasks
             self.websocket_task = asyncio.create_task(self._websocket_loop())
             self.scheduler_task = asyncio.create_task(self._scheduler_loop())
+            if self.subscriber_bot:
+                self.subscriber_task = asyncio.create_task(self.subscriber_bot.run())
+            if self.outbox:
+                self.outbox_retry_task = asyncio.create_task(self._outbox_retry_loop())
+            if self.settings.filter_rules_file:
+                self.rules_watch_task = asyncio.create_task(
+                    self.item_filter.watch(self.settings.filter_rules_check_interval)
+                )
             
             logger.info("🚀 Application started successfully! Press Ctrl+C to stop.")
             
@@ -109,6 +217,12 @@ class RobloxGardenApp:
             tasks_to_cancel.append(("WebSocket", self.websocket_task))
         if self.scheduler_task and not self.scheduler_task.done():
             tasks_to_cancel.append(("Scheduler", self.scheduler_task))
+        if self.rules_watch_task and not self.rules_watch_task.done():
+            tasks_to_cancel.append(("Filter rules watcher", self.rules_watch_task))
+        if self.subscriber_task and not self.subscriber_task.done():
+            tasks_to_cancel.append(("Subscriber bot", self.subscriber_task))
+        if self.outbox_retry_task and not self.outbox_retry_task.done():
+            tasks_to_cancel.append(("Outbox retry", self.outbox_retry_task))
         
         for task_name, task in tasks_to_cancel:
             logger.info(f"🔄 Cancelling {task_name} task...")
@@ -120,11 +234,40 @@ class RobloxGardenApp:
             except Exception as e:
                 logger.error(f"❌ Error cancelling {task_name} task: {e}")
         
+        # Let queued messages go out before closing connections
+        await self.alert_coalescer.stop()
+        await self.event_bus.stop()
+        self.event_bus.log_metrics()
+        self.latency_tracer.log_summary()
+        for sink in self.sinks:
+            await sink.stop()
+            sink.log_metrics()
+        if self.outbox:
+            await self.outbox.close()
+        self._log_filter_stats()
+        cache_stats = self.message_formatter.render_cache.stats()
+        logger.info(
+            f"🧾 Render cache: hits {cache_stats['hits']}, misses {cache_stats['misses']}, "
+            f"evictions {cache_stats['evictions']} ({cache_stats['hit_rate']:.0%} hit rate)"
+        )
+        
         # Shutdown components
         logger.info("🔌 Closing connections...")
         await self.websocket_client.close()
         await self.telegram_bot.shutdown()
         
+        if self.settings.forecast_enabled and self.settings.forecast_state_file:
+            try:
+                self.forecaster.save(self.settings.forecast_state_file)
+            except OSError as e:
+                logger.warning(f"Failed to save forecaster state: {e}")
+        
+        if self.history_writer:
+            self.history_writer.close()
+        
+        if self.subscriber_bot:
+            self.subscriber_bot.store.close()
+        
         logger.info("✅ Application shutdown complete")
         logger.info("👋 Goodbye!")
     
@@ -147,7 +290,7 @@ class RobloxGardenApp:
                     if not self.is_running or self._shutdown_event.is_set():
                         break
                     
-                    await self._process_shop_data(shop_data)
+                    await self.event_bus.publish(SnapshotReceived(shop_data))
                 
             except Exception as e:
                 consecutive_errors += 1
@@ -212,8 +355,8 @@ class RobloxGardenApp:
                 # Send full report if we're still running
                 if self.is_running and not self._shutdown_event.is_set():
                     actual_time = datetime.now()
-                    logger.info(f"Sending full report at {actual_time.strftime('%H:%M:%S')} ({delay_seconds}s after scheduled time)")
-                    await self._send_full_update()
+                    logger.info(f"Full report due at {actual_time.strftime('%H:%M:%S')} ({delay_seconds}s after scheduled time)")
+                    await self.event_bus.publish(ReportDue(scheduled_at=next_time))
                 
             except Exception as e:
                 logger.error(f"Scheduler error: {e}")
@@ -222,15 +365,298 @@ class RobloxGardenApp:
         
         logger.info("Scheduler loop ended")
     
+    def _setup_event_bus(self) -> None:
+        """Subscribe pipeline stages to the event bus.
+        
+        Every stage has its own queue, so history writing or a slow full report
+        never delays detection and delivery of new item alerts.
+        """
+        bus = self.event_bus
+        
+        bus.subscribe(
+            SnapshotReceived, self._on_snapshot_received, name="detector",
+            overflow=OverflowPolicy.BLOCK,
+            predicate=lambda event: event.source == "poll"
+        )
+        bus.subscribe(SnapshotReceived, self._on_snapshot_recorded, name="history")
+        # Subscription DMs must never hold up the poll loop or channel alerts
+        bus.subscribe(
+            SnapshotReceived, self._on_snapshot_for_subscriptions, name="subscription_matcher",
+            overflow=OverflowPolicy.DROP_OLDEST,
+            predicate=lambda event: event.source == "poll"
+        )
+        bus.subscribe(
+            StockChanged, self._on_stock_changed, name="alert_renderer",
+            overflow=OverflowPolicy.BLOCK
+        )
+        bus.subscribe(ReportDue, self._on_report_due, name="report_builder")
+        bus.subscribe(
+            MessageRendered, self._on_message_rendered, name="alert_delivery",
+            overflow=OverflowPolicy.BLOCK,
+            predicate=lambda event: event.channel == Channel.UPDATES
+        )
+        bus.subscribe(
+            MessageRendered, self._on_message_rendered, name="report_delivery",
+            predicate=lambda event: event.channel == Channel.FULL
+        )
+        bus.subscribe(
+            MessageRendered, self._on_message_rendered, name="direct_delivery",
+            overflow=OverflowPolicy.DROP_OLDEST,
+            predicate=lambda event: event.channel == Channel.DIRECT
+        )
+    
+    async def _on_snapshot_received(self, event: SnapshotReceived) -> None:
+        """Detector stage: diff polled snapshots against known items."""
+        await self._process_shop_data(event.shop_data)
+    
+    async def _on_snapshot_recorded(self, event: SnapshotReceived) -> None:
+        """History stage: record every fetched snapshot."""
+        self._record_snapshot(event.shop_data)
+    
+    async def _on_snapshot_for_subscriptions(self, event: SnapshotReceived) -> None:
+        """Match items that came into stock against per-channel subscriptions."""
+        trace = self.latency_tracer.start(event.shop_data, "subscription")
+        trace.mark("ingest")
+        in_stock = [item for item in event.shop_data.items if item.in_stock]
+        appeared = [item for item in in_stock if item.name not in self.in_stock_names]
+        self.in_stock_names = {item.name for item in in_stock}
+        
+        if not appeared or not len(self.subscription_index):
+            return
+        
+        matches = self.subscription_index.match_items(appeared)
+        trace.mark("diff")
+        
+        # Subscribers with the same item set share one render and one broadcast
+        groups: Dict[tuple, Tuple[List[ShopItem], List[str]]] = {}
+        for chat_id, items in matches.items():
+            self._emit(SinkEvent(
+                SUBSCRIPTION, items, event.shop_data.snapshot_hash(), event.shop_data.timestamp, chat_id=chat_id
+            ))
+            key = tuple(item.id for item in items)
+            groups.setdefault(key, (items, []))[1].append(str(chat_id))
+        
+        for items, chat_ids in groups.values():
+            text = self.message_formatter.format_new_items_message(items)
+            trace.mark("render")
+            await self.event_bus.publish(
+                MessageRendered(
+                    Channel.DIRECT, text, item_count=len(items), chat_ids=chat_ids,
+                    snapshot_hash=event.shop_data.snapshot_hash(), trace=trace
+                )
+            )
+    
+    async def _on_stock_changed(self, event: StockChanged) -> None:
+        """Render stage for new item alerts."""
+        self._emit(SinkEvent(NEW_ITEMS, event.new_items, event.shop_data.snapshot_hash(), event.shop_data.timestamp))
+        await self.alert_coalescer.add(event.new_items, event.shop_data.snapshot_hash(), event.trace)
+    
+    async def _on_report_due(self, event: ReportDue) -> None:
+        """Render stage for scheduled full reports."""
+        await self._send_full_update()
+    
+    async def _on_message_rendered(self, event: MessageRendered) -> None:
+        """Delivery stage: send rendered messages to Telegram through the outbox."""
+        if event.chat_ids:
+            await self._deliver_direct(event)
+            return
+        
+        key = None
+        if self.outbox and self.outbox.is_open and event.snapshot_hash:
+            key = make_key(event.channel.value, event.chat_id, event.snapshot_hash)
+            entry = OutboxEntry(
+                key, event.channel.value, event.chat_id, event.text,
+                item_count=event.item_count, body_hash=event.body_hash
+            )
+            try:
+                if not await self.outbox.enqueue(entry):
+                    logger.info(f"⏭️ {event.channel.value} message for this snapshot already queued, skipping")
+                    return
+            except Exception as e:
+                # Deliver anyway, only durability is lost
+                logger.warning(f"Failed to store message in outbox: {e}")
+                key = None
+        
+        if event.trace:
+            event.trace.mark("queue")
+        # TelegramBot marks the trace when the API call starts
+        token = current_trace.set(event.trace)
+        if key:
+            self._outbox_in_flight.add(key)
+        try:
+            success = await self._deliver_message(event)
+        finally:
+            current_trace.reset(token)
+            self._outbox_in_flight.discard(key)
+        
+        if success:
+            self.latency_tracer.finish(event.trace)
+        if success and key:
+            self.outbox.mark_sent(key)
+    
+    async def _deliver_direct(self, event: MessageRendered) -> None:
+        """Send one subscription DM to all its chats with a single broadcast."""
+        keys: Dict[str, Optional[str]] = {chat_id: None for chat_id in event.chat_ids}
+        if self.outbox and self.outbox.is_open and event.snapshot_hash:
+            entries = [
+                OutboxEntry(
+                    make_key(event.channel.value, chat_id, event.snapshot_hash), event.channel.value,
+                    chat_id, event.text, item_count=event.item_count
+                )
+                for chat_id in keys
+            ]
+            # Entries of all chats go into the same outbox transaction
+            results = await asyncio.gather(
+                *(self.outbox.enqueue(entry) for entry in entries), return_exceptions=True
+            )
+            for entry, queued in zip(entries, results):
+                if isinstance(queued, Exception):
+                    # Deliver anyway, only durability is lost
+                    logger.warning(f"Failed to store message in outbox: {queued}")
+                elif queued:
+                    keys[entry.chat_id] = entry.key
+                else:
+                    del keys[entry.chat_id]
+        
+        if not keys:
+            logger.info("⏭️ Subscription messages for this snapshot already queued, skipping")
+            return
+        
+        if event.trace:
+            event.trace.mark("queue")
+        in_flight = {key for key in keys.values() if key}
+        self._outbox_in_flight.update(in_flight)
+        # TelegramBot marks the trace when the API call starts
+        token = current_trace.set(event.trace)
+        try:
+            results = await self.telegram_bot.broadcast(event.text, keys, lane=Lane.DIRECT)
+        finally:
+            current_trace.reset(token)
+            self._outbox_in_flight.difference_update(in_flight)
+        
+        for chat_id, key in keys.items():
+            blocked = chat_id in self._blocked_chats
+            self._blocked_chats.discard(chat_id)
+            if not key:
+                continue
+            if results.get(chat_id):
+                self.outbox.mark_sent(key)
+            elif blocked:
+                self.outbox.mark_expired(key)
+        
+        sent = sum(1 for success in results.values() if success)
+        if sent:
+            self.latency_tracer.finish(event.trace)
+        if sent < len(keys):
+            logger.error(f"Failed to send subscription update to {len(keys) - sent}/{len(keys)} chats")
+    
+    def _on_chat_blocked(self, chat_id: str) -> None:
+        """Drop all subscriptions of a chat that blocked the bot or removed it."""
+        self._blocked_chats.add(chat_id)
+        removed = []
+        if self.subscriber_bot:
+            removed = self.subscriber_bot.store.remove(chat_id)
+        removed += [
+            subscription.id for subscription in self.subscription_index.subscriptions.values()
+            if str(subscription.subscriber) == chat_id
+        ]
+        removed = [subscription_id for subscription_id in removed if self.subscription_index.remove(subscription_id)]
+        if removed:
+            logger.warning(f"🚫 Chat {chat_id} blocked the bot, removed {len(removed)} subscriptions")
+    
+    def _emit(self, event: SinkEvent) -> None:
+        """Hand a structured event to every sink."""
+        for sink in self.sinks:
+            sink.submit(event)
+    
+    async def _outbox_retry_loop(self) -> None:
+        """Periodically resend failed outbox entries and forget old delivered ones."""
+        interval = self.settings.outbox_retry_interval
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._replay_outbox()
+                await self.outbox.prune()
+            except Exception as e:
+                logger.error(f"Outbox retry failed: {e}")
+    
+    async def _replay_outbox(self) -> None:
+        """Deliver outbox entries left pending by a failed send or by the previous run."""
+        pending = [entry for entry in self.outbox.pending() if entry.key not in self._outbox_in_flight]
+        if not pending:
+            return
+        
+        logger.info(f"📦 Replaying {len(pending)} undelivered messages")
+        now = time.time()
+        for entry in pending:
+            if now - entry.created_at > self.settings.outbox_replay_max_age:
+                logger.info(f"🗑️ Dropping stale {entry.kind} message from {datetime.fromtimestamp(entry.created_at):%H:%M:%S}")
+                self.outbox.mark_expired(entry.key)
+                continue
+            
+            event = MessageRendered(
+                Channel(entry.kind), entry.text, item_count=entry.item_count,
+                chat_id=entry.chat_id, body_hash=entry.body_hash
+            )
+            self._outbox_in_flight.add(entry.key)
+            try:
+                if await self._deliver_message(event):
+                    self.outbox.mark_sent(entry.key)
+                elif entry.chat_id in self._blocked_chats and event.channel == Channel.DIRECT:
+                    self.outbox.mark_expired(entry.key)
+            finally:
+                self._outbox_in_flight.discard(entry.key)
+                self._blocked_chats.discard(entry.chat_id)
+        await self.outbox.flush()
+    
+    async def _deliver_message(self, event: MessageRendered) -> bool:
+        """Send one rendered message to its channel."""
+        if event.channel == Channel.DIRECT:
+            success = await self.telegram_bot.send_message(event.text, event.chat_id, lane=Lane.DIRECT)
+            if not success:
+                logger.error(f"Failed to send subscription update to {event.chat_id}")
+            return success
+        
+        if event.channel == Channel.UPDATES:
+            if event.chat_id:
+                success = await self.telegram_bot.send_message(event.text, event.chat_id, lane=Lane.ALERT)
+            else:
+                success = await self.telegram_bot.send_to_updates_channel(event.text)
+            if success:
+                logger.info(f"Sent new items update for {event.item_count} items")
+            else:
+                logger.error("Failed to send new items update")
+            return success
+        
+        send_time = datetime.now()
+        logger.info(f"📤 Sending full report at {send_time.strftime('%H:%M:%S.%f')[:-3]}")
+        if self.live_board:
+            success = await self.live_board.publish(
+                event.chat_id or self.settings.effective_full_channel_id, event.text, event.body_hash
+            )
+        elif event.chat_id:
+            success = await self.telegram_bot.send_message(event.text, event.chat_id)
+        else:
+            success = await self.telegram_bot.send_to_full_channel(event.text)
+        
+        if success:
+            logger.info(f"✅ Full report sent with {event.item_count} items")
+        else:
+            logger.error("❌ Failed to send full update")
+        return success
+    
     async def _process_shop_data(self, shop_data: ShopData) -> None:
-        """Process new shop data and send updates."""
+        """Process new shop data and publish detected stock changes."""
         from datetime import datetime
         
+        trace = self.latency_tracer.start(shop_data, "alert")
+        trace.mark("ingest")
         data_time = shop_data.timestamp.strftime("%H:%M:%S")
         logger.debug(f"Processing shop data from {data_time} with {len(shop_data.items)} items")
         
         # Filter items according to our rules
         filtered_items = shop_data.get_filtered_items(self.item_filter)
+        trace.mark("filter")
         
         # Update current shop data
         self.current_shop_data = shop_data
@@ -238,11 +664,35 @@ class RobloxGardenApp:
         
         # Detect new items
         new_items = self._detect_new_items(filtered_items)
+        trace.mark("diff")
         
         if new_items:
             logger.info(f"Detected {len(new_items)} new items at {data_time}")
-            # Send new items update immediately
-            await self._send_new_items_update(new_items)
+            await self.event_bus.publish(StockChanged(shop_data, new_items, trace=trace))
+    
+    def _record_snapshot(self, shop_data: ShopData) -> None:
+        """Feed a snapshot into the stock history and the restock forecaster."""
+        if self.history_writer:
+            try:
+                self.history_writer.record(shop_data)
+            except OSError as e:
+                logger.error(f"Failed to write stock history: {e}")
+        
+        if self.settings.forecast_enabled:
+            self.forecaster.observe(
+                shop_data.timestamp,
+                (item.name for item in shop_data.items if item.in_stock)
+            )
+    
+    def _get_forecast(self) -> Optional[Dict[str, float]]:
+        """Get restock odds for the full report, if the model has enough data."""
+        if not self.settings.forecast_enabled:
+            return None
+        
+        if self.forecaster.rotations_observed < self.settings.forecast_min_rotations:
+            return None
+        
+        return self.forecaster.forecast(self.settings.forecast_horizon_rotations)
     
     def _detect_new_items(self, current_items: list[ShopItem]) -> list[ShopItem]:
         """Detect new items compared to known items."""
@@ -266,28 +716,67 @@ class RobloxGardenApp:
         
         return new_items
     
-    async def _send_new_items_update(self, new_items: list[ShopItem]) -> None:
-        """Send update about new items to the updates channel."""
+    async def _send_new_items_update(
+        self,
+        new_items: list[ShopItem],
+        snapshot_hash: Optional[str] = None,
+        trace: Optional[CycleTrace] = None
+    ) -> None:
+        """Render update about new items and queue it for the updates channel."""
         if not new_items:
             return
         
+        if trace:
+            trace.mark("coalesce")
         try:
-            # Format message for new items
-            message = self.message_formatter.format_new_items_message(new_items)
-            
-            # Send to updates channel
-            success = await self.telegram_bot.send_to_updates_channel(message)
-            
-            if success:
-                logger.info(f"Sent new items update for {len(new_items)} items")
-            else:
-                logger.error("Failed to send new items update")
+            # One render per locale, shared by all channels in that locale
+            for locale, chat_id in self._locale_targets("updates"):
+                message = self.message_formatter.format_new_items_message(new_items, locale)
+                if trace:
+                    trace.mark("render")
+                await self.event_bus.publish(
+                    MessageRendered(
+                        Channel.UPDATES, message, item_count=len(new_items), chat_id=chat_id,
+                        snapshot_hash=snapshot_hash, trace=trace
+                    )
+                )
             
         except Exception as e:
-            logger.error(f"Failed to send new items update: {e}")
+            logger.error(f"Failed to render new items update: {e}")
+    
+    def _locale_targets(self, kind: str) -> List[Tuple[str, Optional[str]]]:
+        """Get (locale, chat id) pairs for "updates" or "full"; None is the main channel."""
+        targets = [(self.settings.locale, None)]
+        for locale, channels in self.settings.locale_channels.items():
+            chat_id = channels.get(kind)
+            if chat_id:
+                targets.append((locale, chat_id))
+        return targets
+    
+    async def _publish_full_report(self, shop_data: ShopData, items: list[ShopItem], item_count: int) -> None:
+        """Render full report once per locale and queue it for the full channels."""
+        forecast = self._get_forecast()
+        # Reports built from cached data at a later slot are new messages
+        report_hash = f"{shop_data.snapshot_hash()}@{datetime.now():%Y-%m-%dT%H:%M}"
+        self._emit(SinkEvent(FULL_REPORT, items, report_hash, shop_data.timestamp))
+        for locale, chat_id in self._locale_targets("full"):
+            report = self.message_formatter.render_full_report(items, shop_data.timestamp, forecast, locale)
+            await self.event_bus.publish(
+                MessageRendered(
+                    Channel.FULL, report.text, item_count=item_count,
+                    chat_id=chat_id, body_hash=report.body_hash, snapshot_hash=report_hash
+                )
+            )
+    
+    def _log_filter_stats(self) -> None:
+        """Log per-node filter counters when instrumentation is enabled."""
+        if not self.item_filter.stats_enabled:
+            return
+        for line in self.item_filter.stats_report():
+            logger.info(f"🔎 {line}")
     
     async def _send_full_update(self) -> None:
-        """Send full shop report to the full channel with fresh data."""
+        """Build full shop report with fresh data and queue it for the full channel."""
         try:
             # Log exact time when report creation starts
             report_start_time = datetime.now()
@@ -309,6 +798,7 @@ class RobloxGardenApp:
                 shop_data = fresh_shop_data
                 # Update current shop data with fresh data
                 self.current_shop_data = fresh_shop_data
+                await self.event_bus.publish(SnapshotReceived(fresh_shop_data, source="report"))
                 data_time = shop_data.timestamp.strftime("%H:%M:%S")
                 logger.info(f"Using fresh shop data from {data_time}")
             
@@ -317,33 +807,19 @@ class RobloxGardenApp:
             
             if not filtered_items:
                 logger.info("No items to include in full update - sending empty report")
-                # Send empty report instead of skipping
-                message = self.message_formatter.format_full_report_message(
-                    [],
-                    shop_data.timestamp
-                )
-            else:
-                # Format full report message with items
-                message = self.message_formatter.format_full_report_message(
-                    filtered_items,
-                    shop_data.timestamp
-                )
             
-            # Send message to full channel
-            send_time = datetime.now()
-            logger.info(f"📤 Sending full report at {send_time.strftime('%H:%M:%S.%f')[:-3]} with data timestamp {data_time}")
-            success = await self.telegram_bot.send_to_full_channel(message)
+            # Empty reports are sent too instead of skipping
+            item_count = len(filtered_items) if filtered_items else 0
+            await self._publish_full_report(shop_data, filtered_items, item_count)
             
-            if success:
-                item_count = len(filtered_items) if filtered_items else 0
-                complete_time = datetime.now()
-                duration = (complete_time - report_start_time).total_seconds()
-                logger.info(f"✅ Full report completed at {complete_time.strftime('%H:%M:%S.%f')[:-3]} ({duration:.2f}s) with {item_count} items")
-            else:
-                logger.error("❌ Failed to send full update")
+            complete_time = datetime.now()
+            duration = (complete_time - report_start_time).total_seconds()
+            logger.info(f"✅ Full report rendered at {complete_time.strftime('%H:%M:%S.%f')[:-3]} ({duration:.2f}s) with data timestamp {data_time}")
+            self._log_filter_stats()
+            self.latency_tracer.log_summary()
             
         except Exception as e:
-            logger.error(f"Failed to send full update: {e}")
+            logger.error(f"Failed to build full update: {e}")
 
     async def _send_initial_full_report(self) -> None:
         """Send initial full report immediately after startup."""
@@ -359,33 +835,22 @@ class RobloxGardenApp:
             
             # Set current shop data
             self.current_shop_data = shop_data
+            self.in_stock_names = {item.name for item in shop_data.items if item.in_stock}
+            await self.event_bus.publish(SnapshotReceived(shop_data, source="report"))
             
             # Filter items for initial report
             filtered_items = shop_data.get_filtered_items(self.item_filter)
             
             if not filtered_items:
                 logger.info("No items to include in initial report")
-                # Send empty report
-                message = self.message_formatter.format_full_report_message([], shop_data.timestamp)
-            else:
-                # Format full report message
-                message = self.message_formatter.format_full_report_message(
-                    filtered_items,
-                    shop_data.timestamp
-                )
-                
-                # Initialize known items
-                for item in filtered_items:
-                    self.known_items[item.id] = item
             
-            # Send message to full channel
-            logger.info("Sending initial report")
-            success = await self.telegram_bot.send_to_full_channel(message)
+            # Initialize known items
+            for item in filtered_items:
+                self.known_items[item.id] = item
             
-            if success:
-                logger.info(f"Initial full report sent with {len(filtered_items)} items")
-            else:
-                logger.error("Failed to send initial full report")
+            # Queue message for the full channel
+            await self._publish_full_report(shop_data, filtered_items, len(filtered_items))
+            logger.info(f"Initial full report rendered with {len(filtered_items)} items")
                 
         except Exception as e:
             logger.error(f"Failed to send initial full report: {e}")
@@ -405,3 +870,10 @@ class RobloxGardenApp:
                 signal.signal(signal.SIGTERM, lambda s, f: signal_handler())
         except Exception as e:
             logger.warning(f"Could not setup signal handlers: {e}")
+        
+        # SIGHUP reloads filter rules without restarting
+        if self.settings.filter_rules_file and hasattr(signal, 'SIGHUP'):
+            try:
+                asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, self.item_filter.reload)
+            except (NotImplementedError, RuntimeError) as e:
+                logger.warning(f"Could not setup SIGHUP handler: {e}")
@@ -0,0 +1,112 @@
+"""
+Coalescing of new item alerts.
+
+At a restock boundary new items are often detected over two or three
+consecutive polls. Instead of one alert per poll, items detected within a
+short window after the first detection are merged and rendered as a single
+alert. The latency trace of the first detection travels with the merged
+alert, since it waited longest.
+"""
+
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, Dict, List, Optional
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+from roblox_garden.models.shop import ShopItem
+from roblox_garden.core.tracing import CycleTrace
+
+# Receives the merged items, a hash of the snapshots they came from and the first trace
+FlushHandler = Callable[[List[ShopItem], Optional[str], Optional[CycleTrace]], Awaitable[None]]
+
+
+class AlertCoalescer:
+    """Collects detected items and flushes them once per window."""
+
+    def __init__(self, window: float, flush: FlushHandler):
+        self.window = window
+        self._flush = flush
+        self._items: Dict[str, ShopItem] = {}
+        self._snapshot_hashes: List[str] = []
+        self._trace: Optional[CycleTrace] = None
+        self._timer: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.merged = 0  # Detections folded into an earlier alert
+
+    @property
+    def pending(self) -> int:
+        """Number of items waiting for the window to close."""
+        return len(self._items)
+
+    async def add(
+        self,
+        items: List[ShopItem],
+        snapshot_hash: Optional[str] = None,
+        trace: Optional[CycleTrace] = None
+    ) -> None:
+        """Add detected items; the first detection opens the window."""
+        if not items:
+            return
+
+        if self.window <= 0:
+            await self._flush(items, snapshot_hash, trace)
+            return
+
+        if self._items:
+            self.merged += 1
+        for item in items:
+            # Later detections carry fresher quantities
+            self._items[item.id] = item
+        if snapshot_hash:
+            self._snapshot_hashes.append(snapshot_hash)
+        if self._trace is None:
+            self._trace = trace
+
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_after_window())
+
+    async def _flush_after_window(self) -> None:
+        """Wait for the window to close, then flush."""
+        await asyncio.sleep(self.window)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Send everything collected so far as one alert."""
+        if not self._items:
+            return
+
+        items = list(self._items.values())
+        hashes = self._snapshot_hashes
+        trace = self._trace
+        self._items = {}
+        self._snapshot_hashes = []
+        self._trace = None
+        self.batches += 1
+
+        if len(hashes) > 1:
+            logger.info(f"🧲 Coalesced {len(hashes)} detections into one alert with {len(items)} items")
+
+        snapshot_hash = None
+        if len(hashes) == 1:
+            snapshot_hash = hashes[0]
+        elif hashes:
+            snapshot_hash = hashlib.sha1("+".join(hashes).encode("utf-8")).hexdigest()
+        # Cancelling the timer must not lose a batch already taken out
+        await asyncio.shield(self._flush(items, snapshot_hash, trace))
+
+    async def stop(self) -> None:
+        """Flush pending items immediately; later detections are not delayed."""
+        self.window = 0
+        if self._timer and not self._timer.done() and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+            try:
+                await self._timer
+            except asyncio.CancelledError:
+                pass
+        self._timer = None
+        await self.flush()
@@ -0,0 +1,275 @@
+"""
+In-process event bus connecting ingestion, detection, rendering and delivery.
+
+Every subscriber gets its own bounded queue and worker task, so a slow
+subscriber only delays itself. What happens when a queue is full is decided
+per subscriber by its overflow policy.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+from roblox_garden.models.shop import ShopData, ShopItem
+from roblox_garden.core.tracing import CycleTrace
+
+
+class Channel(str, Enum):
+    """Delivery channels."""
+    UPDATES = "updates"
+    FULL = "full"
+    DIRECT = "direct"  # Explicit chat id, e.g. per-channel subscriptions
+
+
+@dataclass
+class Event:
+    """Base class for bus events."""
+    created_at: float = field(default_factory=time.monotonic, init=False)
+
+
+@dataclass
+class SnapshotReceived(Event):
+    """New shop snapshot fetched from the API."""
+    shop_data: ShopData
+    source: str = "poll"  # "poll" for the monitoring loop, "report" for report fetches
+
+
+@dataclass
+class StockChanged(Event):
+    """Filtered items that appeared or came back in stock."""
+    shop_data: ShopData
+    new_items: List[ShopItem]
+    trace: Optional[CycleTrace] = None
+
+
+@dataclass
+class ReportDue(Event):
+    """Scheduled full report should be built."""
+    scheduled_at: datetime
+
+
+@dataclass
+class MessageRendered(Event):
+    """Message ready for delivery."""
+    channel: Channel
+    text: str
+    item_count: int = 0
+    chat_id: Optional[str] = None  # Target chat for Channel.DIRECT
+    chat_ids: List[str] = field(default_factory=list)  # Target chats of a Channel.DIRECT broadcast
+    body_hash: Optional[str] = None  # Content hash without timestamp, for edit-in-place
+    snapshot_hash: Optional[str] = None  # Source snapshot, for the outbox idempotency key
+    trace: Optional[CycleTrace] = None  # Latency trace of the alert, finished on acknowledgement
+
+
+class OverflowPolicy(str, Enum):
+    """What to do when a subscriber queue is full."""
+    BLOCK = "block"              # Publisher waits for free space
+    DROP_NEWEST = "drop_newest"  # Incoming event is discarded
+    DROP_OLDEST = "drop_oldest"  # Oldest queued event is discarded
+
+
+@dataclass
+class SubscriberMetrics:
+    """Delivery statistics of one subscriber."""
+    delivered: int = 0
+    dropped: int = 0
+    failed: int = 0
+    last_lag: float = 0.0
+    max_lag: float = 0.0
+    total_lag: float = 0.0
+
+    @property
+    def avg_lag(self) -> float:
+        """Average time events waited in the queue."""
+        return self.total_lag / self.delivered if self.delivered else 0.0
+
+
+Handler = Callable[[Any], Awaitable[None]]
+Predicate = Callable[[Any], bool]
+
+
+class Subscription:
+    """Subscriber with its own queue and worker."""
+
+    def __init__(
+        self,
+        name: str,
+        event_types: Tuple[Type[Event], ...],
+        handler: Handler,
+        maxsize: int,
+        overflow: OverflowPolicy,
+        predicate: Optional[Predicate] = None,
+    ):
+        self.name = name
+        self.event_types = event_types
+        self.handler = handler
+        self.overflow = overflow
+        self.predicate = predicate
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.metrics = SubscriberMetrics()
+        self.task: Optional[asyncio.Task] = None
+
+    def accepts(self, event: Event) -> bool:
+        """Check if the subscriber wants the event."""
+        if not isinstance(event, self.event_types):
+            return False
+        return self.predicate is None or self.predicate(event)
+
+    async def put(self, event: Event) -> None:
+        """Queue event according to the overflow policy."""
+        if self.overflow == OverflowPolicy.BLOCK:
+            await self.queue.put(event)
+            return
+        self.put_nowait(event)
+
+    def put_nowait(self, event: Event) -> None:
+        """Queue event without waiting; full queues drop an event."""
+        if self.queue.full():
+            if self.overflow == OverflowPolicy.DROP_OLDEST:
+                self.queue.get_nowait()
+                self.queue.task_done()
+            else:
+                self.metrics.dropped += 1
+                logger.warning(f"Event queue of '{self.name}' is full, dropping {type(event).__name__}")
+                return
+            self.metrics.dropped += 1
+            logger.warning(f"Event queue of '{self.name}' is full, dropped oldest event")
+
+        self.queue.put_nowait(event)
+
+    async def run(self) -> None:
+        """Worker loop delivering queued events to the handler."""
+        while True:
+            event = await self.queue.get()
+            try:
+                lag = time.monotonic() - event.created_at
+                self.metrics.last_lag = lag
+                self.metrics.max_lag = max(self.metrics.max_lag, lag)
+                self.metrics.total_lag += lag
+
+                await self.handler(event)
+                self.metrics.delivered += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.metrics.failed += 1
+                logger.error(f"Subscriber '{self.name}' failed to handle {type(event).__name__}: {e}")
+            finally:
+                self.queue.task_done()
+
+
+class EventBus:
+    """Typed publish/subscribe bus with per-subscriber queues."""
+
+    def __init__(self, default_maxsize: int = 100):
+        self.default_maxsize = default_maxsize
+        self.subscriptions: List[Subscription] = []
+        self._running = False
+
+    def subscribe(
+        self,
+        event_types: Type[Event] | Tuple[Type[Event], ...],
+        handler: Handler,
+        name: Optional[str] = None,
+        maxsize: Optional[int] = None,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        predicate: Optional[Predicate] = None,
+    ) -> Subscription:
+        """Register a handler for one or more event types."""
+        if not isinstance(event_types, tuple):
+            event_types = (event_types,)
+
+        subscription = Subscription(
+            name=name or getattr(handler, "__name__", "subscriber"),
+            event_types=event_types,
+            handler=handler,
+            maxsize=maxsize or self.default_maxsize,
+            overflow=overflow,
+            predicate=predicate,
+        )
+        self.subscriptions.append(subscription)
+
+        if self._running:
+            subscription.task = asyncio.create_task(subscription.run())
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber and stop its worker."""
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+        if subscription.task:
+            subscription.task.cancel()
+
+    async def publish(self, event: Event) -> None:
+        """Publish an event; only BLOCK subscribers can make this wait."""
+        for subscription in self.subscriptions:
+            if subscription.accepts(event):
+                await subscription.put(event)
+
+    def publish_nowait(self, event: Event) -> None:
+        """Publish from synchronous code; full queues drop instead of waiting."""
+        for subscription in self.subscriptions:
+            if subscription.accepts(event):
+                subscription.put_nowait(event)
+
+    def start(self) -> None:
+        """Start worker tasks for all subscribers."""
+        self._running = True
+        for subscription in self.subscriptions:
+            if subscription.task is None or subscription.task.done():
+                subscription.task = asyncio.create_task(subscription.run())
+
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        """Stop workers, giving queued events a chance to be handled."""
+        self._running = False
+
+        pending = [s.queue.join() for s in self.subscriptions if s.task and not s.task.done()]
+        if pending and drain_timeout > 0:
+            try:
+                await asyncio.wait_for(asyncio.gather(*pending), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Event bus queues not drained before timeout")
+
+        for subscription in self.subscriptions:
+            if subscription.task and not subscription.task.done():
+                subscription.task.cancel()
+                try:
+                    await subscription.task
+                except asyncio.CancelledError:
+                    pass
+            subscription.task = None
+
+    def metrics(self) -> Dict[str, dict]:
+        """Get queue depth and lag metrics per subscriber."""
+        return {
+            s.name: {
+                "depth": s.queue.qsize(),
+                "maxsize": s.queue.maxsize,
+                "delivered": s.metrics.delivered,
+                "dropped": s.metrics.dropped,
+                "failed": s.metrics.failed,
+                "last_lag": s.metrics.last_lag,
+                "avg_lag": s.metrics.avg_lag,
+                "max_lag": s.metrics.max_lag,
+            }
+            for s in self.subscriptions
+        }
+
+    def log_metrics(self) -> None:
+        """Log a one-line summary per subscriber."""
+        for name, m in self.metrics().items():
+            logger.info(
+                f"📬 {name}: depth {m['depth']}/{m['maxsize']}, delivered {m['delivered']}, "
+                f"dropped {m['dropped']}, failed {m['failed']}, "
+                f"lag avg {m['avg_lag'] * 1000:.1f}ms max {m['max_lag'] * 1000:.1f}ms"
+            )
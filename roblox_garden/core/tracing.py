@@ -0,0 +1,207 @@
+"""
+Latency tracing from fetching a snapshot to Telegram's acknowledgement.
+
+Every snapshot that leads to a message gets a `CycleTrace`. Pipeline stages
+mark the trace when they finish, and the trace travels with the events
+(`StockChanged`, `MessageRendered`) and, for the Telegram call itself,
+through the `current_trace` context variable. When Telegram acknowledges the
+first message of the cycle, the tracer records every stage duration and the
+total in histograms and keeps the slowest cycles with their breakdown.
+
+Stages, in order:
+
+* fetch - API request and parsing (polling)
+* ingest, filter, diff, coalesce, render - processing
+* queue, delivery_wait, send - delivery: event bus queue, rate limit
+  wait in the delivery queue, API call until acknowledgement
+
+The time between the change upstream and the start of the fetch (up to one
+poll interval) is not visible from here and is not included.
+"""
+
+import bisect
+import heapq
+import itertools
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+from roblox_garden.models.shop import ShopData
+
+STAGES = ("fetch", "ingest", "filter", "diff", "coalesce", "render", "queue", "delivery_wait", "send")
+
+# Stages summed up as polling, processing and delivery in the slowest cycles
+STAGE_GROUPS = {
+    "polling": ("fetch",),
+    "processing": ("ingest", "filter", "diff", "coalesce", "render"),
+    "delivery": ("queue", "delivery_wait", "send"),
+}
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Trace of the message being delivered, read by TelegramBot when it calls the API
+current_trace: ContextVar[Optional["CycleTrace"]] = ContextVar("current_trace", default=None)
+
+
+class Histogram:
+    """Bucketed distribution of durations."""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        # Last slot counts values above the largest bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a duration."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        """Average duration."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th percentile, capped at the maximum."""
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, float]:
+        """Get summary values."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": self.max,
+        }
+
+
+class CycleTrace:
+    """Stage timestamps of one snapshot on its way to Telegram."""
+
+    def __init__(self, kind: str, snapshot_hash: str, started_at: float):
+        self.kind = kind  # "alert" or "subscription"
+        self.snapshot_hash = snapshot_hash
+        self.started_at = started_at
+        self.marks: Dict[str, float] = {}
+        self.finished = False
+
+    def mark(self, stage: str, at: Optional[float] = None) -> None:
+        """Record that a stage finished; the first mark of a stage wins."""
+        self.marks.setdefault(stage, time.monotonic() if at is None else at)
+
+    @property
+    def total(self) -> float:
+        """Time from fetch start to the last mark."""
+        return max(self.marks.values(), default=self.started_at) - self.started_at
+
+    def durations(self) -> Dict[str, float]:
+        """Duration of every marked stage, measured from the previous mark."""
+        durations = {}
+        previous = self.started_at
+        for stage in STAGES:
+            if stage in self.marks:
+                durations[stage] = max(0.0, self.marks[stage] - previous)
+                previous = self.marks[stage]
+        return durations
+
+    def breakdown(self) -> Dict[str, float]:
+        """Stage durations summed up into polling, processing and delivery."""
+        durations = self.durations()
+        return {
+            group: sum(durations.get(stage, 0.0) for stage in stages)
+            for group, stages in STAGE_GROUPS.items()
+        }
+
+
+class LatencyTracer:
+    """Collects finished traces into histograms and keeps the slowest ones."""
+
+    def __init__(self, slowest: int = 10):
+        self.slowest_size = slowest
+        self.histograms: Dict[str, Histogram] = {}
+        self._slowest: List[Tuple[float, int, CycleTrace]] = []
+        self._seq = itertools.count()
+        self._logged_count = 0
+
+    def start(self, shop_data: ShopData, kind: str) -> CycleTrace:
+        """Begin a trace for a snapshot."""
+        started_at = shop_data.fetch_started_at
+        trace = CycleTrace(kind, shop_data.snapshot_hash(), started_at or time.monotonic())
+        if started_at is not None and shop_data.fetch_finished_at is not None:
+            trace.mark("fetch", shop_data.fetch_finished_at)
+        return trace
+
+    def finish(self, trace: Optional[CycleTrace]) -> None:
+        """Record a trace once its first message was acknowledged."""
+        if trace is None or trace.finished:
+            return
+        trace.mark("send")
+        trace.finished = True
+
+        for stage, duration in trace.durations().items():
+            self._histogram(stage).observe(duration)
+        self._histogram("total").observe(trace.total)
+        self._histogram(f"total.{trace.kind}").observe(trace.total)
+
+        entry = (trace.total, next(self._seq), trace)
+        if len(self._slowest) < self.slowest_size:
+            heapq.heappush(self._slowest, entry)
+        elif self._slowest and entry[0] > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def _histogram(self, name: str) -> Histogram:
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        return self.histograms[name]
+
+    def slowest(self) -> List[CycleTrace]:
+        """Get the slowest recorded cycles, slowest first."""
+        return [trace for _, _, trace in sorted(self._slowest, key=lambda entry: (-entry[0], entry[1]))]
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get histogram summaries by stage."""
+        return {name: histogram.to_dict() for name, histogram in self.histograms.items()}
+
+    def log_summary(self) -> None:
+        """Log stage percentiles and the slowest cycles, if new cycles finished."""
+        total = self.histograms.get("total")
+        if not total or total.count == self._logged_count:
+            return
+        self._logged_count = total.count
+
+        logger.info(
+            f"⏱️ Alert latency over {total.count} cycles: p50 {total.percentile(50) * 1000:.0f}ms, "
+            f"p95 {total.percentile(95) * 1000:.0f}ms, max {total.max * 1000:.0f}ms"
+        )
+        for stage in STAGES:
+            histogram = self.histograms.get(stage)
+            if histogram:
+                logger.info(
+                    f"  {stage}: avg {histogram.mean * 1000:.1f}ms, p95 {histogram.percentile(95) * 1000:.0f}ms, "
+                    f"max {histogram.max * 1000:.1f}ms"
+                )
+        for trace in self.slowest()[:3]:
+            groups = ", ".join(f"{group} {seconds * 1000:.0f}ms" for group, seconds in trace.breakdown().items())
+            stages = ", ".join(f"{stage} {seconds * 1000:.0f}ms" for stage, seconds in trace.durations().items())
+            logger.info(f"  🐢 {trace.kind} {trace.total * 1000:.0f}ms ({groups}; {stages})")
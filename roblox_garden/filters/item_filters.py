@@ -2,19 +2,233 @@
 Item filters for Roblox Garden shop items.
 """
 
+import time
 from abc import ABC, abstractmethod
-from typing import Set
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from roblox_garden.models.shop import ShopItem, ItemType, Rarity
+from roblox_garden.models.shop import ShopItem, ShopColumns, ItemType, Rarity
+
+# Static part of an item a compiled filter is keyed by
+CatalogKey = Tuple[ItemType, Rarity, str]
+
+
+@dataclass
+class FilterStats:
+    """Evaluation counters of one filter node (time includes children)."""
+    evaluated: int = 0
+    passed: int = 0
+    total_ns: int = 0
+    
+    @property
+    def rejected(self) -> int:
+        """Number of rejected items."""
+        return self.evaluated - self.passed
+    
+    @property
+    def pass_rate(self) -> float:
+        """Share of evaluated items that passed."""
+        return self.passed / self.evaluated if self.evaluated else 0.0
+    
+    @property
+    def avg_ns(self) -> float:
+        """Average evaluation time per item in nanoseconds."""
+        return self.total_ns / self.evaluated if self.evaluated else 0.0
+    
+    def reset(self) -> None:
+        """Zero all counters."""
+        self.evaluated = 0
+        self.passed = 0
+        self.total_ns = 0
+
+
+@dataclass
+class FilterExplanation:
+    """Evaluation path of one item through a filter tree."""
+    label: str
+    result: bool
+    children: List["FilterExplanation"] = field(default_factory=list)
+    
+    def format(self, indent: int = 0) -> str:
+        """Render the path as an indented tree."""
+        mark = "✅" if self.result else "❌"
+        lines = [f"{'  ' * indent}{mark} {self.label}"]
+        for child in self.children:
+            lines.append(child.format(indent + 1))
+        return "\n".join(lines)
+
+
+def _order_by_cost(
+    filters: List["ItemFilter"],
+    min_samples: int,
+    decides_rate: Callable[[FilterStats], float],
+) -> Optional[List["ItemFilter"]]:
+    """Order short-circuiting children by expected cost per decided item.
+    
+    A child that decides the result for a share p of items at average cost c
+    should run before the others when c / p is smallest. Returns None while
+    any child has too few samples to estimate; otherwise the children's
+    counters are reset, so the next ranking uses a fresh sampling window and
+    follows changes in the item mix.
+    """
+    keys = []
+    for f in filters:
+        stats = f.stats
+        if stats is None or stats.evaluated < min_samples:
+            return None
+        rate = decides_rate(stats)
+        keys.append(stats.avg_ns / rate if rate else float("inf"))
+    
+    for f in filters:
+        f.stats.reset()
+    
+    # Stable sort keeps declared order between equally good children
+    order = sorted(range(len(filters)), key=keys.__getitem__)
+    return [filters[i] for i in order]
 
 
 class ItemFilter(ABC):
     """Base class for item filters."""
     
+    # Present only while instrumentation is enabled
+    stats: Optional[FilterStats] = None
+    
     @abstractmethod
     def should_include(self, item: ShopItem) -> bool:
         """Check if item should be included."""
         pass
+    
+    def describe(self) -> str:
+        """Short human-readable label of the node."""
+        return type(self).__name__
+    
+    @property
+    def children(self) -> List["ItemFilter"]:
+        """Child filters of composite nodes."""
+        return []
+    
+    def walk(self) -> Iterator["ItemFilter"]:
+        """Iterate over this node and all descendants."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+    
+    def explain(self, item: ShopItem) -> FilterExplanation:
+        """Explain which nodes accepted or rejected the item."""
+        return FilterExplanation(self.describe(), type(self).should_include(self, item))
+    
+    def enable_stats(self) -> None:
+        """Start counting evaluations on every node of the tree.
+        
+        Counting wraps the node methods on the instance; disabling removes
+        the wrappers again, so there is no overhead while it is off.
+        """
+        for node in self.walk():
+            node._install_stats()
+    
+    def disable_stats(self) -> None:
+        """Stop counting evaluations (collected stats are kept)."""
+        for node in self.walk():
+            node._remove_stats()
+    
+    @property
+    def stats_enabled(self) -> bool:
+        """Whether evaluations of this node are counted."""
+        return "should_include" in self.__dict__
+    
+    def _install_stats(self) -> None:
+        """Wrap should_include/filter_mask with counters."""
+        if self.stats_enabled:
+            return
+        if self.stats is None:
+            self.stats = FilterStats()
+        
+        stats = self.stats
+        cls = type(self)
+        perf_counter_ns = time.perf_counter_ns
+        
+        def should_include(item: ShopItem) -> bool:
+            start = perf_counter_ns()
+            result = cls.should_include(self, item)
+            stats.total_ns += perf_counter_ns() - start
+            stats.evaluated += 1
+            if result:
+                stats.passed += 1
+            return result
+        
+        def filter_mask(columns: ShopColumns) -> int:
+            start = perf_counter_ns()
+            mask = cls.filter_mask(self, columns)
+            stats.total_ns += perf_counter_ns() - start
+            stats.evaluated += columns.size
+            stats.passed += mask.bit_count()
+            return mask
+        
+        self.should_include = should_include
+        self.filter_mask = filter_mask
+    
+    def _remove_stats(self) -> None:
+        """Drop instance wrappers installed by _install_stats."""
+        self.__dict__.pop("should_include", None)
+        self.__dict__.pop("filter_mask", None)
+    
+    def reorder(self, min_samples: int = 100) -> bool:
+        """Reorder children by observed stats. Returns True if order changed."""
+        return False
+    
+    def optimize(self, min_samples: int = 100) -> bool:
+        """Reorder children of every node in the tree by observed stats.
+        
+        Order only matters for per-item `should_include` calls on an
+        uncompiled tree. It is a no-op for compiled tables, and for
+        `filter_mask`, where child masks are combined bitwise.
+        """
+        changed = False
+        for node in self.walk():
+            if node.reorder(min_samples):
+                changed = True
+        return changed
+    
+    def stats_report(self) -> List[str]:
+        """Get one line of counters per instrumented node."""
+        lines = []
+        
+        def visit(node: "ItemFilter", depth: int) -> None:
+            if node.stats is not None:
+                st = node.stats
+                lines.append(
+                    f"{'  ' * depth}{node.describe()}: evaluated {st.evaluated}, "
+                    f"passed {st.passed} ({st.pass_rate:.0%}), rejected {st.rejected}, "
+                    f"avg {st.avg_ns:.0f}ns"
+                )
+            for child in node.children:
+                visit(child, depth + 1)
+        
+        visit(self, 0)
+        return lines
+    
+    def filter_mask(self, columns: ShopColumns) -> int:
+        """Evaluate filter for a whole snapshot, returning a bitset mask."""
+        mask = 0
+        for position, item in enumerate(columns.items):
+            if self.should_include(item):
+                mask |= 1 << position
+        return mask
+    
+    @property
+    def compilable(self) -> bool:
+        """Whether the filter only looks at type, rarity, name and in_stock.
+        
+        Compiling evaluates the filter on probe items per catalog key, so a
+        filter reading anything else (quantity, price) must stay uncompiled.
+        """
+        return False
+    
+    def compile(self, catalog: Optional[Iterable[CatalogKey]] = None) -> "ItemFilter":
+        """Compile filter into a decision table, if it supports it."""
+        if not self.compilable:
+            return self
+        return CompiledFilter(self, catalog)
 
 
 class RarityFilter(ItemFilter):
@@ -34,19 +248,37 @@ class RarityFilter(ItemFilter):
         Rarity.TRANSCENDENT,
         Rarity.CELESTIAL,
     ]
+    RARITY_RANK = {rarity: index for index, rarity in enumerate(RARITY_ORDER)}
     
     def __init__(self, min_rarity: Rarity):
         self.min_rarity = min_rarity
-        self.min_rarity_index = self.RARITY_ORDER.index(min_rarity)
+        self.min_rarity_index = self.RARITY_RANK[min_rarity]
     
     def should_include(self, item: ShopItem) -> bool:
         """Include items with rarity >= min_rarity."""
-        try:
-            item_rarity_index = self.RARITY_ORDER.index(item.rarity)
-            return item_rarity_index >= self.min_rarity_index
-        except ValueError:
+        item_rarity_index = self.RARITY_RANK.get(item.rarity)
+        if item_rarity_index is None:
             # Unknown rarity - exclude by default
             return False
+        return item_rarity_index >= self.min_rarity_index
+    
+    def describe(self) -> str:
+        """Short human-readable label of the node."""
+        return f"rarity >= {self.min_rarity.value}"
+    
+    @property
+    def compilable(self) -> bool:
+        """Only reads rarity, so the table can hold the verdict."""
+        return True
+    
+    def filter_mask(self, columns: ShopColumns) -> int:
+        """Union of the masks of all rarities >= min_rarity."""
+        mask = 0
+        for rarity, rarity_mask in columns.rarity_masks.items():
+            rank = self.RARITY_RANK.get(rarity)
+            if rank is not None and rank >= self.min_rarity_index:
+                mask |= rarity_mask
+        return mask
 
 
 class ItemTypeFilter(ItemFilter):
@@ -58,6 +290,22 @@ class ItemTypeFilter(ItemFilter):
     def should_include(self, item: ShopItem) -> bool:
         """Include items of allowed types."""
         return item.type in self.allowed_types
+    
+    def describe(self) -> str:
+        """Short human-readable label of the node."""
+        return f"type in {sorted(t.value for t in self.allowed_types)}"
+    
+    @property
+    def compilable(self) -> bool:
+        """Only reads the type, so the table can hold the verdict."""
+        return True
+    
+    def filter_mask(self, columns: ShopColumns) -> int:
+        """Union of the masks of allowed types."""
+        mask = 0
+        for item_type in self.allowed_types:
+            mask |= columns.type_masks.get(item_type, 0)
+        return mask
 
 
 class ItemNameFilter(ItemFilter):
@@ -69,6 +317,22 @@ class ItemNameFilter(ItemFilter):
     def should_include(self, item: ShopItem) -> bool:
         """Include items not in exclusion list."""
         return item.name.lower() not in self.excluded_names
+    
+    def describe(self) -> str:
+        """Short human-readable label of the node."""
+        return f"name not in {sorted(self.excluded_names)}"
+    
+    @property
+    def compilable(self) -> bool:
+        """Only reads the name, so the table can hold the verdict."""
+        return True
+    
+    def filter_mask(self, columns: ShopColumns) -> int:
+        """All items minus the masks of excluded names."""
+        excluded = 0
+        for name in self.excluded_names:
+            excluded |= columns.name_mask(name)
+        return columns.all_mask & ~excluded
 
 
 class SpecificItemsFilter(ItemFilter):
@@ -80,6 +344,22 @@ class SpecificItemsFilter(ItemFilter):
     def should_include(self, item: ShopItem) -> bool:
         """Include only items in allowed list."""
         return item.name.lower() in self.allowed_names
+    
+    def describe(self) -> str:
+        """Short human-readable label of the node."""
+        return f"name in {sorted(self.allowed_names)}"
+    
+    @property
+    def compilable(self) -> bool:
+        """Only reads the name, so the table can hold the verdict."""
+        return True
+    
+    def filter_mask(self, columns: ShopColumns) -> int:
+        """Union of the masks of allowed names."""
+        mask = 0
+        for name in self.allowed_names:
+            mask |= columns.name_mask(name)
+        return mask
 
 
 class InStockFilter(ItemFilter):
@@ -88,6 +368,19 @@ class InStockFilter(ItemFilter):
     def should_include(self, item: ShopItem) -> bool:
         """Include only items that are in stock."""
         return item.in_stock
+    
+    def describe(self) -> str:
+        """Short human-readable label of the node."""
+        return "in stock"
+    
+    @property
+    def compilable(self) -> bool:
+        """Only reads in_stock, so the table can hold the verdict."""
+        return True
+    
+    def filter_mask(self, columns: ShopColumns) -> int:
+        """Precomputed in-stock mask."""
+        return columns.in_stock_mask
 
 
 class CompositeFilter(ItemFilter):
@@ -95,10 +388,57 @@ class CompositeFilter(ItemFilter):
     
     def __init__(self, filters: list[ItemFilter]):
         self.filters = filters
+        self.declared_filters = list(filters)
     
     def should_include(self, item: ShopItem) -> bool:
         """Include item only if all filters pass."""
         return all(f.should_include(item) for f in self.filters)
+    
+    def describe(self) -> str:
+        """Short human-readable label of the node."""
+        return "AND"
+    
+    @property
+    def children(self) -> List[ItemFilter]:
+        """Child filters."""
+        return self.filters
+    
+    def explain(self, item: ShopItem) -> FilterExplanation:
+        """Explain children up to the first rejection."""
+        explanation = FilterExplanation(self.describe(), True)
+        for f in self.filters:
+            child = f.explain(item)
+            explanation.children.append(child)
+            if not child.result:
+                explanation.result = False
+                break
+        return explanation
+    
+    def filter_mask(self, columns: ShopColumns) -> int:
+        """Bitwise AND of child masks."""
+        mask = columns.all_mask
+        for f in self.filters:
+            if not mask:
+                break
+            mask &= f.filter_mask(columns)
+        return mask
+    
+    @property
+    def compilable(self) -> bool:
+        """Compilable if all child filters are."""
+        return all(f.compilable for f in self.filters)
+    
+    def reorder(self, min_samples: int = 100) -> bool:
+        """Run children that reject most per nanosecond first."""
+        ordered = _order_by_cost(self.filters, min_samples, lambda st: st.rejected / st.evaluated)
+        if ordered is None or ordered == self.filters:
+            return False
+        self.filters = ordered
+        return True
+    
+    def restore_order(self) -> None:
+        """Go back to the declared child order."""
+        self.filters = list(self.declared_filters)
 
 
 class RobloxGardenFilter:
@@ -157,6 +497,13 @@ class RobloxGardenFilter:
         egg_filter = cls.create_egg_filter()
         
         return OrFilter([seed_filter, gear_filter, egg_filter])
+    
+    @classmethod
+    def create_compiled_filter(cls) -> ItemFilter:
+        """Create combined filter compiled against the static item catalog."""
+        from roblox_garden.utils.static_rarity_db import StaticRarityDatabase
+        
+        return cls.create_combined_filter().compile(StaticRarityDatabase.get_catalog())
 
 
 class OrFilter(ItemFilter):
@@ -164,13 +511,87 @@ class OrFilter(ItemFilter):
     
     def __init__(self, filters: list[ItemFilter]):
         self.filters = filters
+        self.declared_filters = list(filters)
     
     def should_include(self, item: ShopItem) -> bool:
         """Include item if any filter passes."""
         return any(f.should_include(item) for f in self.filters)
+    
+    def describe(self) -> str:
+        """Short human-readable label of the node."""
+        return "OR"
+    
+    @property
+    def children(self) -> List[ItemFilter]:
+        """Child filters."""
+        return self.filters
+    
+    def explain(self, item: ShopItem) -> FilterExplanation:
+        """Explain children up to the first acceptance."""
+        explanation = FilterExplanation(self.describe(), False)
+        for f in self.filters:
+            child = f.explain(item)
+            explanation.children.append(child)
+            if child.result:
+                explanation.result = True
+                break
+        return explanation
+    
+    def filter_mask(self, columns: ShopColumns) -> int:
+        """Bitwise OR of child masks."""
+        mask = 0
+        for f in self.filters:
+            if mask == columns.all_mask:
+                break
+            mask |= f.filter_mask(columns)
+        return mask
+    
+    @property
+    def compilable(self) -> bool:
+        """Compilable if all child filters are."""
+        return all(f.compilable for f in self.filters)
+    
+    def reorder(self, min_samples: int = 100) -> bool:
+        """Run children that accept most per nanosecond first."""
+        ordered = _order_by_cost(self.filters, min_samples, lambda st: st.pass_rate)
+        if ordered is None or ordered == self.filters:
+            return False
+        self.filters = ordered
+        return True
+    
+    def restore_order(self) -> None:
+        """Go back to the declared child order."""
+        self.filters = list(self.declared_filters)
+
+
+class RaritySetFilter(ItemFilter):
+    """Filter items by an explicit set of rarities."""
+    
+    def __init__(self, allowed_rarities: Set[Rarity]):
+        self.allowed_rarities = set(allowed_rarities)
+    
+    def should_include(self, item: ShopItem) -> bool:
+        """Include items whose rarity is in the allowed set."""
+        return item.rarity in self.allowed_rarities
+    
+    def describe(self) -> str:
+        """Short human-readable label of the node."""
+        return f"rarity in {sorted(r.value for r in self.allowed_rarities)}"
+    
+    @property
+    def compilable(self) -> bool:
+        """Only reads rarity, so the table can hold the verdict."""
+        return True
+    
+    def filter_mask(self, columns: ShopColumns) -> int:
+        """Union of the masks of allowed rarities."""
+        mask = 0
+        for rarity in self.allowed_rarities:
+            mask |= columns.rarity_masks.get(rarity, 0)
+        return mask
 
 
-class HighTierSeedFilter(ItemFilter):
+class HighTierSeedFilter(RaritySetFilter):
     """Filter for high-tier seeds (Divine, Prismatic, Transcendent - excluding Mythical)."""
     
     ALLOWED_SEED_RARITIES = {
@@ -179,6 +600,71 @@ class HighTierSeedFilter(ItemFilter):
         Rarity.TRANSCENDENT
     }
     
+    def __init__(self):
+        super().__init__(self.ALLOWED_SEED_RARITIES)
+
+
+class CompiledFilter(ItemFilter):
+    """Filter tree precomputed into a decision table.
+    
+    The static predicates (type, rarity, name) are evaluated once per catalog
+    entry for both values of the in-stock flag. At runtime filtering is one
+    dict lookup plus one flag check. Items missing from the catalog are
+    compiled on first sight.
+    """
+    
+    def __init__(self, source: ItemFilter, catalog: Optional[Iterable[CatalogKey]] = None):
+        self.source = source
+        # (type, rarity, name) -> (verdict if out of stock, verdict if in stock)
+        self.table: Dict[CatalogKey, Tuple[bool, bool]] = {}
+        
+        for item_type, rarity, name in catalog or ():
+            self._compile_entry(item_type, rarity, name)
+    
+    def _compile_entry(self, item_type: ItemType, rarity: Rarity, name: str) -> Tuple[bool, bool]:
+        """Evaluate the source tree for one catalog entry."""
+        out_of_stock = ShopItem.model_construct(
+            id="", name=name, type=item_type, rarity=rarity, quantity=0, in_stock=False
+        )
+        in_stock = ShopItem.model_construct(
+            id="", name=name, type=item_type, rarity=rarity, quantity=1, in_stock=True
+        )
+        entry = (self.source.should_include(out_of_stock), self.source.should_include(in_stock))
+        self.table[(item_type, rarity, name)] = entry
+        return entry
+    
     def should_include(self, item: ShopItem) -> bool:
-        """Include seeds with Divine+ rarity but exclude Mythical."""
-        return item.rarity in self.ALLOWED_SEED_RARITIES
+        """Look up the precomputed verdict for the item."""
+        entry = self.table.get((item.type, item.rarity, item.name))
+        if entry is None:
+            entry = self._compile_entry(item.type, item.rarity, item.name)
+        return entry[item.in_stock]
+    
+    def describe(self) -> str:
+        """Short human-readable label of the node."""
+        return f"compiled table ({len(self.table)} entries)"
+    
+    def explain(self, item: ShopItem) -> FilterExplanation:
+        """Explain the verdict through the source tree."""
+        explanation = FilterExplanation(self.describe(), type(self).should_include(self, item))
+        explanation.children.append(self.source.explain(item))
+        return explanation
+    
+    def filter_mask(self, columns: ShopColumns) -> int:
+        """One table lookup per distinct catalog entry in the snapshot."""
+        mask = 0
+        for key, key_mask in columns.key_masks.items():
+            entry = self.table.get(key)
+            if entry is None:
+                entry = self._compile_entry(*key)
+            if entry[1]:
+                mask |= key_mask & columns.in_stock_mask
+            if entry[0]:
+                mask |= key_mask & ~columns.in_stock_mask
+        return mask
+    
+    def compile(self, catalog: Optional[Iterable[CatalogKey]] = None) -> ItemFilter:
+        """Already compiled; extend the table with extra catalog entries."""
+        for item_type, rarity, name in catalog or ():
+            self._compile_entry(item_type, rarity, name)
+        return self
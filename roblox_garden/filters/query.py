@@ -0,0 +1,101 @@
+"""
+Short filter queries typed by users, e.g. `/subscribe prismatic seeds`.
+
+A query is a list of words; each word narrows the rule down:
+
+* item types: `seeds`, `gear`, `eggs` (also `семена`, `инструменты`, `яйца`)
+* rarities: `divine`, `prismatic`, ... (several words accept any of them)
+* minimum rarity: `divine+`
+* item names in quotes: `"Giant Pinecone"`
+* `all`: every item in stock
+
+Queries compile to a `FilterRule`, so they match exactly like rules from a
+rules file and can be put into a `SubscriptionIndex`.
+"""
+
+import shlex
+from typing import Dict, Set
+
+from roblox_garden.models.shop import ItemType, Rarity
+from roblox_garden.filters.item_filters import RarityFilter
+from roblox_garden.filters.rules import FilterRule
+
+TYPE_WORDS: Dict[str, ItemType] = {
+    "seed": ItemType.SEED, "seeds": ItemType.SEED, "семя": ItemType.SEED, "семена": ItemType.SEED,
+    "gear": ItemType.GEAR, "gears": ItemType.GEAR, "tool": ItemType.GEAR, "tools": ItemType.GEAR,
+    "инструмент": ItemType.GEAR, "инструменты": ItemType.GEAR,
+    "egg": ItemType.EGG, "eggs": ItemType.EGG, "яйцо": ItemType.EGG, "яйца": ItemType.EGG,
+}
+
+RARITY_WORDS: Dict[str, Rarity] = {
+    rarity.value.lower(): rarity for rarity in Rarity if rarity != Rarity.UNKNOWN
+}
+
+ALL_WORD = "all"
+
+# Longest query accepted, in characters
+MAX_QUERY_LENGTH = 200
+
+
+class QueryError(ValueError):
+    """Query cannot be parsed."""
+
+
+def parse_query(query: str) -> FilterRule:
+    """Compile a user query into a filter rule."""
+    query = query.strip()
+    if not query:
+        raise QueryError("empty query")
+    if len(query) > MAX_QUERY_LENGTH:
+        raise QueryError(f"query is longer than {MAX_QUERY_LENGTH} characters")
+
+    try:
+        words = shlex.split(query)
+    except ValueError as e:
+        raise QueryError(f"unbalanced quotes: {e}") from e
+
+    types: Set[ItemType] = set()
+    rarities: Set[Rarity] = set()
+    min_rarity = None
+    names: Set[str] = set()
+    catalog_names = _catalog_names()
+
+    for word in words:
+        lowered = word.lower()
+
+        if lowered == ALL_WORD and len(words) == 1:
+            continue
+        if lowered in TYPE_WORDS:
+            types.add(TYPE_WORDS[lowered])
+            continue
+        if lowered in RARITY_WORDS:
+            rarities.add(RARITY_WORDS[lowered])
+            continue
+        if lowered.endswith("+") and lowered[:-1] in RARITY_WORDS:
+            rarity = RARITY_WORDS[lowered[:-1]]
+            if rarity not in RarityFilter.RARITY_RANK:
+                raise QueryError(f"{rarity.value} cannot be used as minimum rarity")
+            if min_rarity is not None:
+                raise QueryError("only one minimum rarity is allowed")
+            min_rarity = rarity
+            continue
+        if lowered in catalog_names:
+            names.add(catalog_names[lowered])
+            continue
+
+        raise QueryError(f"unknown word '{word}'")
+
+    return FilterRule(
+        name=query,
+        types=types,
+        rarities=rarities or None,
+        min_rarity=min_rarity,
+        include_names=names or None,
+    )
+
+
+def _catalog_names() -> Dict[str, str]:
+    """Map lowercase item names of the catalog to their spelling."""
+    from roblox_garden.utils.static_rarity_db import StaticRarityDatabase
+
+    return {name.lower(): name for name in StaticRarityDatabase.get_all_items()}
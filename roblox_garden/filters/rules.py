@@ -0,0 +1,251 @@
+"""
+Declarative filter rules loaded from a JSON/YAML file.
+
+Rules are validated, compiled into a decision table and swapped in
+atomically, so filter policy can change without restarting the bot.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import List, Optional, Set
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from roblox_garden.models.shop import ShopItem, ShopColumns, ItemType, Rarity
+from roblox_garden.filters.item_filters import (
+    CompositeFilter,
+    FilterExplanation,
+    HighTierSeedFilter,
+    InStockFilter,
+    ItemFilter,
+    ItemNameFilter,
+    ItemTypeFilter,
+    OrFilter,
+    RarityFilter,
+    RaritySetFilter,
+    RobloxGardenFilter,
+    SpecificItemsFilter,
+)
+
+
+class FilterRule(BaseModel):
+    """One rule; an item matches when all given conditions hold."""
+
+    name: str = Field(..., description="Rule name for logs")
+    types: Set[ItemType] = Field(default_factory=set, description="Allowed types (empty = any)")
+    min_rarity: Optional[Rarity] = Field(default=None, description="Minimum rarity")
+    rarities: Optional[Set[Rarity]] = Field(default=None, description="Explicit allowed rarities")
+    include_names: Optional[Set[str]] = Field(default=None, description="Only these item names")
+    exclude_names: Set[str] = Field(default_factory=set, description="Excluded item names")
+    in_stock: bool = Field(default=True, description="Only items in stock")
+
+    model_config = {"extra": "forbid"}
+
+    @field_validator("min_rarity")
+    @classmethod
+    def _check_min_rarity(cls, value: Optional[Rarity]) -> Optional[Rarity]:
+        """Minimum rarity must have a rank."""
+        if value is not None and value not in RarityFilter.RARITY_RANK:
+            raise ValueError(f"{value.value} cannot be used as minimum rarity")
+        return value
+
+    def to_filter(self) -> ItemFilter:
+        """Build the filter tree for this rule."""
+        filters: List[ItemFilter] = []
+
+        if self.types:
+            filters.append(ItemTypeFilter(set(self.types)))
+        if self.rarities is not None:
+            filters.append(RaritySetFilter(set(self.rarities)))
+        if self.min_rarity is not None:
+            filters.append(RarityFilter(self.min_rarity))
+        if self.include_names is not None:
+            filters.append(SpecificItemsFilter(set(self.include_names)))
+        if self.exclude_names:
+            filters.append(ItemNameFilter(set(self.exclude_names)))
+        if self.in_stock:
+            filters.append(InStockFilter())
+
+        return CompositeFilter(filters)
+
+
+class FilterRules(BaseModel):
+    """Rules file; an item is included when any rule matches."""
+
+    version: int = Field(default=1, description="Rules format version")
+    rules: List[FilterRule] = Field(..., min_length=1, description="Filter rules")
+
+    model_config = {"extra": "forbid"}
+
+    def to_filter(self) -> ItemFilter:
+        """Build the combined filter tree."""
+        return OrFilter([rule.to_filter() for rule in self.rules])
+
+    def compile(self) -> ItemFilter:
+        """Build the filter tree and compile it against the static catalog."""
+        from roblox_garden.utils.static_rarity_db import StaticRarityDatabase
+
+        return self.to_filter().compile(StaticRarityDatabase.get_catalog())
+
+    @classmethod
+    def default(cls) -> "FilterRules":
+        """Rules equivalent to RobloxGardenFilter.create_combined_filter()."""
+        return cls(rules=[
+            FilterRule(
+                name="seeds",
+                types={ItemType.SEED},
+                rarities=set(HighTierSeedFilter.ALLOWED_SEED_RARITIES),
+            ),
+            FilterRule(
+                name="gear",
+                types={ItemType.GEAR},
+                min_rarity=Rarity.DIVINE,
+                exclude_names=set(RobloxGardenFilter.EXCLUDED_GEAR_NAMES),
+            ),
+            FilterRule(
+                name="eggs",
+                types={ItemType.EGG},
+                include_names=set(RobloxGardenFilter.ALLOWED_EGG_NAMES),
+            ),
+        ])
+
+    @classmethod
+    def load(cls, path: str) -> "FilterRules":
+        """Load and validate rules from a JSON or YAML file."""
+        rules_path = Path(path)
+        text = rules_path.read_text(encoding="utf-8")
+
+        if rules_path.suffix.lower() in (".yaml", ".yml"):
+            if yaml is None:
+                raise ValueError("PyYAML is required for YAML filter rules")
+            data = yaml.safe_load(text)
+        else:
+            data = json.loads(text)
+
+        return cls.model_validate(data)
+
+
+class ReloadableFilter(ItemFilter):
+    """Filter backed by a rules file that can be reloaded at runtime.
+
+    The compiled filter is replaced by a single reference assignment, so a
+    poll either sees the old rules or the new ones, never a mix. Invalid
+    files are rejected and the previous rules stay active.
+
+    A decision table has no per-rule nodes, so while stats are enabled the
+    rules run as the uncompiled `FilterRules.to_filter()` tree instead, so
+    stats and explain see every predicate.
+    """
+
+    def __init__(self, rules_file: Optional[str] = None):
+        self.rules_file = rules_file
+        self.rules = FilterRules.default()
+        self._current: ItemFilter = self.rules.compile()
+        self._mtime: Optional[float] = None
+
+        if rules_file:
+            self.reload()
+
+    @property
+    def current(self) -> ItemFilter:
+        """Currently active filter (compiled unless stats are enabled)."""
+        return self._current
+
+    def _build(self, rules: FilterRules) -> ItemFilter:
+        """Build the active filter for rules in the current mode."""
+        return rules.to_filter() if self.stats_enabled else rules.compile()
+
+    def enable_stats(self) -> None:
+        """Switch to the uncompiled rules tree and count evaluations on it."""
+        if not self.stats_enabled:
+            # Set the wrappers first so _build picks the uncompiled tree
+            self._install_stats()
+            self._current = self._build(self.rules)
+        super().enable_stats()
+
+    def disable_stats(self) -> None:
+        """Stop counting and go back to the compiled table."""
+        super().disable_stats()
+        self._current = self._build(self.rules)
+
+    @property
+    def compilable(self) -> bool:
+        """Never frozen into a parent table; rules may change."""
+        return False
+
+    def should_include(self, item: ShopItem) -> bool:
+        """Delegate to the active filter."""
+        return self._current.should_include(item)
+
+    def describe(self) -> str:
+        """Short human-readable label of the node."""
+        return f"rules from {self.rules_file}" if self.rules_file else "built-in rules"
+
+    @property
+    def children(self) -> List[ItemFilter]:
+        """The active filter."""
+        return [self._current]
+
+    def explain(self, item: ShopItem) -> FilterExplanation:
+        """Explain the verdict of the active filter."""
+        child = self._current.explain(item)
+        return FilterExplanation(self.describe(), child.result, [child])
+
+    def filter_mask(self, columns: ShopColumns) -> int:
+        """Delegate to the active filter."""
+        return self._current.filter_mask(columns)
+
+    def reload(self) -> bool:
+        """Load, validate and compile the rules file, then swap it in."""
+        if not self.rules_file:
+            return False
+
+        try:
+            self._mtime = Path(self.rules_file).stat().st_mtime
+            rules = FilterRules.load(self.rules_file)
+            current = self._build(rules)
+        except (OSError, ValueError, ValidationError) as e:
+            logger.error(f"❌ Invalid filter rules in {self.rules_file}, keeping previous rules: {e}")
+            return False
+
+        if self.stats_enabled:
+            current.enable_stats()
+
+        self.rules = rules
+        self._current = current
+        logger.info(f"✅ Loaded {len(rules.rules)} filter rules from {self.rules_file}")
+        return True
+
+    def check_for_changes(self) -> bool:
+        """Reload if the rules file changed on disk."""
+        if not self.rules_file:
+            return False
+
+        try:
+            mtime = Path(self.rules_file).stat().st_mtime
+        except OSError:
+            return False
+
+        if mtime == self._mtime:
+            return False
+
+        logger.info(f"🔄 Filter rules file changed: {self.rules_file}")
+        return self.reload()
+
+    async def watch(self, interval: float = 5.0) -> None:
+        """Poll the rules file for changes until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            self.check_for_changes()
@@ -0,0 +1,294 @@
+"""
+Inverted index matching stock changes against many subscriptions.
+
+Instead of evaluating every subscriber's filter tree for every item, the
+index maps item attributes (type, rarity, name) to the sets of
+subscriptions that accept them. Matching an item is a handful of set
+intersections, so a poll costs roughly O(items + matches).
+
+Subscriptions come from a JSON file (channels) or from a SQLite database
+filled by the subscriber bot (users). Both are loaded into the index once;
+polls never query the database.
+"""
+
+import json
+import sqlite3
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+from roblox_garden.models.shop import ShopItem, ItemType, Rarity
+from roblox_garden.filters.item_filters import RarityFilter
+from roblox_garden.filters.rules import FilterRule
+
+
+@dataclass
+class Subscription:
+    """Filter rule registered for a subscriber (channel or user)."""
+    id: Hashable
+    subscriber: Hashable
+    rule: FilterRule
+
+
+class SubscriptionIndex:
+    """Index of subscriptions by the item attributes they accept."""
+
+    def __init__(self):
+        self.subscriptions: Dict[Hashable, Subscription] = {}
+
+        # Subscriptions without a constraint on an attribute
+        self._any_type: Set[Hashable] = set()
+        self._any_name: Set[Hashable] = set()
+
+        # Attribute value -> subscriptions accepting it
+        self._by_type: Dict[ItemType, Set[Hashable]] = defaultdict(set)
+        self._by_rarity: Dict[Rarity, Set[Hashable]] = defaultdict(set)
+        self._include_name: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._exclude_name: Dict[str, Set[Hashable]] = defaultdict(set)
+
+        # Subscriptions that only want items in stock
+        self._in_stock_only: Set[Hashable] = set()
+
+    def __len__(self) -> int:
+        return len(self.subscriptions)
+
+    def __contains__(self, subscription_id: Hashable) -> bool:
+        return subscription_id in self.subscriptions
+
+    @staticmethod
+    def _accepted_rarities(rule: FilterRule) -> List[Rarity]:
+        """Expand rarity constraints of a rule to the rarities it accepts."""
+        accepted = []
+        min_rank = RarityFilter.RARITY_RANK[rule.min_rarity] if rule.min_rarity else None
+
+        for rarity in Rarity:
+            if rule.rarities is not None and rarity not in rule.rarities:
+                continue
+            if min_rank is not None:
+                rank = RarityFilter.RARITY_RANK.get(rarity)
+                if rank is None or rank < min_rank:
+                    continue
+            accepted.append(rarity)
+
+        return accepted
+
+    def add(self, subscription: Subscription) -> None:
+        """Add (or replace) a subscription."""
+        if subscription.id in self.subscriptions:
+            self.remove(subscription.id)
+
+        sid = subscription.id
+        rule = subscription.rule
+        self.subscriptions[sid] = subscription
+
+        if rule.types:
+            for item_type in rule.types:
+                self._by_type[item_type].add(sid)
+        else:
+            self._any_type.add(sid)
+
+        for rarity in self._accepted_rarities(rule):
+            self._by_rarity[rarity].add(sid)
+
+        if rule.include_names is not None:
+            for name in rule.include_names:
+                self._include_name[name.lower()].add(sid)
+        else:
+            self._any_name.add(sid)
+
+        for name in rule.exclude_names:
+            self._exclude_name[name.lower()].add(sid)
+
+        if rule.in_stock:
+            self._in_stock_only.add(sid)
+
+    def remove(self, subscription_id: Hashable) -> bool:
+        """Remove a subscription. Returns False if it was not registered."""
+        subscription = self.subscriptions.pop(subscription_id, None)
+        if subscription is None:
+            return False
+
+        rule = subscription.rule
+        sid = subscription_id
+
+        self._any_type.discard(sid)
+        for item_type in rule.types:
+            self._discard(self._by_type, item_type, sid)
+
+        for rarity in self._accepted_rarities(rule):
+            self._discard(self._by_rarity, rarity, sid)
+
+        self._any_name.discard(sid)
+        for name in rule.include_names or ():
+            self._discard(self._include_name, name.lower(), sid)
+        for name in rule.exclude_names:
+            self._discard(self._exclude_name, name.lower(), sid)
+
+        self._in_stock_only.discard(sid)
+        return True
+
+    @staticmethod
+    def _discard(index: Dict, key, sid: Hashable) -> None:
+        """Remove a subscription from an index bucket, dropping empty buckets."""
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.discard(sid)
+            if not bucket:
+                del index[key]
+
+    def match(self, item: ShopItem) -> Set[Hashable]:
+        """Get ids of subscriptions accepting the item."""
+        by_rarity = self._by_rarity.get(item.rarity)
+        if not by_rarity:
+            return set()
+
+        by_type = self._by_type.get(item.type)
+        name = item.name.lower()
+        include = self._include_name.get(name)
+
+        # A subscription accepts the type either explicitly or through "any
+        # type", and likewise for the name. Intersect each combination on its
+        # own instead of building unions of the (possibly large) "any" sets.
+        type_sets = [bucket for bucket in (by_type, self._any_type) if bucket]
+        name_sets = [bucket for bucket in (include, self._any_name) if bucket]
+
+        matched: Set[Hashable] = set()
+        for type_set in type_sets:
+            for name_set in name_sets:
+                matched |= self._intersect(type_set, by_rarity, name_set)
+
+        if matched:
+            exclude = self._exclude_name.get(name)
+            if exclude:
+                matched -= exclude
+            if not item.in_stock:
+                matched -= self._in_stock_only
+
+        return matched
+
+    @staticmethod
+    def _intersect(*sets: Set[Hashable]) -> Set[Hashable]:
+        """Intersect sets, iterating the smallest one."""
+        smallest, *rest = sorted(sets, key=len)
+        return {sid for sid in smallest if all(sid in other for other in rest)}
+
+    def match_items(self, items: Iterable[ShopItem]) -> Dict[Hashable, List[ShopItem]]:
+        """Group items by the subscribers they should be delivered to."""
+        result: Dict[Hashable, List[ShopItem]] = defaultdict(list)
+
+        for item in items:
+            subscribers = {self.subscriptions[sid].subscriber for sid in self.match(item)}
+            for subscriber in subscribers:
+                result[subscriber].append(item)
+
+        return dict(result)
+
+
+class ChannelSubscription(BaseModel):
+    """Subscription entry of a subscriptions file."""
+
+    id: str = Field(..., description="Unique subscription id")
+    chat_id: str = Field(..., description="Target chat or channel id")
+    rule: FilterRule = Field(..., description="Items to deliver")
+
+    model_config = {"extra": "forbid"}
+
+
+class SubscriptionsFile(BaseModel):
+    """Per-channel subscriptions loaded from JSON."""
+
+    subscriptions: List[ChannelSubscription] = Field(default_factory=list)
+
+    model_config = {"extra": "forbid"}
+
+    @classmethod
+    def load(cls, path: str) -> "SubscriptionsFile":
+        """Load and validate a subscriptions file."""
+        return cls.model_validate(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def to_subscriptions(self) -> List[Subscription]:
+        """Convert entries to index subscriptions keyed by chat id."""
+        return [Subscription(entry.id, entry.chat_id, entry.rule) for entry in self.subscriptions]
+
+
+class SubscriptionStore:
+    """User subscriptions persisted in SQLite."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS subscriptions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        chat_id TEXT NOT NULL,
+        query TEXT NOT NULL,
+        rule TEXT NOT NULL,
+        created_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS subscriptions_chat ON subscriptions (chat_id);
+    """
+
+    # Prefix of index ids, keeps them apart from subscriptions file ids
+    ID_PREFIX = "user:"
+
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+
+    @classmethod
+    def index_id(cls, row_id: int) -> str:
+        """Get the index id of a stored subscription."""
+        return f"{cls.ID_PREFIX}{row_id}"
+
+    def add(self, chat_id: str, query: str, rule: FilterRule) -> Subscription:
+        """Store a subscription and return it ready for the index."""
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO subscriptions (chat_id, query, rule, created_at) VALUES (?, ?, ?, ?)",
+                (str(chat_id), query, rule.model_dump_json(), time.time())
+            )
+        return Subscription(self.index_id(cursor.lastrowid), str(chat_id), rule)
+
+    def remove(self, chat_id: str, row_id: Optional[int] = None) -> List[str]:
+        """Remove one or all subscriptions of a chat, returning their index ids."""
+        if row_id is None:
+            rows = self._conn.execute(
+                "SELECT id FROM subscriptions WHERE chat_id = ?", (str(chat_id),)
+            ).fetchall()
+        else:
+            rows = self._conn.execute(
+                "SELECT id FROM subscriptions WHERE chat_id = ? AND id = ?", (str(chat_id), row_id)
+            ).fetchall()
+
+        with self._conn:
+            self._conn.executemany("DELETE FROM subscriptions WHERE id = ?", rows)
+        return [self.index_id(row[0]) for row in rows]
+
+    def list(self, chat_id: str) -> List[Tuple[int, str]]:
+        """Get (id, query) of the subscriptions of a chat."""
+        return self._conn.execute(
+            "SELECT id, query FROM subscriptions WHERE chat_id = ? ORDER BY id", (str(chat_id),)
+        ).fetchall()
+
+    def count(self, chat_id: str) -> int:
+        """Get number of subscriptions of a chat."""
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM subscriptions WHERE chat_id = ?", (str(chat_id),)
+        ).fetchone()[0]
+
+    def load(self) -> List[Subscription]:
+        """Load all stored subscriptions."""
+        subscriptions = []
+        for row_id, chat_id, rule in self._conn.execute("SELECT id, chat_id, rule FROM subscriptions"):
+            subscriptions.append(
+                Subscription(self.index_id(row_id), chat_id, FilterRule.model_validate_json(rule))
+            )
+        return subscriptions
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
@@ -0,0 +1 @@
+"""History module."""
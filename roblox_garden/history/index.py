@@ -0,0 +1,343 @@
+"""
+Indexes over stock history segments.
+
+Every segment gets a sidecar index with per-item posting lists of stock
+intervals. Sealed segments are indexed once and never re-read, so queries
+only touch the sidecars of the days they cover (plus the active segment).
+"""
+
+import json
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from roblox_garden.history.store import INDEX_SUFFIX, SEGMENT_SUFFIX, segment_name
+
+INDEX_VERSION = 1
+
+
+@dataclass
+class StockInterval:
+    """Period an item was in stock. None start/end means outside the segment/still open."""
+    start: Optional[float]
+    end: Optional[float]
+
+
+@dataclass
+class ItemPostings:
+    """Posting list of stock intervals for one item."""
+    name: str
+    type: str
+    rarity: str
+    intervals: List[StockInterval] = field(default_factory=list)
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the item is still in stock at the end of the list."""
+        return bool(self.intervals) and self.intervals[-1].end is None
+
+
+@dataclass
+class SegmentIndex:
+    """Index of a single history segment."""
+    path: Path
+    first_ts: Optional[float] = None
+    last_ts: Optional[float] = None
+    resets: List[float] = field(default_factory=list)
+    items: Dict[str, ItemPostings] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        """Segment base name (date)."""
+        return self.path.name[: -len(SEGMENT_SUFFIX)]
+
+    @property
+    def index_path(self) -> Path:
+        """Path of the sidecar index file."""
+        return self.path.with_name(f"{self.name}{INDEX_SUFFIX}")
+
+    @classmethod
+    def build(cls, path: Path) -> "SegmentIndex":
+        """Build index by reading a segment once."""
+        index = cls(path=path)
+
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue  # Truncated last line after a crash
+                index._apply(event)
+
+        return index
+
+    def _apply(self, event: dict) -> None:
+        """Apply one history event to the posting lists."""
+        ts = event.get("ts")
+        if ts is None:
+            return
+
+        if self.first_ts is None:
+            self.first_ts = ts
+        self.last_ts = ts
+
+        kind = event.get("event")
+        if kind == "reset":
+            # Intervals left open by a previous run end at the restart
+            self.resets.append(ts)
+            for postings in self.items.values():
+                if postings.is_open:
+                    postings.intervals[-1].end = ts
+            return
+
+        name = event.get("name")
+        if not name:
+            return
+
+        postings = self.items.get(name)
+        if postings is None:
+            postings = ItemPostings(name, event.get("type", ""), event.get("rarity", ""))
+            self.items[name] = postings
+
+        if kind == "in":
+            if postings.is_open:
+                return
+            if postings.intervals and postings.intervals[-1].end == ts:
+                # Still in stock across a restart
+                postings.intervals[-1].end = None
+            else:
+                postings.intervals.append(StockInterval(ts, None))
+        elif kind == "out":
+            if postings.is_open:
+                postings.intervals[-1].end = ts
+            elif not postings.intervals:
+                # Appeared in an earlier segment
+                postings.intervals.append(StockInterval(None, ts))
+
+    def to_dict(self) -> dict:
+        """Serialize index for the sidecar file."""
+        return {
+            "version": INDEX_VERSION,
+            "first_ts": self.first_ts,
+            "last_ts": self.last_ts,
+            "resets": self.resets,
+            "items": {
+                name: {
+                    "type": p.type,
+                    "rarity": p.rarity,
+                    "intervals": [[i.start, i.end] for i in p.intervals],
+                }
+                for name, p in self.items.items()
+            },
+        }
+
+    def save(self) -> None:
+        """Write sidecar index next to the segment."""
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.to_dict(), ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(self.index_path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SegmentIndex"]:
+        """Load sidecar index of a segment, if it is present and current."""
+        index_path = path.with_name(path.name[: -len(SEGMENT_SUFFIX)] + INDEX_SUFFIX)
+        try:
+            if index_path.stat().st_mtime < path.stat().st_mtime:
+                return None
+            data = json.loads(index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        if data.get("version") != INDEX_VERSION:
+            return None
+
+        return cls(
+            path=path,
+            first_ts=data.get("first_ts"),
+            last_ts=data.get("last_ts"),
+            resets=data.get("resets", []),
+            items={
+                name: ItemPostings(
+                    name,
+                    item["type"],
+                    item["rarity"],
+                    [StockInterval(start, end) for start, end in item["intervals"]],
+                )
+                for name, item in data.get("items", {}).items()
+            },
+        )
+
+
+class HistoryIndex:
+    """Query interface over all history segments."""
+
+    def __init__(self, history_dir: str):
+        self.history_dir = Path(history_dir)
+        # Segment names are dates, so sorting them gives the time index
+        self.segment_names: List[str] = sorted(
+            p.name[: -len(SEGMENT_SUFFIX)]
+            for p in self.history_dir.glob(f"*{SEGMENT_SUFFIX}")
+        ) if self.history_dir.exists() else []
+        self._segments: Dict[str, SegmentIndex] = {}
+
+    def segment(self, name: str) -> SegmentIndex:
+        """Get index of a segment, building its sidecar if needed."""
+        index = self._segments.get(name)
+        if index is not None:
+            return index
+
+        path = self.history_dir / f"{name}{SEGMENT_SUFFIX}"
+        index = SegmentIndex.load(path)
+        if index is None:
+            index = SegmentIndex.build(path)
+            if name < segment_name(datetime.now()):
+                # Active segment is still growing, only sealed ones are persisted
+                try:
+                    index.save()
+                except OSError:
+                    pass
+
+        self._segments[name] = index
+        return index
+
+    def _segments_between(self, since: Optional[datetime], until: Optional[datetime]) -> List[str]:
+        """Get names of segments overlapping a date range."""
+        lo = bisect_left(self.segment_names, segment_name(since)) if since else 0
+        hi = bisect_right(self.segment_names, segment_name(until)) if until else len(self.segment_names)
+        return self.segment_names[lo:hi]
+
+    def merged(self, names: Iterable[str]) -> Dict[str, ItemPostings]:
+        """Merge posting lists of consecutive segments."""
+        merged: Dict[str, ItemPostings] = {}
+
+        for name in names:
+            segment = self.segment(name)
+            first_reset = segment.resets[0] if segment.resets else None
+
+            for item_name, postings in merged.items():
+                # Interval carried over from a previous run that was not continued
+                if postings.is_open and first_reset is not None:
+                    segment_postings = segment.items.get(item_name)
+                    continued = (
+                        segment_postings is not None
+                        and segment_postings.intervals
+                        and segment_postings.intervals[0].start is None
+                        and segment_postings.intervals[0].end <= first_reset
+                    )
+                    if not continued:
+                        postings.intervals[-1].end = first_reset
+
+            for item_name, postings in segment.items.items():
+                target = merged.get(item_name)
+                if target is None:
+                    target = ItemPostings(item_name, postings.type, postings.rarity)
+                    merged[item_name] = target
+
+                for interval in postings.intervals:
+                    interval = StockInterval(interval.start, interval.end)
+                    last = target.intervals[-1] if target.intervals else None
+                    if interval.start is None:
+                        if last is not None and last.end is None:
+                            last.end = interval.end
+                        else:
+                            target.intervals.append(interval)
+                    elif last is not None and last.end == interval.start:
+                        last.end = interval.end
+                    else:
+                        target.intervals.append(interval)
+
+        return merged
+
+    def last_in_stock(self, item_name: str) -> Optional[ItemPostings]:
+        """Find the last stock interval of an item.
+
+        Returns postings whose last interval is the most recent one, or None
+        if the item never appeared.
+        """
+        wanted = item_name.lower()
+
+        for position in range(len(self.segment_names) - 1, -1, -1):
+            segment = self.segment(self.segment_names[position])
+            match = next((n for n in segment.items if n.lower() == wanted), None)
+            if match is None:
+                continue
+
+            # Walk back only as far as needed to find where the interval started
+            start = position
+            while start > 0:
+                first = self.segment(self.segment_names[start]).items.get(match)
+                if first and first.intervals and first.intervals[0].start is not None:
+                    break
+                start -= 1
+
+            tail = self.segment_names[start:]
+            return self.merged(tail).get(match)
+
+        return None
+
+    def appearances(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        rarity: Optional[str] = None,
+        item_name: Optional[str] = None,
+    ) -> List[Tuple[ItemPostings, StockInterval]]:
+        """Get stock intervals that started within a time range."""
+        names = self._segments_between(since, until)
+        if not names:
+            return []
+
+        # One extra segment so intervals crossing midnight get their end
+        position = self.segment_names.index(names[-1])
+        if position + 1 < len(self.segment_names):
+            names = names + [self.segment_names[position + 1]]
+
+        since_ts = since.timestamp() if since else float("-inf")
+        until_ts = until.timestamp() if until else float("inf")
+        wanted_rarity = rarity.lower() if rarity else None
+        wanted_name = item_name.lower() if item_name else None
+
+        result = []
+        for postings in self.merged(names).values():
+            if wanted_rarity and postings.rarity.lower() != wanted_rarity:
+                continue
+            if wanted_name and postings.name.lower() != wanted_name:
+                continue
+
+            starts = [i.start if i.start is not None else float("-inf") for i in postings.intervals]
+            lo = bisect_left(starts, since_ts)
+            hi = bisect_right(starts, until_ts)
+            result.extend((postings, interval) for interval in postings.intervals[lo:hi])
+
+        # Intervals open when the history began have no start
+        result.sort(key=lambda pair: pair[1].start if pair[1].start is not None else float("-inf"))
+        return result
+
+    def longest_droughts(self, now: Optional[datetime] = None) -> List[Tuple[ItemPostings, float, bool]]:
+        """Get the longest gap between stock intervals for every item.
+
+        Returns (postings, gap seconds, ongoing) sorted by gap, longest first.
+        """
+        now_ts = (now or datetime.now()).timestamp()
+        result = []
+
+        for postings in self.merged(self.segment_names).values():
+            longest = 0.0
+            ongoing = False
+            previous_end = None
+
+            for interval in postings.intervals:
+                if previous_end is not None and interval.start is not None:
+                    longest = max(longest, interval.start - previous_end)
+                previous_end = interval.end
+
+            if previous_end is not None and now_ts - previous_end > longest:
+                longest = now_ts - previous_end
+                ongoing = True
+
+            result.append((postings, longest, ongoing))
+
+        result.sort(key=lambda entry: entry[1], reverse=True)
+        return result
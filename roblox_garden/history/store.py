@@ -0,0 +1,106 @@
+"""
+Append-only stock history stored as daily JSONL segments.
+
+Only stock transitions are written: an "in" event when an item appears in
+stock and an "out" event when it disappears. A "reset" event marks a
+process start, so intervals left open by a previous run can be closed.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, IO, Optional
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+from roblox_garden.models.shop import ShopData, ShopItem
+
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".idx.json"
+
+
+def segment_name(moment: datetime) -> str:
+    """Get segment base name (one segment per day)."""
+    return moment.strftime("%Y-%m-%d")
+
+
+class HistoryWriter:
+    """Writes stock transitions of polled snapshots to history segments."""
+
+    def __init__(self, history_dir: str):
+        self.history_dir = Path(history_dir)
+        self._in_stock: Dict[str, ShopItem] = {}
+        self._segment: Optional[str] = None
+        self._file: Optional[IO[str]] = None
+        self._started = False
+
+    def record(self, shop_data: ShopData) -> int:
+        """Record stock transitions of a snapshot. Returns number of events written."""
+        timestamp = shop_data.timestamp
+        self._ensure_segment(timestamp)
+
+        events = []
+        if not self._started:
+            events.append({"ts": timestamp.timestamp(), "event": "reset"})
+            self._started = True
+
+        current = {item.name: item for item in shop_data.items if item.in_stock}
+
+        for name, item in current.items():
+            if name not in self._in_stock:
+                events.append(self._make_event("in", item, timestamp))
+
+        for name, item in self._in_stock.items():
+            if name not in current:
+                events.append(self._make_event("out", item, timestamp))
+
+        self._in_stock = current
+
+        if events:
+            self._file.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events))
+            self._file.flush()
+
+        return len(events)
+
+    def close(self) -> None:
+        """Close the active segment file."""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _make_event(self, kind: str, item: ShopItem, timestamp: datetime) -> dict:
+        """Create a stock transition event."""
+        return {
+            "ts": timestamp.timestamp(),
+            "event": kind,
+            "name": item.name,
+            "type": item.type.value,
+            "rarity": item.rarity.value,
+            "quantity": item.quantity,
+        }
+
+    def _ensure_segment(self, timestamp: datetime) -> None:
+        """Open the segment for the timestamp, sealing the previous one."""
+        name = segment_name(timestamp)
+        if name == self._segment and self._file:
+            return
+
+        previous = self._segment
+        self.close()
+
+        self.history_dir.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.history_dir / f"{name}{SEGMENT_SUFFIX}", "a", encoding="utf-8")
+        self._segment = name
+
+        if previous:
+            # Sealed segments never change again, so their index is written once
+            from roblox_garden.history.index import SegmentIndex
+
+            try:
+                SegmentIndex.build(self.history_dir / f"{previous}{SEGMENT_SUFFIX}").save()
+            except OSError as e:
+                logger.warning(f"Failed to write history index for {previous}: {e}")
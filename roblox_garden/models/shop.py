@@ -2,11 +2,12 @@
 Data models for Roblox Garden items and shop data.
 """
 
+import hashlib
 from enum import Enum
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class ItemType(str, Enum):
@@ -94,6 +95,68 @@ class ShopItem(BaseModel):
         )
 
 
+class ShopColumns:
+    """Columnar view of snapshot items for batch filtering.
+    
+    Masks are ints used as bitsets: bit i is set when items[i] is selected.
+    Per-value masks let filters combine whole columns with bitwise and/or
+    instead of evaluating every item.
+    """
+    
+    def __init__(self, items: List[ShopItem]):
+        self.items = items
+        self.size = len(items)
+        self.all_mask = (1 << self.size) - 1
+        
+        # Column arrays
+        self.types: List[ItemType] = []
+        self.rarities: List[Rarity] = []
+        self.name_ids: List[int] = []
+        
+        # Name vocabulary (lowercased) and per-value bitsets
+        self.name_index: Dict[str, int] = {}
+        self.name_masks: List[int] = []
+        self.type_masks: Dict[ItemType, int] = {}
+        self.rarity_masks: Dict[Rarity, int] = {}
+        self.key_masks: Dict[tuple, int] = {}
+        self.in_stock_mask = 0
+        
+        for position, item in enumerate(items):
+            bit = 1 << position
+            
+            name = item.name.lower()
+            name_id = self.name_index.get(name)
+            if name_id is None:
+                name_id = len(self.name_masks)
+                self.name_index[name] = name_id
+                self.name_masks.append(0)
+            
+            self.types.append(item.type)
+            self.rarities.append(item.rarity)
+            self.name_ids.append(name_id)
+            
+            self.name_masks[name_id] |= bit
+            self.type_masks[item.type] = self.type_masks.get(item.type, 0) | bit
+            self.rarity_masks[item.rarity] = self.rarity_masks.get(item.rarity, 0) | bit
+            key = (item.type, item.rarity, item.name)
+            self.key_masks[key] = self.key_masks.get(key, 0) | bit
+            if item.in_stock:
+                self.in_stock_mask |= bit
+    
+    def name_mask(self, name: str) -> int:
+        """Get mask of items with the given (lowercased) name."""
+        name_id = self.name_index.get(name)
+        return self.name_masks[name_id] if name_id is not None else 0
+    
+    def select(self, mask: int) -> List[ShopItem]:
+        """Get items selected by a mask, in snapshot order."""
+        return [item for position, item in enumerate(self.items) if mask >> position & 1]
+    
+    def to_bools(self, mask: int) -> List[bool]:
+        """Convert a mask to a list of booleans."""
+        return [bool(mask >> position & 1) for position in range(self.size)]
+
+
 class ShopData(BaseModel):
     """Complete shop data snapshot."""
     
@@ -103,8 +166,33 @@ class ShopData(BaseModel):
     in_stock_count: int = Field(default=0, description="Number of items in stock")
     out_of_stock_count: int = Field(default=0, description="Number of items out of stock")
     
+    # Monotonic clock readings around the API request, for latency tracing
+    fetch_started_at: Optional[float] = Field(default=None, exclude=True, description="Fetch start (time.monotonic)")
+    fetch_finished_at: Optional[float] = Field(default=None, exclude=True, description="Fetch end (time.monotonic)")
+    
+    _columns: Optional[ShopColumns] = PrivateAttr(default=None)
+    _snapshot_hash: Optional[str] = PrivateAttr(default=None)
+    
+    def snapshot_hash(self) -> str:
+        """Get a stable hash of the snapshot (timestamp and item stock)."""
+        if self._snapshot_hash is None:
+            digest = hashlib.sha1(self.timestamp.isoformat().encode("utf-8"))
+            for item in self.items:
+                digest.update(f"|{item.id}:{item.quantity}:{int(item.in_stock)}".encode("utf-8"))
+            self._snapshot_hash = digest.hexdigest()
+        return self._snapshot_hash
+    
+    def columns(self) -> ShopColumns:
+        """Get columnar view of the items (built once per snapshot)."""
+        if self._columns is None or self._columns.items is not self.items:
+            self._columns = ShopColumns(self.items)
+        return self._columns
+    
     def get_filtered_items(self, item_filter) -> List[ShopItem]:
         """Get items that pass the given filter."""
+        if hasattr(item_filter, "filter_mask"):
+            columns = self.columns()
+            return columns.select(item_filter.filter_mask(columns))
         return [item for item in self.items if item_filter.should_include(item)]
     
     def get_items_by_type(self, item_type: ItemType) -> List[ShopItem]:
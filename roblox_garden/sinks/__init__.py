@@ -0,0 +1,6 @@
+"""Event sinks module."""
+
+from .base import Sink, SinkBatcher, SinkEvent, SinkMetrics
+from .webhook import WebhookSink
+
+__all__ = ["Sink", "SinkBatcher", "SinkEvent", "SinkMetrics", "WebhookSink"]
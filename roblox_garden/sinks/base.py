@@ -0,0 +1,207 @@
+"""
+Sinks receive structured stock events.
+
+A sink is anything that accepts batches of `SinkEvent`s, such as an HTTP
+webhook. Events carry the items themselves, so consumers get JSON instead of
+parsing Telegram messages. Telegram channels keep their own delivery path
+(outbox, priority lanes, live board) and are not a sink.
+
+`SinkBatcher` buffers events for one sink and hands them over when
+`batch_size` events are collected or `flush_interval` seconds after the
+first one, so a burst of changes becomes one call.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Protocol, Sequence, runtime_checkable
+
+from loguru import logger
+
+from ..models.shop import ShopItem
+
+NEW_ITEMS = "new_items"
+FULL_REPORT = "full_report"
+SUBSCRIPTION = "subscription"
+
+# Consecutive failed batches after which a sink reports itself unhealthy
+UNHEALTHY_AFTER = 3
+
+
+@dataclass
+class SinkEvent:
+    """Stock event delivered to sinks."""
+    kind: str  # NEW_ITEMS, FULL_REPORT or SUBSCRIPTION
+    items: List[ShopItem]
+    snapshot_hash: Optional[str] = None
+    shop_timestamp: Optional[datetime] = None
+    chat_id: Optional[str] = None  # Subscriber chat for SUBSCRIPTION events
+    occurred_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the JSON form of the event."""
+        data: Dict[str, Any] = {
+            "kind": self.kind,
+            "occurred_at": datetime.fromtimestamp(self.occurred_at).isoformat(),
+            "items": [item.model_dump(mode="json", exclude_none=True) for item in self.items],
+        }
+        if self.snapshot_hash:
+            data["snapshot_hash"] = self.snapshot_hash
+        if self.shop_timestamp:
+            data["shop_timestamp"] = self.shop_timestamp.isoformat()
+        if self.chat_id:
+            data["chat_id"] = self.chat_id
+        return data
+
+
+@dataclass
+class SinkMetrics:
+    """Delivery statistics of one sink."""
+    events_sent: int = 0
+    batches_sent: int = 0
+    batches_failed: int = 0
+    events_dropped: int = 0
+    consecutive_failures: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def avg_latency(self) -> float:
+        """Average time of a successful batch send."""
+        return self.total_latency / self.batches_sent if self.batches_sent else 0.0
+
+    def record(self, events: int, success: bool, latency: float) -> None:
+        """Record the outcome of one batch."""
+        if success:
+            self.events_sent += events
+            self.batches_sent += 1
+            self.consecutive_failures = 0
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+        else:
+            self.batches_failed += 1
+            self.consecutive_failures += 1
+
+
+@runtime_checkable
+class Sink(Protocol):
+    """Destination for stock events."""
+
+    name: str
+    metrics: SinkMetrics
+
+    async def start(self) -> None:
+        """Open connections."""
+
+    async def send_batch(self, events: Sequence[SinkEvent]) -> bool:
+        """Deliver events, returning True when all of them were accepted."""
+
+    @property
+    def healthy(self) -> bool:
+        """Check if recent sends succeeded."""
+
+    async def close(self) -> None:
+        """Close connections."""
+
+
+class SinkBatcher:
+    """Buffers events for a sink and sends them in batches."""
+
+    def __init__(
+        self,
+        sink: Sink,
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+        max_buffer: int = 1000,
+    ):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: Deque[SinkEvent] = deque()
+        self._first_at = 0.0
+        self._changed = asyncio.Event()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered events."""
+        return len(self._buffer)
+
+    async def start(self) -> None:
+        """Open the sink and start sending."""
+        await self.sink.start()
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    def submit(self, event: SinkEvent) -> None:
+        """Buffer an event; the oldest one is dropped when the buffer is full."""
+        if not self._buffer:
+            self._first_at = time.monotonic()
+        self._buffer.append(event)
+        if len(self._buffer) > self.max_buffer:
+            self._buffer.popleft()
+            self.sink.metrics.events_dropped += 1
+        self._changed.set()
+
+    async def stop(self, drain_timeout: float = 10.0) -> None:
+        """Send buffered events and close the sink."""
+        if self._task:
+            self._closing = True
+            self._changed.set()
+            try:
+                await asyncio.wait_for(self._task, drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"📡 Sink {self.sink.name}: {len(self._buffer)} events not sent before shutdown")
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+            self._task = None
+        await self.sink.close()
+
+    async def _run(self) -> None:
+        """Send a batch whenever one is full or old enough."""
+        while True:
+            if not self._buffer:
+                if self._closing:
+                    return
+                self._changed.clear()
+                await self._changed.wait()
+                continue
+
+            wait = self._first_at + self.flush_interval - time.monotonic()
+            if len(self._buffer) < self.batch_size and wait > 0 and not self._closing:
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._send_next()
+
+    async def _send_next(self) -> None:
+        """Hand the oldest events over to the sink."""
+        batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+        try:
+            success = await self.sink.send_batch(batch)
+        except Exception as e:
+            logger.error(f"📡 Sink {self.sink.name} failed: {e}")
+            success = False
+        if not success:
+            logger.error(f"📡 Sink {self.sink.name} dropped a batch of {len(batch)} events")
+
+    def log_metrics(self) -> None:
+        """Log sink statistics."""
+        metrics = self.sink.metrics
+        logger.info(
+            f"📡 Sink {self.sink.name}: sent {metrics.events_sent} events in {metrics.batches_sent} batches, "
+            f"failed batches {metrics.batches_failed}, dropped {metrics.events_dropped}, "
+            f"latency avg {metrics.avg_latency * 1000:.0f}ms max {metrics.max_latency * 1000:.0f}ms"
+            f"{'' if self.sink.healthy else ', unhealthy'}"
+        )
@@ -0,0 +1,107 @@
+"""
+HTTP webhook sink.
+
+Every batch is one POST of `{"events": [...]}` as JSON. The session keeps
+connections alive between batches, so a steady stream of events doesn't pay
+for a new TCP (and TLS) handshake per POST. With a secret, the body is signed
+with HMAC-SHA256 in the `X-Signature` header.
+
+429 and 5xx answers and connection errors are retried with backoff
+(honoring `Retry-After`); other 4xx answers fail the batch at once.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+from datetime import datetime
+from typing import Optional, Sequence
+
+import aiohttp
+from loguru import logger
+
+from .base import UNHEALTHY_AFTER, SinkEvent, SinkMetrics
+
+
+class WebhookSink:
+    """Posts event batches to an HTTP endpoint."""
+
+    def __init__(
+        self,
+        url: str,
+        secret: Optional[str] = None,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        name: Optional[str] = None,
+    ):
+        self.url = url
+        self.secret = secret
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.name = name or f"webhook {url}"
+        self.metrics = SinkMetrics()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def healthy(self) -> bool:
+        """Check if recent batches went through."""
+        return self.metrics.consecutive_failures < UNHEALTHY_AFTER
+
+    async def start(self) -> None:
+        """Open the keep-alive session."""
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+
+    async def close(self) -> None:
+        """Close the session."""
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def send_batch(self, events: Sequence[SinkEvent]) -> bool:
+        """POST events as one JSON document."""
+        if not events:
+            return True
+        if self._session is None:
+            await self.start()
+
+        body = json.dumps(
+            {"sent_at": datetime.now().isoformat(), "events": [event.to_dict() for event in events]},
+            ensure_ascii=False
+        ).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.secret:
+            headers["X-Signature"] = hmac.new(self.secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+        started = time.monotonic()
+        for attempt in range(self.max_retries):
+            delay = self.retry_delay * 2 ** attempt
+            try:
+                async with self._session.post(self.url, data=body, headers=headers) as response:
+                    if response.status < 300:
+                        self.metrics.record(len(events), True, time.monotonic() - started)
+                        return True
+
+                    if response.status != 429 and response.status < 500:
+                        logger.error(f"📡 {self.name} rejected {len(events)} events: HTTP {response.status}")
+                        break
+
+                    retry_after = response.headers.get("Retry-After", "")
+                    if retry_after.isdigit():
+                        delay = float(retry_after)
+                    logger.warning(f"📡 {self.name} answered HTTP {response.status} (attempt {attempt + 1}/{self.max_retries})")
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"📡 {self.name} unreachable (attempt {attempt + 1}/{self.max_retries}): {e!r}")
+
+            if attempt < self.max_retries - 1:
+                await asyncio.sleep(delay)
+
+        self.metrics.record(len(events), False, time.monotonic() - started)
+        return False
@@ -2,13 +2,25 @@
 Telegram bot integration using aiogram for sending shop updates.
 """
 import asyncio
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
 
 from aiogram import Bot
-from aiogram.exceptions import TelegramAPIError, TelegramBadRequest, TelegramNetworkError
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.exceptions import (
+    TelegramAPIError,
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramUnauthorizedError,
+)
 from loguru import logger
 
 from ..config.settings import Settings
+from ..core.tracing import current_trace
+from ..utils.chunking import TELEGRAM_MESSAGE_LIMIT, split_message, utf16_len
+from .delivery import ChatReroutedError, DeliveryQueue, Lane
+from .pool import BotPool, PoolExhaustedError, PoolMember
 
 
 class TelegramBot:
@@ -17,9 +29,88 @@ class TelegramBot:
     def __init__(self, settings: Settings):
         """Initialize the Telegram bot."""
         self.settings = settings
-        self.bot: Optional[Bot] = None
         self.is_initialized = False
         
+        # One member per bot token, each with its own rate-limited queue
+        tokens = [settings.telegram_bot_token, *settings.telegram_extra_bot_tokens]
+        self.pool = BotPool(
+            [
+                PoolMember(token, DeliveryQueue(
+                    global_rate=settings.telegram_global_rate,
+                    global_burst=settings.telegram_global_rate,
+                    chat_rate=settings.telegram_chat_rate_per_minute / 60,
+                    chat_burst=settings.telegram_chat_burst,
+                    workers=settings.telegram_send_workers,
+                ))
+                for token in dict.fromkeys(token for token in tokens if token) or [""]
+            ],
+            throttle_threshold=settings.telegram_pool_throttle_threshold
+        )
+        
+        # Called with the chat id when a chat blocks the bot or kicks it
+        self.on_chat_blocked: Optional[Callable[[str], None]] = None
+        
+    @property
+    def bot(self) -> Optional[Bot]:
+        """Session of the first token, used for getMe and getUpdates."""
+        return self.pool.primary.bot
+    
+    @bot.setter
+    def bot(self, bot: Optional[Bot]) -> None:
+        self.pool.primary.bot = bot
+    
+    @property
+    def delivery(self) -> DeliveryQueue:
+        """Delivery queue of the first token."""
+        return self.pool.primary.delivery
+    
+    def _create_bot(self, token: str) -> Bot:
+        """Create a bot session, pointed at TELEGRAM_API_URL when set."""
+        if not self.settings.telegram_api_url:
+            return Bot(token=token)
+        api = TelegramAPIServer.from_base(self.settings.telegram_api_url)
+        return Bot(token=token, session=AiohttpSession(api=api))
+    
+    async def _call(
+        self,
+        chat_id: str,
+        method: Callable[[Bot], Awaitable[Any]],
+        lane: Lane,
+        owner: bool = False
+    ) -> Any:
+        """Queue an API call with the bot that owns the chat.
+        
+        A rejected token is taken out of the pool and the call is repeated
+        with the next one; a call taken back from a throttled token is
+        queued with the chat's new one. Calls on existing messages (`owner`)
+        stay with the bot that sent them.
+        """
+        # Time spent waiting in the delivery queue ends when the call is made
+        trace = current_trace.get()
+        
+        def send(bot: Bot) -> Awaitable[Any]:
+            if trace:
+                trace.mark("delivery_wait")
+            return method(bot)
+        
+        tried: Set[str] = set()
+        while True:
+            member = self.pool.member_for(chat_id, exclude=tried, owner=owner)
+            if member is None or member.bot is None:
+                raise PoolExhaustedError(method=None, message=f"no usable bot token for chat {chat_id}")
+            
+            try:
+                return await member.delivery.submit(
+                    chat_id, lambda: send(member.bot), lane, movable=not owner
+                )
+            except ChatReroutedError:
+                continue
+            except TelegramUnauthorizedError:
+                self.pool.mark_revoked(member)
+                tried.add(member.name)
+                if self.pool.member_for(chat_id, exclude=tried) is None:
+                    raise
+        
     async def initialize(self) -> None:
         """Initialize the Telegram bot connection."""
         try:
@@ -29,7 +120,7 @@ class TelegramBot:
                 raise ValueError("Telegram bot token is required")
             
             # Initialize the bot
-            self.bot = Bot(token=self.settings.telegram_bot_token)
+            self.bot = self._create_bot(self.settings.telegram_bot_token)
             
             # Test the bot by getting info
             try:
@@ -39,6 +130,16 @@ class TelegramBot:
             except TelegramAPIError as e:
                 logger.error(f"Failed to verify bot token: {e}")
                 raise
+            
+            # Extra tokens only add capacity; a bad one is left out
+            for member in list(self.pool.members.values())[1:]:
+                member.bot = self._create_bot(member.token)
+                try:
+                    extra = await member.bot.get_me()
+                    logger.info(f"Extra bot @{extra.username} added to the pool")
+                except TelegramAPIError as e:
+                    logger.error(f"Failed to verify extra bot token {member.name}: {e}")
+                    self.pool.mark_revoked(member)
                 
         except Exception as e:
             logger.error(f"Failed to initialize Telegram bot: {e}")
@@ -50,43 +151,162 @@ class TelegramBot:
         channel_id: str,
         parse_mode: str = "HTML",
         disable_web_page_preview: bool = True,
-        max_retries: int = 3
+        max_retries: int = 3,
+        lane: Lane = Lane.REPORT
     ) -> bool:
         """Send a message to a Telegram channel with retry logic."""
+        message_id = await self.send_message_with_id(
+            text, channel_id, parse_mode, disable_web_page_preview, max_retries, lane
+        )
+        return message_id is not None
+    
+    async def send_message_with_id(
+        self,
+        text: str,
+        channel_id: str,
+        parse_mode: str = "HTML",
+        disable_web_page_preview: bool = True,
+        max_retries: int = 3,
+        lane: Lane = Lane.REPORT
+    ) -> Optional[int]:
+        """Send a message with retry logic and return its message id.
+        
+        Messages over Telegram's length limit are sent as several parts in
+        order; the id of the first part is returned.
+        """
         if not self.is_initialized or not self.bot:
             logger.error("Telegram bot not initialized")
-            return False
+            return None
         
         # Validate channel ID
         if not channel_id:
             logger.error("Channel ID not provided")
-            return False
+            return None
+        
+        chunks = split_message(text)
+        if len(chunks) > 1:
+            logger.info(f"Message is {utf16_len(text)} characters long, sending as {len(chunks)} parts")
+        
+        return await self._send_chunks(
+            chunks, channel_id, parse_mode, disable_web_page_preview, max_retries, lane
+        )
+    
+    async def broadcast(
+        self,
+        text: str,
+        chat_ids: Iterable[str],
+        parse_mode: str = "HTML",
+        disable_web_page_preview: bool = True,
+        lane: Lane = Lane.REPORT,
+        concurrency: Optional[int] = None
+    ) -> Dict[str, bool]:
+        """Send the same message to many chats at once.
+        
+        The text is split once and shared by all sends. At most
+        `concurrency` chats are sent to at the same time; per-chat and
+        global rate limits still apply. Returns success per chat id.
+        """
+        targets = list(dict.fromkeys(str(chat_id) for chat_id in chat_ids if chat_id))
+        if not targets:
+            return {}
+        
+        if not self.is_initialized or not self.bot:
+            logger.error("Telegram bot not initialized")
+            return {chat_id: False for chat_id in targets}
+        
+        chunks = split_message(text)
+        semaphore = asyncio.Semaphore(concurrency or self.settings.telegram_broadcast_concurrency)
+        
+        async def send(chat_id: str) -> bool:
+            async with semaphore:
+                message_id = await self._send_chunks(
+                    chunks, chat_id, parse_mode, disable_web_page_preview, 3, lane
+                )
+                return message_id is not None
+        
+        results = await asyncio.gather(*(send(chat_id) for chat_id in targets))
+        sent = sum(results)
+        logger.info(f"📣 Broadcast delivered to {sent}/{len(targets)} chats")
+        return dict(zip(targets, results))
+    
+    async def _send_chunks(
+        self,
+        chunks: List[str],
+        channel_id: str,
+        parse_mode: str,
+        disable_web_page_preview: bool,
+        max_retries: int,
+        lane: Lane
+    ) -> Optional[int]:
+        """Send message parts in order, returning the id of the first one.
+        
+        Once the first part is delivered the message counts as sent: a retry
+        by the caller would post the delivered parts again, so parts that
+        still fail are logged and dropped instead.
+        """
+        first_message_id = None
+        for number, chunk in enumerate(chunks, start=1):
+            message_id = await self._send_single_message(
+                chunk, channel_id, parse_mode, disable_web_page_preview, max_retries, lane
+            )
+            if message_id is None:
+                if first_message_id is not None:
+                    logger.error(
+                        f"❌ Sent {number - 1}/{len(chunks)} parts to {channel_id}, "
+                        f"parts {number}-{len(chunks)} were not delivered"
+                    )
+                return first_message_id
+            if first_message_id is None:
+                first_message_id = message_id
         
+        return first_message_id
+    
+    async def _send_single_message(
+        self,
+        text: str,
+        channel_id: str,
+        parse_mode: str,
+        disable_web_page_preview: bool,
+        max_retries: int,
+        lane: Lane
+    ) -> Optional[int]:
+        """Send one message that fits the length limit, retrying on errors."""
         for attempt in range(max_retries):
             try:
-                await self.bot.send_message(
+                message = await self._call(channel_id, lambda bot: bot.send_message(
                     chat_id=channel_id,
                     text=text,
                     parse_mode=parse_mode,
                     disable_web_page_preview=disable_web_page_preview
-                )
+                ), lane)
                 
                 logger.debug(f"Message sent to channel {channel_id}")
-                return True
+                return message.message_id
+                
+            except TelegramForbiddenError as e:
+                # Bot was kicked or blocked by the user; retrying won't help
+                logger.error(f"Cannot send to channel {channel_id}: {e}")
+                if self.on_chat_blocked:
+                    self.on_chat_blocked(str(channel_id))
+                return None
                 
             except TelegramBadRequest as e:
                 logger.warning(f"Bad request to Telegram API (attempt {attempt + 1}/{max_retries}): {e}")
                 
                 # Don't retry for bad requests (invalid channel, permissions, etc.)
-                if "chat not found" in str(e).lower() or "forbidden" in str(e).lower():
+                error_text = str(e).lower()
+                if "chat not found" in error_text or "forbidden" in error_text:
                     logger.error(f"Cannot send to channel {channel_id}: {e}")
-                    return False
+                    return None
+                if "too long" in error_text:
+                    logger.error(f"Message rejected as too long ({utf16_len(text)} characters): {e}")
+                    return None
                 
                 if attempt < max_retries - 1:
                     await asyncio.sleep(2 ** attempt)  # Exponential backoff
                 else:
                     logger.error(f"Failed to send message after {max_retries} attempts: {e}")
-                    return False
+                    return None
                     
             except TelegramNetworkError as e:
                 logger.warning(f"Network error (attempt {attempt + 1}/{max_retries}): {e}")
@@ -95,7 +315,7 @@ class TelegramBot:
                     await asyncio.sleep(2 ** attempt)  # Exponential backoff
                 else:
                     logger.error(f"Network failed after {max_retries} attempts: {e}")
-                    return False
+                    return None
                     
             except TelegramAPIError as e:
                 logger.warning(f"Telegram API error (attempt {attempt + 1}/{max_retries}): {e}")
@@ -104,15 +324,109 @@ class TelegramBot:
                     await asyncio.sleep(2 ** attempt)  # Exponential backoff
                 else:
                     logger.error(f"API error after {max_retries} attempts: {e}")
-                    return False
+                    return None
             
             except Exception as e:
                 logger.error(f"Unexpected error sending message: {e}")
-                return False
+                return None
         
-        return False
+        return None
     
-    async def send_to_updates_channel(self, text: str) -> bool:
+    async def edit_message(
+        self,
+        text: str,
+        channel_id: str,
+        message_id: int,
+        parse_mode: str = "HTML",
+        disable_web_page_preview: bool = True,
+        lane: Lane = Lane.REPORT
+    ) -> Optional[bool]:
+        """Edit text of a sent message.
+        
+        Returns True when edited (or already up to date), False when the
+        message cannot be edited any more and None on transient errors.
+        """
+        if not self.is_initialized or not self.bot:
+            logger.error("Telegram bot not initialized")
+            return None
+        
+        if utf16_len(text) > TELEGRAM_MESSAGE_LIMIT:
+            logger.warning(f"Message {message_id} cannot be edited: text exceeds {TELEGRAM_MESSAGE_LIMIT} characters")
+            return False
+        
+        try:
+            await self._call(channel_id, lambda bot: bot.edit_message_text(
+                text=text,
+                chat_id=channel_id,
+                message_id=message_id,
+                parse_mode=parse_mode,
+                disable_web_page_preview=disable_web_page_preview
+            ), lane, owner=True)
+            logger.debug(f"Message {message_id} edited in channel {channel_id}")
+            return True
+        except TelegramBadRequest as e:
+            if "message is not modified" in str(e).lower():
+                return True
+            logger.warning(f"Cannot edit message {message_id} in {channel_id}: {e}")
+            return False
+        except TelegramAPIError as e:
+            logger.warning(f"Telegram API error editing message {message_id}: {e}")
+            return None
+    
+    async def delete_message(self, channel_id: str, message_id: int, lane: Lane = Lane.REPORT) -> bool:
+        """Delete a message sent by the bot."""
+        if not self.is_initialized or not self.bot:
+            logger.error("Telegram bot not initialized")
+            return False
+        
+        try:
+            await self._call(channel_id, lambda bot: bot.delete_message(
+                chat_id=channel_id,
+                message_id=message_id
+            ), lane, owner=True)
+            return True
+        except TelegramAPIError as e:
+            logger.warning(f"Cannot delete message {message_id} in {channel_id}: {e}")
+            return False
+    
+    async def pin_message(self, channel_id: str, message_id: int, lane: Lane = Lane.REPORT) -> bool:
+        """Pin a message without notifying members."""
+        if not self.is_initialized or not self.bot:
+            logger.error("Telegram bot not initialized")
+            return False
+        
+        try:
+            await self._call(channel_id, lambda bot: bot.pin_chat_message(
+                chat_id=channel_id,
+                message_id=message_id,
+                disable_notification=True
+            ), lane, owner=True)
+            return True
+        except TelegramAPIError as e:
+            logger.warning(f"Cannot pin message {message_id} in {channel_id}: {e}")
+            return False
+    
+    async def get_updates(self, offset: Optional[int], timeout: int = 30) -> Optional[list]:
+        """Long-poll incoming messages; None on errors.
+        
+        Not queued: a long poll would hold a delivery worker for its whole timeout.
+        """
+        if not self.is_initialized or not self.bot:
+            logger.error("Telegram bot not initialized")
+            return None
+        
+        try:
+            return await self.bot.get_updates(
+                offset=offset,
+                timeout=timeout,
+                allowed_updates=["message"],
+                request_timeout=timeout + 10
+            )
+        except TelegramAPIError as e:
+            logger.warning(f"Failed to get updates: {e}")
+            return None
+    
+    async def send_to_updates_channel(self, text: str, lane: Lane = Lane.ALERT) -> bool:
         """Send message to the real-time updates channel."""
         if not self.settings.effective_updates_channel_id:
             logger.error("Updates channel ID not configured")
@@ -121,10 +435,11 @@ class TelegramBot:
         return await self.send_message(
             text=text,
             channel_id=self.settings.effective_updates_channel_id,
-            parse_mode="HTML"
+            parse_mode="HTML",
+            lane=lane
         )
     
-    async def send_to_full_channel(self, text: str) -> bool:
+    async def send_to_full_channel(self, text: str, lane: Lane = Lane.REPORT) -> bool:
         """Send message to the full reports channel."""
         if not self.settings.effective_full_channel_id:
             logger.error("Full reports channel ID not configured")
@@ -133,7 +448,8 @@ class TelegramBot:
         return await self.send_message(
             text=text,
             channel_id=self.settings.effective_full_channel_id,
-            parse_mode="HTML"
+            parse_mode="HTML",
+            lane=lane
         )
     
     async def test_connection(self) -> bool:
@@ -145,14 +461,14 @@ class TelegramBot:
         test_message = "🤖 Тест подключения бота Roblox Garden"
         
         # Test updates channel
-        updates_success = await self.send_to_updates_channel(test_message)
+        updates_success = await self.send_to_updates_channel(test_message, Lane.HOUSEKEEPING)
         if updates_success:
             logger.info("✅ Updates channel test successful")
         else:
             logger.error("❌ Updates channel test failed")
         
         # Test full reports channel  
-        full_success = await self.send_to_full_channel(test_message)
+        full_success = await self.send_to_full_channel(test_message, Lane.HOUSEKEEPING)
         if full_success:
             logger.info("✅ Full reports channel test successful")
         else:
@@ -162,13 +478,19 @@ class TelegramBot:
     
     async def shutdown(self) -> None:
         """Shutdown the Telegram bot and close session."""
-        if self.bot:
-            try:
-                await self.bot.session.close()
-                logger.info("Telegram bot session closed")
-            except Exception as e:
-                logger.warning(f"Error closing bot session: {e}")
+        for member in self.pool.members.values():
+            await member.delivery.stop()
+            if len(self.pool) > 1:
+                logger.info(f"🔑 Bot token {member.name}:")
+            member.delivery.log_metrics()
+            
+            if member.bot:
+                try:
+                    await member.bot.session.close()
+                    logger.info("Telegram bot session closed")
+                except Exception as e:
+                    logger.warning(f"Error closing bot session: {e}")
+            member.bot = None
         
-        self.bot = None
         self.is_initialized = False
         logger.info("Telegram bot shutdown complete")
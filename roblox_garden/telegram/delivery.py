@@ -0,0 +1,528 @@
+"""
+Rate-limited delivery queue for Telegram API calls.
+
+All outgoing calls go through one queue drained by a few workers. Before a
+call a worker takes a token from the chat's bucket and from the global
+bucket, so bursts (several alerts plus a full report at a rotation
+boundary) are spread out instead of hitting flood limits. When Telegram
+still answers 429, the chat is paused for exactly `retry_after` seconds
+and the call is repeated. A call whose chat has no token yet is parked
+until it has one instead of occupying a worker, so a throttled chat never
+holds up the others.
+
+Calls are submitted in priority lanes: channel alerts before subscriber
+DMs before full reports before housekeeping messages. Workers always pick the highest lane first,
+and a call that would have to wait for tokens gives way while a higher lane
+has pending work, so a report stuck behind a flood limit never holds up an
+alert. Latency from submit to acknowledgement is tracked per lane against
+its SLO.
+"""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from aiogram.exceptions import TelegramRetryAfter
+from loguru import logger
+
+
+class ChatReroutedError(Exception):
+    """A queued call was taken back because its chat moved to another queue."""
+
+
+class TokenBucket:
+    """Token bucket handing out reservations in FIFO order."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        """Take a token, returning how long to wait before using it."""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def wait_time(self, now: Optional[float] = None) -> float:
+        """Get how long until a token is available, without taking it."""
+        now = time.monotonic() if now is None else now
+        tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        wait = (1 - tokens) / self.rate if tokens < 1 else 0.0
+        return max(wait, self.blocked_until - now, 0.0)
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the given time."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class Lane(IntEnum):
+    """Delivery priority, lower value goes first."""
+    ALERT = 0         # New item alerts in the updates channel
+    DIRECT = 1        # Subscription DMs, may fan out to many chats at once
+    REPORT = 2        # Scheduled full reports and the live board
+    HOUSEKEEPING = 3  # Test messages and other non-urgent calls
+
+
+# Target seconds from submit to acknowledgement
+DEFAULT_LANE_SLO: Dict[Lane, float] = {
+    Lane.ALERT: 2.0,
+    Lane.DIRECT: 10.0,
+    Lane.REPORT: 30.0,
+    Lane.HOUSEKEEPING: 300.0,
+}
+
+
+@dataclass
+class DeliveryJob:
+    """Queued API call for one chat."""
+    chat_id: str
+    send: Callable[[], Awaitable[Any]]
+    future: asyncio.Future
+    enqueued_at: float
+    lane: Lane = Lane.REPORT
+    seq: int = 0
+    # 429 answers received so far
+    retries: int = 0
+    # False for calls that must use this bot, e.g. edits of its messages
+    movable: bool = True
+    # True while the API call is in flight
+    sending: bool = False
+
+    def sort_key(self) -> Tuple[int, int]:
+        """Queue order: lane first, then submit order."""
+        return (self.lane, self.seq)
+
+
+@dataclass
+class LaneMetrics:
+    """Latency statistics of one lane."""
+    slo: float
+    sent: int = 0
+    slo_misses: int = 0
+    max_latency: float = 0.0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=500))
+
+    def record(self, latency: float) -> None:
+        """Record the latency of an acknowledged call."""
+        self.sent += 1
+        self.max_latency = max(self.max_latency, latency)
+        self.latencies.append(latency)
+        if latency > self.slo:
+            self.slo_misses += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Get a latency percentile over recent calls."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+@dataclass
+class DeliveryMetrics:
+    """Delivery queue statistics."""
+    sent: int = 0
+    failed: int = 0
+    retry_after: int = 0
+    deferred: int = 0
+    rerouted: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        """Average time from enqueue to the API call."""
+        started = self.sent + self.failed
+        return self.total_wait / started if started else 0.0
+
+
+class DeliveryQueue:
+    """Queue of Telegram API calls honoring global and per-chat rate limits."""
+
+    def __init__(
+        self,
+        global_rate: float = 25.0,
+        global_burst: float = 25.0,
+        chat_rate: float = 20 / 60,
+        chat_burst: float = 3.0,
+        workers: int = 4,
+        max_retry_after: int = 5,
+        lane_slo: Optional[Dict[Lane, float]] = None,
+        on_retry_after: Optional[Callable[[str, float], None]] = None,
+    ):
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.worker_count = workers
+        # 429 answers tolerated per call before giving up
+        self.max_retry_after = max_retry_after
+        # Called with (chat id, seconds) on every 429 answer
+        self.on_retry_after = on_retry_after
+
+        # (lane, seq, job); seq keeps submit order within a lane
+        self.queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self.metrics = DeliveryMetrics()
+        slo = {**DEFAULT_LANE_SLO, **(lane_slo or {})}
+        self.lane_metrics: Dict[Lane, LaneMetrics] = {lane: LaneMetrics(slo[lane]) for lane in Lane}
+        self._chat_buckets: Dict[str, TokenBucket] = {}
+        self._chat_locks: Dict[str, asyncio.Lock] = {}
+        self._workers: List[asyncio.Task] = []
+        self._seq = itertools.count()
+
+        # Jobs per lane sitting in the queue and waiting for a global token
+        self._queued = [0] * len(Lane)
+        self._waiting_global = [0] * len(Lane)
+        # Sequence numbers queued per (chat, lane), to keep their order on deferral
+        self._queued_seqs: Dict[Tuple[str, Lane], Set[int]] = {}
+        # Jobs per lane waiting for each chat lock
+        self._lock_waiters: Dict[str, List[int]] = {}
+        # Jobs kept out of the queue until their chat has a token, by seq
+        self._parked: Dict[int, Tuple[asyncio.TimerHandle, DeliveryJob]] = {}
+        # Unfinished jobs per chat by seq, for rerouting
+        self._jobs: Dict[str, Dict[int, DeliveryJob]] = {}
+        # Set whenever a job is queued or finished, waking jobs that gave way
+        self._changed = asyncio.Event()
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        """Get the rate bucket of a chat."""
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(self.chat_rate, self.chat_burst)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    async def submit(
+        self,
+        chat_id: str,
+        send: Callable[[], Awaitable[Any]],
+        lane: Lane = Lane.REPORT,
+        movable: bool = True,
+    ) -> Any:
+        """Queue an API call in a lane and wait for its result.
+
+        Exceptions other than flood limits are raised to the caller;
+        `ChatReroutedError` means the call was not made and should be
+        submitted to the chat's new queue.
+        """
+        self._ensure_started()
+
+        job = DeliveryJob(
+            chat_id, send, asyncio.get_running_loop().create_future(), time.monotonic(),
+            lane=lane, seq=next(self._seq), movable=movable
+        )
+        chat_jobs = self._jobs.setdefault(chat_id, {})
+        chat_jobs[job.seq] = job
+        job.future.add_done_callback(lambda _: self._job_done(job))
+        self._enqueue(job)
+        return await job.future
+
+    def _job_done(self, job: DeliveryJob) -> None:
+        """Forget a finished job."""
+        chat_jobs = self._jobs.get(job.chat_id)
+        if chat_jobs is not None:
+            chat_jobs.pop(job.seq, None)
+            if not chat_jobs:
+                del self._jobs[job.chat_id]
+
+    def reroute(self, moved: Callable[[str], bool]) -> int:
+        """Take back movable calls of chats that moved elsewhere, in submit order.
+
+        Their submitters get `ChatReroutedError`; calls already sent are not
+        affected. Returns the number of calls taken back.
+        """
+        jobs = [
+            job
+            for chat_id in [chat_id for chat_id in self._jobs if moved(chat_id)]
+            for job in self._jobs[chat_id].values()
+            if job.movable and not job.sending and not job.future.done()
+        ]
+        for job in sorted(jobs, key=lambda job: job.seq):
+            self.metrics.rerouted += 1
+            job.future.set_exception(ChatReroutedError(job.chat_id))
+        return len(jobs)
+
+    def _enqueue(self, job: DeliveryJob) -> None:
+        """Put a job in the queue, keeping its original position."""
+        self._queued[job.lane] += 1
+        self._queued_seqs.setdefault((job.chat_id, job.lane), set()).add(job.seq)
+        self.queue.put_nowait((job.lane, job.seq, job))
+        self._notify()
+
+    def _dequeued(self, job: DeliveryJob) -> None:
+        """Account for a job taken out of the queue."""
+        self._queued[job.lane] -= 1
+        self._forget_seq(job)
+
+    def _forget_seq(self, job: DeliveryJob) -> None:
+        """Drop a job from the per-chat order bookkeeping."""
+        seqs = self._queued_seqs[(job.chat_id, job.lane)]
+        seqs.discard(job.seq)
+        if not seqs:
+            del self._queued_seqs[(job.chat_id, job.lane)]
+
+    def _notify(self) -> None:
+        """Wake jobs waiting for tokens or for higher lanes to finish."""
+        self._changed.set()
+        self._changed.clear()
+
+    def _queued_above(self, lane: Lane) -> bool:
+        """Check if a higher lane has jobs waiting for a worker."""
+        return any(self._queued[higher] for higher in range(lane))
+
+    def _global_wanted_above(self, lane: Lane) -> bool:
+        """Check if a higher lane has jobs ready except for a global token."""
+        return any(self._waiting_global[higher] for higher in range(lane))
+
+    def _ensure_started(self) -> None:
+        """Start workers on first use."""
+        self._workers = [task for task in self._workers if not task.done()]
+        while len(self._workers) < self.worker_count:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def _worker(self) -> None:
+        """Deliver queued jobs until cancelled."""
+        while True:
+            _, _, job = await self.queue.get()
+            self._dequeued(job)
+            try:
+                if not job.future.done():
+                    await self._deliver(job)
+            finally:
+                self.queue.task_done()
+                self._notify()
+
+    async def _deliver(self, job: DeliveryJob) -> None:
+        """Wait for rate tokens and run one job, repeating it after 429s."""
+        # Waiting for the chat's tokens must not hold a worker or the chat lock
+        chat_wait = self._chat_bucket(job.chat_id).wait_time()
+        if chat_wait > 0:
+            self._park(job, chat_wait)
+            return
+
+        lock = self._chat_locks.setdefault(job.chat_id, asyncio.Lock())
+        lock_waiters = self._lock_waiters.setdefault(job.chat_id, [0] * len(Lane))
+
+        # One call per chat at a time keeps messages to a chat in order
+        lock_waiters[job.lane] += 1
+        self._notify()
+        try:
+            await lock.acquire()
+        finally:
+            lock_waiters[job.lane] -= 1
+
+        try:
+            if job.future.done():
+                # Rerouted while waiting for the lock
+                return
+            # An earlier call of the same lane was deferred, it goes first
+            earlier = [seq for seq in self._queued_seqs.get((job.chat_id, job.lane), ()) if seq < job.seq]
+            if earlier:
+                parked = [self._parked[seq][0].when() for seq in earlier if seq in self._parked]
+                if parked:
+                    # Unpark right after the earlier call
+                    self._park(job, max(parked) - asyncio.get_running_loop().time())
+                else:
+                    self._defer(job)
+                return
+            await self._run(job)
+        finally:
+            lock.release()
+
+    async def _run(self, job: DeliveryJob) -> None:
+        """Run a job holding its chat lock."""
+        chat_bucket = self._chat_bucket(job.chat_id)
+        while True:
+            # The previous holder of the chat lock may have taken the last token
+            chat_wait = chat_bucket.wait_time()
+            if chat_wait > 0:
+                self._park(job, chat_wait)
+                return
+            if not await self._wait_for_turn(job, chat_bucket):
+                if not job.future.done():
+                    self._defer(job)
+                return
+
+            if job.retries == 0:
+                wait = time.monotonic() - job.enqueued_at
+                self.metrics.total_wait += wait
+                self.metrics.max_wait = max(self.metrics.max_wait, wait)
+
+            job.sending = True
+            try:
+                result = await job.send()
+            except TelegramRetryAfter as e:
+                job.sending = False
+                self.metrics.retry_after += 1
+                if self.on_retry_after:
+                    self.on_retry_after(job.chat_id, e.retry_after)
+                    if job.future.done():
+                        # Rerouted to another queue
+                        return
+                if job.retries >= self.max_retry_after:
+                    self._fail(job, e)
+                    return
+                job.retries += 1
+                logger.warning(f"⏳ Flood limit for chat {job.chat_id}, retrying after {e.retry_after}s")
+                chat_bucket.pause(e.retry_after)
+                continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._fail(job, e)
+                return
+            finally:
+                job.sending = False
+
+            self.metrics.sent += 1
+            self.lane_metrics[job.lane].record(time.monotonic() - job.enqueued_at)
+            if not job.future.done():
+                job.future.set_result(result)
+            return
+
+    async def _wait_for_turn(self, job: DeliveryJob, chat_bucket: TokenBucket) -> bool:
+        """Wait until the job may take its tokens, and take them.
+
+        Returns False when the job should give its worker to a higher lane.
+        """
+        waiting_global = False
+        try:
+            while True:
+                if job.future.done():
+                    # Rerouted while waiting
+                    return False
+                # Higher lane work waiting for a worker or for this chat goes first
+                if self._queued_above(job.lane) or any(self._lock_waiters[job.chat_id][:job.lane]):
+                    return False
+
+                now = time.monotonic()
+                chat_wait = chat_bucket.wait_time(now)
+                global_wait = self.global_bucket.wait_time(now)
+
+                if waiting_global != (chat_wait == 0 and global_wait > 0):
+                    waiting_global = not waiting_global
+                    self._waiting_global[job.lane] += 1 if waiting_global else -1
+
+                if chat_wait > 0 or global_wait > 0:
+                    await self._sleep_until_changed(max(chat_wait, global_wait))
+                    continue
+                if self._global_wanted_above(job.lane):
+                    # Leave the next global token to the higher lane
+                    await self._sleep_until_changed(None)
+                    continue
+
+                chat_bucket.reserve()
+                self.global_bucket.reserve()
+                return True
+        finally:
+            if waiting_global:
+                self._waiting_global[job.lane] -= 1
+            self._notify()
+
+    async def _sleep_until_changed(self, timeout: Optional[float]) -> None:
+        """Sleep for the timeout or until the queue changes."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _defer(self, job: DeliveryJob) -> None:
+        """Put a job back in the queue at its original position."""
+        self.metrics.deferred += 1
+        self._enqueue(job)
+
+    def _park(self, job: DeliveryJob, delay: float) -> None:
+        """Keep a job out of the queue for a while, holding its place in its chat."""
+        self.metrics.deferred += 1
+        self._queued_seqs.setdefault((job.chat_id, job.lane), set()).add(job.seq)
+        handle = asyncio.get_running_loop().call_later(max(delay, 0.0), self._unpark, job)
+        self._parked[job.seq] = (handle, job)
+
+    def _unpark(self, job: DeliveryJob) -> None:
+        """Put a parked job back in the queue."""
+        del self._parked[job.seq]
+        self._forget_seq(job)
+        if not job.future.done():
+            self._enqueue(job)
+
+    def _fail(self, job: DeliveryJob, error: BaseException) -> None:
+        """Pass an error to the submitter."""
+        self.metrics.failed += 1
+        if not job.future.done():
+            job.future.set_exception(error)
+
+    async def stop(self) -> None:
+        """Stop workers and cancel calls still waiting in the queue."""
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+
+        for handle, job in list(self._parked.values()):
+            handle.cancel()
+            self._forget_seq(job)
+            job.future.cancel()
+        self._parked.clear()
+
+        while not self.queue.empty():
+            _, _, job = self.queue.get_nowait()
+            self._dequeued(job)
+            job.future.cancel()
+            self.queue.task_done()
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Get queue depth and wait-time metrics."""
+        return {
+            "depth": self.queue.qsize(),
+            "sent": self.metrics.sent,
+            "failed": self.metrics.failed,
+            "retry_after": self.metrics.retry_after,
+            "deferred": self.metrics.deferred,
+            "rerouted": self.metrics.rerouted,
+            "avg_wait": self.metrics.avg_wait,
+            "max_wait": self.metrics.max_wait,
+        }
+
+    def get_lane_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Get latency and SLO metrics per lane."""
+        return {
+            lane.name.lower(): {
+                "slo": m.slo,
+                "sent": m.sent,
+                "slo_misses": m.slo_misses,
+                "p50": m.percentile(0.5),
+                "p95": m.percentile(0.95),
+                "max": m.max_latency,
+            }
+            for lane, m in self.lane_metrics.items()
+        }
+
+    def log_metrics(self) -> None:
+        """Log a one-line summary."""
+        m = self.get_metrics()
+        logger.info(
+            f"📮 Delivery: depth {m['depth']}, sent {m['sent']}, failed {m['failed']}, "
+            f"429s {m['retry_after']}, deferred {m['deferred']}, "
+            f"wait avg {m['avg_wait'] * 1000:.0f}ms max {m['max_wait'] * 1000:.0f}ms"
+        )
+        for lane, m in self.get_lane_metrics().items():
+            if not m["sent"]:
+                continue
+            logger.info(
+                f"📮 Lane {lane}: sent {m['sent']}, p50 {m['p50'] * 1000:.0f}ms p95 {m['p95'] * 1000:.0f}ms "
+                f"max {m['max'] * 1000:.0f}ms, SLO {m['slo']:.0f}s missed {m['slo_misses']}"
+            )
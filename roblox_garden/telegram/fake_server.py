@@ -0,0 +1,318 @@
+"""
+Local stand-in for the Telegram Bot API, for tests and delivery benchmarks.
+
+Implements getMe, sendMessage, editMessageText, pinChatMessage and
+getUpdates closely enough for aiogram. Received messages are recorded;
+latency, flood limits and errors can be simulated:
+
+* `latency` / `jitter`: delay of every answer
+* flood limits per bot and per chat answered with 429 and `retry_after`
+* `inject_error()`: answer the next matching call with a given error
+* `blocked_chats` / `missing_chats`: 403 and 400 answers for those chats
+
+Point the bot at it with TELEGRAM_API_URL, or run it standalone with
+`python -m roblox_garden fake-api`.
+"""
+
+import asyncio
+import math
+import random
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from aiohttp import web
+from loguru import logger
+
+from ..utils.chunking import TELEGRAM_MESSAGE_LIMIT, utf16_len
+
+
+@dataclass
+class RecordedMessage:
+    """Message received by the fake server."""
+    token: str
+    chat_id: str
+    message_id: int
+    text: str
+    received_at: float
+    edits: List[str] = field(default_factory=list)
+
+
+@dataclass
+class InjectedError:
+    """Error answered instead of the next matching call."""
+    method: str
+    error_code: int
+    description: str
+    chat_id: Optional[str] = None
+    retry_after: Optional[int] = None
+
+
+class FakeTelegramServer:
+    """Fake Bot API server on aiohttp.web."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        global_rate: Optional[float] = 30.0,
+        chat_limit: Optional[int] = 20,
+        chat_window: float = 60.0,
+        tokens: Optional[Set[str]] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        # Messages per second per bot, None for no limit
+        self.global_rate = global_rate
+        # Messages per chat within `chat_window` seconds, None for no limit
+        self.chat_limit = chat_limit
+        self.chat_window = chat_window
+        # Accepted tokens, None accepts any
+        self.tokens = tokens
+
+        self.blocked_chats: Set[str] = set()
+        self.missing_chats: Set[str] = set()
+        self.messages: List[RecordedMessage] = []
+        self.errors_sent: Dict[int, int] = defaultdict(int)
+        self.base_url: Optional[str] = None
+
+        self._by_chat: Dict[Tuple[str, str], Dict[int, RecordedMessage]] = defaultdict(dict)
+        self._injected: List[InjectedError] = []
+        self._sent_times: Dict[str, Deque[float]] = defaultdict(deque)
+        self._chat_times: Dict[Tuple[str, str], Deque[float]] = defaultdict(deque)
+        self._updates: List[dict] = []
+        self._updates_changed = asyncio.Condition()
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application()
+        self.app.router.add_route("*", "/bot{token}/{method}", self._handle)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start listening; returns the base URL for TELEGRAM_API_URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{bound_port}"
+        logger.info(f"🧪 Fake Telegram API listening on {self.base_url}")
+        return self.base_url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def inject_error(
+        self,
+        method: str,
+        error_code: int,
+        description: str,
+        chat_id: Optional[str] = None,
+        retry_after: Optional[int] = None,
+    ) -> None:
+        """Answer the next call of a method (optionally to one chat) with an error."""
+        self._injected.append(InjectedError(method, error_code, description, chat_id, retry_after))
+
+    def push_message(self, chat_id: int, text: str, chat_type: str = "private") -> None:
+        """Queue an incoming message for getUpdates."""
+        update_id = len(self._updates) + 1
+        self._updates.append({
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": chat_type},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "User"},
+                "text": text,
+            },
+        })
+        asyncio.get_running_loop().create_task(self._notify_updates())
+
+    async def _notify_updates(self) -> None:
+        async with self._updates_changed:
+            self._updates_changed.notify_all()
+
+    def messages_to(self, chat_id: str) -> List[RecordedMessage]:
+        """Get messages recorded for a chat, in order."""
+        return [message for message in self.messages if message.chat_id == str(chat_id)]
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """Dispatch one API call."""
+        token = request.match_info["token"]
+        method = request.match_info["method"]
+        params = dict(await request.post())
+        params.update(request.query)
+
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+
+        if self.tokens is not None and token not in self.tokens:
+            return self._error(401, "Unauthorized")
+
+        handler = {
+            "getme": self._get_me,
+            "sendmessage": self._send_message,
+            "editmessagetext": self._edit_message_text,
+            "pinchatmessage": self._pin_chat_message,
+            "getupdates": self._get_updates,
+        }.get(method.lower())
+        if handler is None:
+            return self._error(404, "Not Found: method not found")
+
+        injected = self._take_injected(method, params.get("chat_id"))
+        if injected:
+            return self._error(injected.error_code, injected.description, injected.retry_after)
+
+        return await handler(token, params)
+
+    def _take_injected(self, method: str, chat_id: Optional[str]) -> Optional[InjectedError]:
+        """Pop the first injected error matching a call."""
+        for index, injected in enumerate(self._injected):
+            if injected.method.lower() != method.lower():
+                continue
+            if injected.chat_id is not None and injected.chat_id != chat_id:
+                continue
+            return self._injected.pop(index)
+        return None
+
+    def _ok(self, result) -> web.Response:
+        return web.json_response({"ok": True, "result": result})
+
+    def _error(self, code: int, description: str, retry_after: Optional[int] = None) -> web.Response:
+        self.errors_sent[code] += 1
+        body = {"ok": False, "error_code": code, "description": description}
+        if retry_after is not None:
+            body["parameters"] = {"retry_after": retry_after}
+        return web.json_response(body, status=code)
+
+    def _check_chat(self, chat_id: str) -> Optional[web.Response]:
+        """Errors for blocked and unknown chats."""
+        if chat_id in self.blocked_chats:
+            return self._error(403, "Forbidden: bot was kicked from the channel chat")
+        if chat_id in self.missing_chats:
+            return self._error(400, "Bad Request: chat not found")
+        return None
+
+    def _check_flood(self, token: str, chat_id: str) -> Optional[web.Response]:
+        """Enforce per-bot and per-chat flood limits."""
+        now = time.monotonic()
+
+        if self.global_rate:
+            sent = self._sent_times[token]
+            while sent and sent[0] <= now - 1.0:
+                sent.popleft()
+            if len(sent) >= self.global_rate:
+                return self._flood(sent[0] + 1.0 - now)
+
+        if self.chat_limit:
+            chat_sent = self._chat_times[(token, chat_id)]
+            while chat_sent and chat_sent[0] <= now - self.chat_window:
+                chat_sent.popleft()
+            if len(chat_sent) >= self.chat_limit:
+                return self._flood(chat_sent[0] + self.chat_window - now)
+
+        self._sent_times[token].append(now)
+        self._chat_times[(token, chat_id)].append(now)
+        return None
+
+    def _flood(self, wait: float) -> web.Response:
+        retry_after = max(1, math.ceil(wait))
+        return self._error(429, f"Too Many Requests: retry after {retry_after}", retry_after)
+
+    @staticmethod
+    def _chat(chat_id: str) -> dict:
+        chat_type = "private" if chat_id.isdigit() else "channel"
+        return {"id": int(chat_id) if chat_id.lstrip("-").isdigit() else 0, "type": chat_type}
+
+    def _message_result(self, message: RecordedMessage, text: str) -> dict:
+        return {
+            "message_id": message.message_id,
+            "date": int(time.time()),
+            "chat": self._chat(message.chat_id),
+            "text": text,
+        }
+
+    async def _get_me(self, token: str, params: dict) -> web.Response:
+        bot_id = int(token.split(":", 1)[0]) if token.split(":", 1)[0].isdigit() else 1
+        return self._ok({
+            "id": bot_id, "is_bot": True, "first_name": "Fake Garden Bot", "username": f"fake_bot_{bot_id}",
+        })
+
+    async def _send_message(self, token: str, params: dict) -> web.Response:
+        chat_id = str(params.get("chat_id", ""))
+        text = params.get("text", "")
+        if not chat_id or not text:
+            return self._error(400, "Bad Request: message text is empty")
+
+        error = self._check_chat(chat_id) or self._check_flood(token, chat_id)
+        if error:
+            return error
+        if utf16_len(text) > TELEGRAM_MESSAGE_LIMIT:
+            return self._error(400, "Bad Request: message is too long")
+
+        chat_messages = self._by_chat[(token, chat_id)]
+        message = RecordedMessage(token, chat_id, len(chat_messages) + 1, text, time.monotonic())
+        chat_messages[message.message_id] = message
+        self.messages.append(message)
+        return self._ok(self._message_result(message, text))
+
+    async def _edit_message_text(self, token: str, params: dict) -> web.Response:
+        chat_id = str(params.get("chat_id", ""))
+        text = params.get("text", "")
+        error = self._check_chat(chat_id) or self._check_flood(token, chat_id)
+        if error:
+            return error
+
+        message = self._by_chat[(token, chat_id)].get(int(params.get("message_id", 0)))
+        if message is None:
+            return self._error(400, "Bad Request: message to edit not found")
+        current = message.edits[-1] if message.edits else message.text
+        if current == text:
+            return self._error(400, "Bad Request: message is not modified")
+
+        message.edits.append(text)
+        return self._ok(self._message_result(message, text))
+
+    async def _pin_chat_message(self, token: str, params: dict) -> web.Response:
+        chat_id = str(params.get("chat_id", ""))
+        error = self._check_chat(chat_id)
+        if error:
+            return error
+        if int(params.get("message_id", 0)) not in self._by_chat[(token, chat_id)]:
+            return self._error(400, "Bad Request: message to pin not found")
+        return self._ok(True)
+
+    async def _get_updates(self, token: str, params: dict) -> web.Response:
+        offset = int(params.get("offset") or 0)
+        timeout = float(params.get("timeout") or 0)
+
+        def pending() -> List[dict]:
+            return [update for update in self._updates if update["update_id"] >= offset]
+
+        updates = pending()
+        if not updates and timeout > 0:
+            try:
+                async with self._updates_changed:
+                    await asyncio.wait_for(self._updates_changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            updates = pending()
+        return self._ok(updates)
+
+
+async def serve(host: str, port: int, latency: float = 0.0, jitter: float = 0.0) -> None:
+    """Run a fake server until cancelled, logging received messages periodically."""
+    server = FakeTelegramServer(latency=latency, jitter=jitter)
+    await server.start(host, port)
+    try:
+        reported = 0
+        while True:
+            await asyncio.sleep(10)
+            if len(server.messages) != reported:
+                reported = len(server.messages)
+                logger.info(f"🧪 Received {reported} messages, errors sent: {dict(server.errors_sent)}")
+    finally:
+        await server.stop()
@@ -0,0 +1,141 @@
+"""
+Live board: one pinned full report message per channel, edited in place.
+
+Instead of posting a new report every interval, the board edits its
+message only when the rendered report body changed. Message ids and body
+hashes are persisted so the board survives restarts.
+
+A report longer than one Telegram message is kept as several messages, the
+first one pinned, and each part is edited in place. When the number of
+parts changes or the board cannot be edited, the old messages are deleted
+before the new board is posted, so stale boards do not pile up.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from ..utils.chunking import split_message
+from .bot import TelegramBot
+
+
+class LiveBoard:
+    """Pinned report messages kept up to date with editMessageText."""
+
+    def __init__(
+        self,
+        bot: TelegramBot,
+        state_file: Optional[str] = None,
+        repost_on_rotation: bool = False
+    ):
+        self.bot = bot
+        self.state_file = state_file
+        # Post (and pin) a new message when the stock changed instead of editing
+        self.repost_on_rotation = repost_on_rotation
+        # chat id -> {"message_id": int, "body_hash": str, "part_ids": [int, ...]};
+        # part_ids only for reports split into several messages
+        self.boards: Dict[str, dict] = {}
+
+        if state_file:
+            self.load()
+
+    def load(self) -> bool:
+        """Load board message ids from the state file."""
+        state_path = Path(self.state_file)
+        if not state_path.exists():
+            return False
+
+        try:
+            data = json.loads(state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load live board state: {e}")
+            return False
+
+        self.boards = {
+            str(chat_id): board for chat_id, board in data.get("boards", {}).items()
+            if isinstance(board.get("message_id"), int)
+        }
+        return True
+
+    def save(self) -> None:
+        """Save board message ids to the state file."""
+        if not self.state_file:
+            return
+
+        state_path = Path(self.state_file)
+        try:
+            state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = state_path.with_suffix(state_path.suffix + ".tmp")
+            tmp_path.write_text(json.dumps({"boards": self.boards}), encoding="utf-8")
+            tmp_path.replace(state_path)
+        except OSError as e:
+            logger.warning(f"Failed to save live board state: {e}")
+
+    async def publish(self, chat_id: str, text: str, body_hash: Optional[str]) -> bool:
+        """Bring the board of a channel up to date with a rendered report.
+
+        Nothing is sent when the body is unchanged. Without a known hash the
+        report is treated as changed.
+        """
+        board = self.boards.get(chat_id)
+
+        if board is not None and body_hash is not None and board.get("body_hash") == body_hash:
+            logger.info(f"📌 Live board in {chat_id} is up to date, skipping")
+            return True
+
+        parts = split_message(text)
+
+        if board is not None and not self.repost_on_rotation:
+            message_ids = [board["message_id"], *board.get("part_ids", [])]
+            if len(message_ids) != len(parts):
+                logger.info(
+                    f"📌 Live board in {chat_id} needs {len(parts)} messages instead of {len(message_ids)}, "
+                    f"replacing it"
+                )
+                await self._delete(chat_id, message_ids)
+            else:
+                edited = await self._edit(chat_id, message_ids, parts)
+                if edited:
+                    board["body_hash"] = body_hash
+                    self.save()
+                    logger.info(f"📌 Live board {board['message_id']} updated in {chat_id}")
+                    return True
+                if edited is None:
+                    return False
+                logger.info(f"📌 Live board {board['message_id']} in {chat_id} cannot be edited, posting a new one")
+                await self._delete(chat_id, message_ids)
+
+        message_ids = []
+        for part in parts:
+            message_id = await self.bot.send_message_with_id(part, chat_id)
+            if message_id is None:
+                break
+            message_ids.append(message_id)
+        if not message_ids:
+            return False
+
+        await self.bot.pin_message(chat_id, message_ids[0])
+        # A board missing parts is replaced on the next report
+        complete = len(message_ids) == len(parts)
+        board = {"message_id": message_ids[0], "body_hash": body_hash if complete else None}
+        if len(message_ids) > 1:
+            board["part_ids"] = message_ids[1:]
+        self.boards[chat_id] = board
+        self.save()
+        logger.info(f"📌 Live board {message_ids[0]} posted in {chat_id}")
+        return complete
+
+    async def _edit(self, chat_id: str, message_ids: List[int], parts: List[str]) -> Optional[bool]:
+        """Edit every board message; stops at the first one that fails."""
+        for message_id, part in zip(message_ids, parts):
+            edited = await self.bot.edit_message(part, chat_id, message_id)
+            if not edited:
+                return edited
+        return True
+
+    async def _delete(self, chat_id: str, message_ids: List[int]) -> None:
+        """Delete old board messages (this also drops the pin)."""
+        for message_id in message_ids:
+            await self.bot.delete_message(chat_id, message_id)
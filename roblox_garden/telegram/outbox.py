@@ -0,0 +1,240 @@
+"""
+Durable outbox for rendered messages.
+
+Every rendered message is written to a SQLite database (WAL mode) before it
+is sent and marked sent once Telegram acknowledges it. Messages still
+pending when the process died are replayed on the next start, and failed
+sends are retried periodically while running, so a crash or an outage
+between rendering and the ack does not lose an alert. Each entry has an
+idempotency key derived from (kind, chat, snapshot hash): rendering the same
+snapshot for the same chat again does not enqueue a second message.
+
+Writes are group-committed: entries enqueued while a commit is in flight
+are buffered and written together in the next transaction, so the cost of
+an fsync is shared by everything that arrived in the meantime.
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+PENDING = "pending"
+SENT = "sent"
+EXPIRED = "expired"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    chat_id TEXT,
+    text TEXT NOT NULL,
+    item_count INTEGER NOT NULL DEFAULT 0,
+    body_hash TEXT,
+    created_at REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_status ON outbox (status, created_at);
+"""
+
+
+@dataclass
+class OutboxEntry:
+    """Rendered message waiting for delivery."""
+    key: str
+    kind: str
+    chat_id: Optional[str]
+    text: str
+    item_count: int = 0
+    body_hash: Optional[str] = None
+    created_at: float = 0.0
+
+
+def make_key(kind: str, chat_id: Optional[str], snapshot_hash: str) -> str:
+    """Build the idempotency key of a message."""
+    raw = f"{kind}|{chat_id or ''}|{snapshot_hash}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class Outbox:
+    """SQLite-backed outbox with group commit."""
+
+    def __init__(
+        self,
+        path: str,
+        commit_delay: float = 0.005,
+        retention: float = 24 * 3600,
+    ):
+        self.path = path
+        # Time to gather more writes before committing
+        self.commit_delay = commit_delay
+        # Delivered entries are kept this long to catch duplicates
+        self.retention = retention
+
+        self._conn: Optional[sqlite3.Connection] = None
+        # key -> status of every entry in the database
+        self._status: Dict[str, str] = {}
+        self._inserts: List[tuple] = []
+        self._updates: List[Tuple[str, float, str]] = []
+        self._waiters: List[asyncio.Future] = []
+        self._commit_task: Optional[asyncio.Task] = None
+        self._commit_lock = asyncio.Lock()
+        self.commits = 0
+
+    def open(self) -> None:
+        """Open the database and load the keys it holds."""
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(SCHEMA)
+
+        self._delete_expired()
+        self._status = dict(self._conn.execute("SELECT key, status FROM outbox"))
+
+        pending = sum(1 for status in self._status.values() if status == PENDING)
+        logger.info(f"📦 Outbox opened with {len(self._status)} entries ({pending} pending)")
+
+    def _delete_expired(self) -> List[str]:
+        """Delete finished entries older than the retention, returning their keys."""
+        cutoff = time.time() - self.retention
+        with self._conn:
+            keys = [
+                key for (key,) in self._conn.execute(
+                    "SELECT key FROM outbox WHERE status != ? AND created_at < ?", (PENDING, cutoff)
+                )
+            ]
+            self._conn.execute(
+                "DELETE FROM outbox WHERE status != ? AND created_at < ?", (PENDING, cutoff)
+            )
+        return keys
+
+    async def prune(self) -> int:
+        """Forget finished entries older than the retention, in the database and in memory."""
+        if self._conn is None:
+            return 0
+        async with self._commit_lock:
+            keys = await asyncio.to_thread(self._delete_expired)
+        for key in keys:
+            self._status.pop(key, None)
+        return len(keys)
+
+    @property
+    def is_open(self) -> bool:
+        """Check if the database is open."""
+        return self._conn is not None
+
+    def status(self, key: str) -> Optional[str]:
+        """Get the status of an entry, None if unknown."""
+        return self._status.get(key)
+
+    async def enqueue(self, entry: OutboxEntry) -> bool:
+        """Persist an entry, returning False when its key is already known.
+
+        Returns once the transaction holding the entry is committed.
+        """
+        if entry.key in self._status:
+            return False
+
+        self._status[entry.key] = PENDING
+        self._inserts.append((
+            entry.key, entry.kind, entry.chat_id, entry.text, entry.item_count,
+            entry.body_hash, entry.created_at or time.time(), PENDING
+        ))
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._schedule_commit()
+        await waiter
+        return True
+
+    def mark_sent(self, key: str) -> None:
+        """Mark an entry delivered; committed with the next batch."""
+        self._set_status(key, SENT)
+
+    def mark_expired(self, key: str) -> None:
+        """Give up on an entry without delivering it."""
+        self._set_status(key, EXPIRED)
+
+    def _set_status(self, key: str, status: str) -> None:
+        """Buffer a status change and schedule a commit."""
+        if key not in self._status:
+            return
+        self._status[key] = status
+        self._updates.append((status, time.time(), key))
+        self._schedule_commit()
+
+    def pending(self) -> List[OutboxEntry]:
+        """Get entries not delivered yet, oldest first."""
+        rows = self._conn.execute(
+            "SELECT key, kind, chat_id, text, item_count, body_hash, created_at "
+            "FROM outbox WHERE status = ? ORDER BY created_at", (PENDING,)
+        ).fetchall()
+        # Skip entries whose status change is still buffered
+        return [OutboxEntry(*row) for row in rows if self._status.get(row[0]) == PENDING]
+
+    def _schedule_commit(self) -> None:
+        """Start a commit task unless one is already running."""
+        if self._commit_task is None or self._commit_task.done():
+            self._commit_task = asyncio.create_task(self._commit_soon())
+
+    async def _commit_soon(self) -> None:
+        """Wait a moment for more writes, then commit them together."""
+        if self.commit_delay > 0:
+            await asyncio.sleep(self.commit_delay)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Commit all buffered writes."""
+        async with self._commit_lock:
+            # Writes buffered during a commit go into the next one
+            while self._inserts or self._updates:
+                inserts, self._inserts = self._inserts, []
+                updates, self._updates = self._updates, []
+                waiters, self._waiters = self._waiters, []
+
+                try:
+                    await asyncio.to_thread(self._write, inserts, updates)
+                except Exception as e:
+                    logger.error(f"Failed to commit outbox batch of {len(inserts) + len(updates)} writes: {e}")
+                    # Entries that were not written may be enqueued again
+                    for row in inserts:
+                        self._status.pop(row[0], None)
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(e)
+                    continue
+
+                self.commits += 1
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+
+    def _write(self, inserts: List[tuple], updates: List[Tuple[str, float, str]]) -> None:
+        """Write one batch in a single transaction."""
+        with self._conn:
+            if inserts:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO outbox "
+                    "(key, kind, chat_id, text, item_count, body_hash, created_at, status) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    inserts
+                )
+            if updates:
+                self._conn.executemany(
+                    "UPDATE outbox SET status = ?, updated_at = ? WHERE key = ?", updates
+                )
+
+    async def close(self) -> None:
+        """Commit buffered writes and close the database."""
+        if self._conn is None:
+            return
+        await self.flush()
+        self._conn.close()
+        self._conn = None
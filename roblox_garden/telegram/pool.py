@@ -0,0 +1,192 @@
+"""
+Pool of bot tokens sharing the outbound load.
+
+Telegram limits each bot separately, so sending through several bots
+multiplies the throughput. Every token gets its own `aiogram.Bot` session
+and its own delivery queue with rate buckets. Chats are mapped to tokens
+with a consistent hash ring: a chat always uses the same bot (keeping its
+messages in order and its messages editable), and when a token is revoked
+or heavily throttled only the chats it owned move to other tokens.
+
+A long flood wait for one chat only pauses that chat. The token is taken
+out of rotation when several of its chats get one at the same time, i.e.
+Telegram limits the bot as a whole; calls still queued for its chats are
+then handed to the new owners, except edits and pins, which only the
+sending bot can make.
+
+Private chats (positive numeric ids) always use the first token: users
+start the bot they talk to, other bots cannot message them.
+"""
+
+import bisect
+import hashlib
+import time
+from typing import Dict, Iterator, List, Optional, Set
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError
+from loguru import logger
+
+from .delivery import DeliveryQueue
+
+
+class PoolExhaustedError(TelegramAPIError):
+    """No token of the pool can send to a chat."""
+    label = "Bot pool says"
+
+
+def _point(key: str) -> int:
+    """Position of a key on the ring."""
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes."""
+
+    def __init__(self, nodes: List[str], replicas: int = 64):
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str) -> None:
+        """Add a node with its virtual points."""
+        for replica in range(self.replicas):
+            point = _point(f"{node}#{replica}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: str) -> None:
+        """Remove all points of a node."""
+        kept = [(point, owner) for point, owner in zip(self._points, self._owners) if owner != node]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def nodes_for(self, key: str) -> Iterator[str]:
+        """Yield distinct nodes clockwise from the key's position."""
+        if not self._points:
+            return
+        start = bisect.bisect(self._points, _point(key))
+        seen: Set[str] = set()
+        for offset in range(len(self._points)):
+            owner = self._owners[(start + offset) % len(self._points)]
+            if owner not in seen:
+                seen.add(owner)
+                yield owner
+
+
+class PoolMember:
+    """One bot token with its session and delivery queue."""
+
+    def __init__(self, token: str, delivery: DeliveryQueue):
+        self.token = token
+        # Bot id part of the token, safe to log
+        self.name = token.split(":", 1)[0]
+        self.delivery = delivery
+        self.bot: Optional[Bot] = None
+        self.revoked = False
+        self.throttled_until = 0.0
+        # chat id -> end of a recent long flood wait
+        self.flooded_chats: Dict[str, float] = {}
+
+    @property
+    def available(self) -> bool:
+        """Check if the member should get new work."""
+        return not self.revoked and self.throttled_until <= time.monotonic()
+
+
+class BotPool:
+    """Maps chats to bot tokens and rebalances around failing tokens."""
+
+    def __init__(self, members: List[PoolMember], throttle_threshold: float = 10.0, bot_wide_chats: int = 2):
+        if not members:
+            raise ValueError("Bot pool needs at least one token")
+        self.members = {member.name: member for member in members}
+        self.primary = members[0]
+        # Flood waits at least this long count towards throttling a token
+        self.throttle_threshold = throttle_threshold
+        # Chats flood-limited at once that make the limit bot-wide
+        self.bot_wide_chats = bot_wide_chats
+        self.ring = HashRing(list(self.members))
+
+        for member in members:
+            member.delivery.on_retry_after = (
+                lambda chat_id, seconds, member=member: self.report_retry_after(member, chat_id, seconds)
+            )
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    @staticmethod
+    def is_private(chat_id: str) -> bool:
+        """Check if a chat id belongs to a user."""
+        return str(chat_id).isdigit()
+
+    def member_for(
+        self,
+        chat_id: str,
+        exclude: Optional[Set[str]] = None,
+        owner: bool = False
+    ) -> Optional[PoolMember]:
+        """Get the member that sends to a chat.
+
+        Falls back to throttled members when no other is left; None when all
+        tokens are revoked or excluded. With `owner` throttling is ignored,
+        for calls on messages the owning bot sent.
+        """
+        exclude = exclude or set()
+        if len(self.members) == 1 or self.is_private(chat_id):
+            member = self.primary
+            return None if member.revoked or member.name in exclude else member
+
+        fallback = None
+        for name in self.ring.nodes_for(str(chat_id)):
+            member = self.members[name]
+            if member.revoked or name in exclude:
+                continue
+            if member.available or owner:
+                return member
+            if fallback is None:
+                fallback = member
+        return fallback
+
+    def mark_revoked(self, member: PoolMember) -> None:
+        """Take a token out of the pool for good."""
+        if member.revoked:
+            return
+        member.revoked = True
+        self.ring.remove(member.name)
+        logger.error(f"🔑 Bot token {member.name} was rejected, moving its chats to other tokens")
+
+    def report_retry_after(self, member: PoolMember, chat_id: str, seconds: float) -> None:
+        """Take a token out of rotation while the whole bot is heavily throttled."""
+        if len(self.members) == 1 or seconds < self.throttle_threshold:
+            return
+
+        now = time.monotonic()
+        member.flooded_chats = {chat: until for chat, until in member.flooded_chats.items() if until > now}
+        member.flooded_chats[str(chat_id)] = now + seconds
+        if len(member.flooded_chats) < self.bot_wide_chats:
+            # Only this chat is limited; its queue waits it out
+            return
+
+        member.throttled_until = max(member.throttled_until, now + seconds)
+        moved = member.delivery.reroute(lambda chat: self.member_for(chat) is not member)
+        logger.warning(
+            f"🔑 Bot token {member.name} throttled for {seconds:.0f}s, routing its chats elsewhere "
+            f"({moved} queued calls moved)"
+        )
+
+    def get_status(self) -> List[dict]:
+        """Get state of every member."""
+        return [
+            {
+                "name": member.name,
+                "revoked": member.revoked,
+                "throttled": not member.revoked and not member.available,
+                "sent": member.delivery.metrics.sent,
+            }
+            for member in self.members.values()
+        ]
@@ -0,0 +1,148 @@
+"""
+Subscriber mode: users DM the bot to get personal alerts.
+
+Commands (private chats only):
+
+* `/subscribe <query>` - e.g. `/subscribe prismatic seeds`
+* `/unsubscribe [id]` - remove one subscription, or all without an id
+* `/list` - show own subscriptions
+
+Subscriptions are stored in SQLite and mirrored in the in-memory
+`SubscriptionIndex` the application matches stock changes against, so
+adding or removing one takes effect on the next poll.
+"""
+
+import asyncio
+import html
+from typing import Optional
+
+from loguru import logger
+
+from ..filters.query import QueryError, parse_query
+from ..filters.subscriptions import SubscriptionIndex, SubscriptionStore
+from .bot import TelegramBot
+from .delivery import Lane
+
+HELP_TEXT = (
+    "🌱 Подписка на предметы в стоке\n\n"
+    "/subscribe &lt;запрос&gt; - подписаться, например:\n"
+    "  /subscribe prismatic seeds\n"
+    "  /subscribe divine+ eggs\n"
+    "  /subscribe \"Giant Pinecone\"\n"
+    "/list - мои подписки\n"
+    "/unsubscribe &lt;id&gt; - отписаться (без id - от всех)"
+)
+
+
+class SubscriberBot:
+    """Update loop handling subscription commands."""
+
+    def __init__(
+        self,
+        bot: TelegramBot,
+        store: SubscriptionStore,
+        index: SubscriptionIndex,
+        max_per_chat: int = 10,
+        poll_timeout: int = 30,
+    ):
+        self.bot = bot
+        self.store = store
+        self.index = index
+        self.max_per_chat = max_per_chat
+        self.poll_timeout = poll_timeout
+        self._offset: Optional[int] = None
+
+    def load(self) -> int:
+        """Put stored subscriptions into the index. Returns their number."""
+        subscriptions = self.store.load()
+        for subscription in subscriptions:
+            self.index.add(subscription)
+        return len(subscriptions)
+
+    async def run(self) -> None:
+        """Poll for updates until cancelled."""
+        logger.info("💬 Subscriber bot is listening for commands")
+        while True:
+            updates = await self.bot.get_updates(self._offset, self.poll_timeout)
+            if updates is None:
+                # Error already logged; don't spin on a broken connection
+                await asyncio.sleep(5)
+                continue
+
+            for update in updates:
+                self._offset = update.update_id + 1
+                message = update.message
+                if message is None or message.text is None or message.chat.type != "private":
+                    continue
+
+                chat_id = str(message.chat.id)
+                try:
+                    reply = self.handle_command(chat_id, message.text)
+                except Exception as e:
+                    logger.error(f"Failed to handle command from {chat_id}: {e}")
+                    continue
+                if reply:
+                    await self.bot.send_message(reply, chat_id, lane=Lane.REPORT)
+
+    def handle_command(self, chat_id: str, text: str) -> Optional[str]:
+        """Execute a command and return the reply."""
+        if not text.startswith("/"):
+            return None
+
+        command, _, argument = text.partition(" ")
+        # "/subscribe@garden_bot" in groups and some clients
+        command = command.split("@", 1)[0].lower()
+        argument = argument.strip()
+
+        if command == "/subscribe":
+            return self._subscribe(chat_id, argument)
+        if command == "/unsubscribe":
+            return self._unsubscribe(chat_id, argument)
+        if command == "/list":
+            return self._list(chat_id)
+        if command in ("/start", "/help"):
+            return HELP_TEXT
+        return None
+
+    def _subscribe(self, chat_id: str, query: str) -> str:
+        """Add a subscription."""
+        if not query:
+            return HELP_TEXT
+        if self.store.count(chat_id) >= self.max_per_chat:
+            return f"❌ Не больше {self.max_per_chat} подписок. Удалите лишние через /unsubscribe"
+
+        try:
+            rule = parse_query(query)
+        except QueryError as e:
+            return f"❌ Не понял запрос: {html.escape(str(e))}\n\n{HELP_TEXT}"
+
+        subscription = self.store.add(chat_id, query, rule)
+        self.index.add(subscription)
+        logger.info(f"➕ {chat_id} subscribed to '{query}'")
+        return f"✅ Подписка #{subscription.id.removeprefix(SubscriptionStore.ID_PREFIX)}: {html.escape(query)}"
+
+    def _unsubscribe(self, chat_id: str, argument: str) -> str:
+        """Remove one or all subscriptions."""
+        row_id = None
+        if argument:
+            try:
+                row_id = int(argument.lstrip("#"))
+            except ValueError:
+                return "❌ Укажите номер подписки из /list"
+
+        removed = self.store.remove(chat_id, row_id)
+        for subscription_id in removed:
+            self.index.remove(subscription_id)
+
+        if not removed:
+            return "Подписок не найдено"
+        logger.info(f"➖ {chat_id} removed {len(removed)} subscriptions")
+        return f"🗑️ Удалено подписок: {len(removed)}"
+
+    def _list(self, chat_id: str) -> str:
+        """Show subscriptions of a chat."""
+        rows = self.store.list(chat_id)
+        if not rows:
+            return "У вас нет подписок. /subscribe prismatic seeds - пример"
+        lines = [f"#{row_id}: {html.escape(query)}" for row_id, query in rows]
+        return "📋 Ваши подписки:\n" + "\n".join(lines)
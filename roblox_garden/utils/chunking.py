@@ -0,0 +1,124 @@
+"""
+Splitting long messages into parts that fit Telegram's length limit.
+
+Telegram counts message length in UTF-16 code units, so emoji outside the
+BMP count twice. Messages are split on section boundaries (blank lines)
+first, then on line boundaries; a single line is only cut when it does not
+fit on its own, and never inside an HTML tag or entity.
+"""
+
+from typing import List, Tuple
+
+# Maximum message text length in UTF-16 code units
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+SECTION_SEPARATOR = "\n\n"
+LINE_SEPARATOR = "\n"
+
+
+def utf16_len(text: str) -> int:
+    """Get text length as counted by Telegram."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def split_message(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    """Split text into ordered parts of at most `limit` UTF-16 units."""
+    if utf16_len(text) <= limit:
+        return [text]
+
+    # (separator before the unit, unit text, unit length)
+    units: List[Tuple[str, str, int]] = []
+    for section in text.split(SECTION_SEPARATOR):
+        section_length = utf16_len(section)
+        if section_length <= limit:
+            units.append((SECTION_SEPARATOR, section, section_length))
+            continue
+
+        separator = SECTION_SEPARATOR
+        for line in section.split(LINE_SEPARATOR):
+            for piece in _split_line(line, limit):
+                units.append((separator, piece, utf16_len(piece)))
+                separator = LINE_SEPARATOR
+
+    chunks: List[str] = []
+    parts: List[str] = []
+    length = 0
+    for separator, unit, unit_length in units:
+        if parts and length + len(separator) + unit_length <= limit:
+            parts.append(separator)
+            parts.append(unit)
+            length += len(separator) + unit_length
+            continue
+
+        if parts:
+            chunks.append("".join(parts))
+        parts = [unit]
+        length = unit_length
+
+    if parts:
+        chunks.append("".join(parts))
+
+    # Telegram rejects empty messages
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def _split_line(line: str, limit: int) -> List[str]:
+    """Cut a single line into pieces of at most `limit` UTF-16 units."""
+    pieces = []
+    start = 0
+    while utf16_len(line[start:]) > limit:
+        end = _cut_position(line, start, limit)
+        pieces.append(line[start:end])
+        start = end
+    pieces.append(line[start:])
+    return pieces
+
+
+def _cut_position(line: str, start: int, limit: int) -> int:
+    """Find where to end a piece starting at `start`.
+
+    Prefers the last space that fits, then the last position outside of
+    markup. Cuts inside markup only if a tag or entity alone exceeds the limit.
+    """
+    units = 0
+    markup_start = None  # Index of an open "<" or "&"
+    last_space = None
+    last_safe = None
+    position = start
+
+    for position in range(start, len(line)):
+        char = line[position]
+        width = 2 if ord(char) > 0xFFFF else 1
+        if units + width > limit:
+            break
+        units += width
+
+        if markup_start is not None:
+            if line[markup_start] == "<":
+                if char == ">":
+                    markup_start = None
+                    last_safe = position + 1
+                continue
+            if char == ";":
+                markup_start = None
+                last_safe = position + 1
+                continue
+            if char.isalnum() or char == "#":
+                continue
+            # Bare "&" was not an entity
+            markup_start = None
+
+        if char in "<&":
+            markup_start = position
+            continue
+
+        last_safe = position + 1
+        if char == " ":
+            last_space = position + 1
+    else:
+        return len(line)
+
+    for cut in (last_space, last_safe):
+        if cut is not None and cut > start:
+            return cut
+    return max(position, start + 1)
@@ -0,0 +1,199 @@
+"""
+Restock probability forecaster for catalog items.
+
+Estimates the chance that an item shows up within the next N shop rotations
+from empirical appearance frequencies, split into time-of-day buckets.
+"""
+
+import json
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+class RestockForecaster:
+    """Incremental per-item restock model.
+
+    Each rotation (shop restock period) is committed exactly once: the
+    rotation counter of its time-of-day bucket is bumped and every tracked
+    item seen in stock during it gets a hit. Updates are O(items seen) and
+    there is never a full refit.
+    """
+
+    def __init__(
+        self,
+        item_names: Iterable[str],
+        rotation_minutes: int = 5,
+        bucket_hours: int = 4,
+        prior_weight: float = 4.0,
+    ):
+        self.item_names: Set[str] = set(item_names)
+        self.rotation_seconds = max(1, rotation_minutes) * 60
+        self.bucket_hours = max(1, min(24, bucket_hours))
+        self.bucket_count = (24 + self.bucket_hours - 1) // self.bucket_hours
+        self.prior_weight = prior_weight
+
+        # Counters per time-of-day bucket
+        self._rotations: List[int] = [0] * self.bucket_count
+        self._hits: Dict[str, List[int]] = defaultdict(lambda: [0] * self.bucket_count)
+        self._total_hits: Dict[str, int] = defaultdict(int)
+        self._total_rotations = 0
+
+        # Rotation currently being observed
+        self._current_rotation: Optional[int] = None
+        self._current_bucket = 0
+        self._current_seen: Set[str] = set()
+
+    @classmethod
+    def from_static_database(
+        cls,
+        rotation_minutes: int = 5,
+        bucket_hours: int = 4,
+        prior_weight: float = 4.0,
+    ) -> "RestockForecaster":
+        """Create a forecaster tracking every item of the static catalog."""
+        from roblox_garden.utils.static_rarity_db import StaticRarityDatabase
+
+        return cls(
+            StaticRarityDatabase.get_all_items(),
+            rotation_minutes=rotation_minutes,
+            bucket_hours=bucket_hours,
+            prior_weight=prior_weight,
+        )
+
+    @property
+    def rotations_observed(self) -> int:
+        """Number of fully observed rotations."""
+        return self._total_rotations
+
+    def _bucket_for(self, moment: datetime) -> int:
+        """Get time-of-day bucket index for a moment."""
+        return moment.hour // self.bucket_hours
+
+    def observe(self, timestamp: datetime, in_stock_names: Iterable[str]) -> None:
+        """Record items seen in stock at the given time."""
+        rotation = int(timestamp.timestamp() // self.rotation_seconds)
+
+        if rotation != self._current_rotation:
+            self._commit_rotation()
+            self._current_rotation = rotation
+            self._current_bucket = self._bucket_for(timestamp)
+
+        for name in in_stock_names:
+            if name in self.item_names:
+                self._current_seen.add(name)
+
+    def _commit_rotation(self) -> None:
+        """Fold the rotation being observed into the counters."""
+        if self._current_rotation is None:
+            return
+
+        bucket = self._current_bucket
+        self._rotations[bucket] += 1
+        self._total_rotations += 1
+        for name in self._current_seen:
+            self._hits[name][bucket] += 1
+            self._total_hits[name] += 1
+
+        self._current_seen = set()
+
+    def _rotation_probability(self, item_name: str, bucket: int) -> float:
+        """Probability of the item appearing in one rotation of a bucket."""
+        # Global rate acts as a prior for sparsely observed buckets
+        global_rate = (self._total_hits.get(item_name, 0) + 0.5) / (self._total_rotations + 1)
+        hits = self._hits[item_name][bucket] if item_name in self._hits else 0
+        rotations = self._rotations[bucket]
+        return (hits + self.prior_weight * global_rate) / (rotations + self.prior_weight)
+
+    def probability(
+        self,
+        item_name: str,
+        horizon: int,
+        now: Optional[datetime] = None,
+    ) -> Optional[float]:
+        """Probability that the item appears in the next `horizon` rotations."""
+        if item_name not in self.item_names or self._total_rotations == 0:
+            return None
+
+        now = now or datetime.now()
+        step = timedelta(seconds=self.rotation_seconds)
+
+        miss_probability = 1.0
+        for offset in range(1, max(1, horizon) + 1):
+            bucket = self._bucket_for(now + step * offset)
+            miss_probability *= 1.0 - self._rotation_probability(item_name, bucket)
+
+        return 1.0 - miss_probability
+
+    def forecast(
+        self,
+        horizon: int,
+        now: Optional[datetime] = None,
+        item_names: Optional[Iterable[str]] = None,
+    ) -> Dict[str, float]:
+        """Get restock probabilities for tracked (or given) items."""
+        now = now or datetime.now()
+        names = self.item_names if item_names is None else item_names
+
+        result = {}
+        for name in names:
+            probability = self.probability(name, horizon, now)
+            if probability is not None:
+                result[name] = probability
+        return result
+
+    def to_dict(self) -> dict:
+        """Serialize committed counters."""
+        return {
+            "rotation_seconds": self.rotation_seconds,
+            "bucket_hours": self.bucket_hours,
+            "rotations": self._rotations,
+            "hits": dict(self._hits),
+        }
+
+    def load_dict(self, data: dict) -> None:
+        """Restore committed counters produced by `to_dict`."""
+        if (
+            data.get("rotation_seconds") != self.rotation_seconds
+            or data.get("bucket_hours") != self.bucket_hours
+        ):
+            logger.warning("Forecaster state has different rotation/bucket settings, ignoring it")
+            return
+
+        self._rotations = list(data.get("rotations", self._rotations))
+        self._total_rotations = sum(self._rotations)
+        self._hits.clear()
+        self._total_hits.clear()
+        for name, hits in data.get("hits", {}).items():
+            if len(hits) != self.bucket_count:
+                continue
+            self._hits[name] = list(hits)
+            self._total_hits[name] = sum(hits)
+
+    def save(self, path: str) -> None:
+        """Save counters to a JSON file."""
+        state_path = Path(path)
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = state_path.with_suffix(state_path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+        tmp_path.replace(state_path)
+
+    def load(self, path: str) -> bool:
+        """Load counters from a JSON file if it exists."""
+        state_path = Path(path)
+        if not state_path.exists():
+            return False
+
+        try:
+            self.load_dict(json.loads(state_path.read_text(encoding="utf-8")))
+            return True
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load forecaster state from {path}: {e}")
+            return False
@@ -2,220 +2,467 @@
 Message formatters for Telegram messages.
 """
 
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional, Set, Tuple
 import pytz
 
-from roblox_garden.models.shop import ShopItem, ItemType
+from roblox_garden.models.shop import ShopItem, ItemType, Rarity
 from roblox_garden.config.settings import Settings
+from roblox_garden.utils.locales import Locale, get_locale
+
+
+@dataclass
+class ReportSlot:
+    """Catalog item occupying a fixed line of the full report."""
+    type: ItemType
+    rarity: Rarity
+    name: str
+    price: int
+
+
+class ReportSkeleton:
+    """Ordered and grouped Divine+ catalog of the full report.
+    
+    The catalog only changes together with the static database, so the
+    skeleton is built once per catalog version. A report then only maps the
+    live items onto their slots.
+    """
+    
+    # Section order of the report
+    SECTION_TYPES = (ItemType.SEED, ItemType.GEAR, ItemType.EGG)
+    
+    def __init__(self, version: int, slots: List[ReportSlot], sections: List[Tuple[ItemType, int, int]]):
+        self.version = version
+        self.slots = slots
+        # (item type, first slot, end slot) of every non-empty section
+        self.sections = sections
+        # Item name -> slots it occupies
+        self.positions: Dict[str, List[int]] = {}
+        for position, slot in enumerate(slots):
+            self.positions.setdefault(slot.name, []).append(position)
+    
+    @classmethod
+    def build(cls, version: int, rarities: Set[Rarity]) -> "ReportSkeleton":
+        """Build skeleton from the static database."""
+        from roblox_garden.utils.static_rarity_db import StaticRarityDatabase
+        
+        by_type: Dict[ItemType, List[ReportSlot]] = {}
+        for item_type, rarity_db in (
+            (ItemType.SEED, StaticRarityDatabase.CROPS_RARITY),
+            (ItemType.GEAR, StaticRarityDatabase.GEAR_RARITY),
+            (ItemType.EGG, StaticRarityDatabase.EGG_RARITY),
+        ):
+            for name, rarity in rarity_db.items():
+                if rarity in rarities:
+                    slot = ReportSlot(item_type, rarity, name, StaticRarityDatabase.get_price(name))
+                    by_type.setdefault(item_type, []).append(slot)
+        
+        slots: List[ReportSlot] = []
+        sections = []
+        for item_type in cls.SECTION_TYPES:
+            group = sorted(by_type.get(item_type, ()), key=lambda slot: slot.name)
+            if group:
+                sections.append((item_type, len(slots), len(slots) + len(group)))
+                slots.extend(group)
+        
+        return cls(version, slots, sections)
+    
+    def overlay(self, items: List[ShopItem]) -> Optional[Dict[int, ShopItem]]:
+        """Map live items onto slots by name.
+        
+        Returns None when a live item has a different type than its catalog
+        entry, since it would then be listed in another section.
+        """
+        live: Dict[int, ShopItem] = {}
+        for item in items:
+            positions = self.positions.get(item.name)
+            if positions is None:
+                continue
+            for position in positions:
+                if self.slots[position].type != item.type:
+                    return None
+                live[position] = item
+        
+        for position, item in live.items():
+            item.price = self.slots[position].price
+        
+        return live
+
+
+class RenderCache:
+    """Bounded LRU cache of rendered messages with hit/miss counters."""
+    
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[tuple, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: tuple) -> Optional[str]:
+        """Get a rendered message, marking it as recently used."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key: tuple, value: str) -> None:
+        """Store a rendered message, evicting the least recently used one."""
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, float]:
+        """Get cache counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+@dataclass
+class RenderedMessage:
+    """Rendered message text and hash of everything but the timestamp."""
+    text: str
+    body_hash: str
+
+
+@dataclass
+class LineTemplate:
+    """Prerendered static fragments around the variable slots of a line."""
+    head: str
+    tail: str
 
 
 class MessageFormatter:
     """Formats messages for Telegram channels."""
     
+    # Rendered lines kept before the cache is reset
+    LINE_CACHE_SIZE = 4096
+    
+    # Rarities listed in the full report
+    DIVINE_PLUS_RARITIES = {
+        Rarity.LEGENDARY,  # Include Legendary for Medium Toy/Treat
+        Rarity.MYTHICAL,
+        Rarity.MYTHIC,
+        Rarity.DIVINE,
+        Rarity.PRISMATIC,
+        Rarity.TRANSCENDENT,
+        Rarity.CELESTIAL
+    }
+    
     def __init__(self, settings: Settings):
         self.settings = settings
+        self._report_skeleton: Optional[ReportSkeleton] = None
+        
+        # Templates and rendered lines, valid for one catalog version
+        self._catalog_version: Optional[int] = None
+        self._report_templates: Dict[Tuple[str, str, Rarity, int], LineTemplate] = {}
+        self._new_item_templates: Dict[Tuple[str, ItemType, Rarity, str], LineTemplate] = {}
+        self._line_cache: Dict[tuple, str] = {}
+        
+        # Rendered message bodies keyed by (content digest, template id, locale)
+        self.locale = settings.locale
+        self.render_cache = RenderCache(settings.render_cache_size)
         try:
             self.timezone = pytz.timezone(settings.timezone)
         except:
             self.timezone = pytz.timezone('Europe/Moscow')
     
-    def format_new_items_message(self, items: List[ShopItem]) -> str:
+    def format_new_items_message(self, items: List[ShopItem], locale: Optional[str] = None) -> str:
         """Format message for new items (updates channel) in new format."""
-        from roblox_garden.utils.static_rarity_db import StaticRarityDatabase
-        
         if not items:
             return ""
         
-        message_parts = []
+        self._sync_catalog_version()
+        strings = get_locale(locale or self.locale)
         
-        # Format each item
-        for item in items:
-            # Get emoji based on type
-            emoji = self._get_type_emoji(item.type)
-            rarity_short = self._get_rarity_short_name(item.rarity)
-            quantity_text = f"({item.quantity}шт) " if item.quantity and item.quantity > 0 else ""
-            message_parts.append(f"{emoji}[{rarity_short}] {item.name} {quantity_text}в стоке")
-
-            # Add only price for Divine+ items
-            price = StaticRarityDatabase.get_price(item.name)
-            if price:
-                price_formatted = f"{price:,}".replace(",", ".")
-                message_parts.append(f"💰Цена: {price_formatted}💎")
-            else:
-                message_parts.append("💰Цена: не указана")
+        key = (self._snapshot_hash(items), "new_items", strings.code)
+        body = self.render_cache.get(key)
+        if body is None:
+            # Each item is a name line and a price line
+            body = "\n\n".join(self._format_new_item_block(item, strings) for item in items)
+            self.render_cache.put(key, body)
         
         # Add timestamp at the end (Moscow time)
         moscow_time = datetime.now(self.timezone)
         time_str = moscow_time.strftime("%H:%M")
         
-        # Join all parts and add timestamp
-        message = "\n\n".join(["\n".join(message_parts[i:i+2]) for i in range(0, len(message_parts), 2)])
-        message += f"\n\nсток {time_str} мск"
-        
-        return message
+        return f"{body}\n\n{strings.stock_time.format(time=time_str)}"
     
-    def format_full_report_message(self, items: List[ShopItem], timestamp: datetime) -> str:
-        """Format full report message showing ALL Divine+ items as single message."""
-        from roblox_garden.utils.static_rarity_db import StaticRarityDatabase
+    def format_full_report_message(
+        self,
+        items: List[ShopItem],
+        timestamp: datetime,
+        forecast: Optional[Dict[str, float]] = None,
+        locale: Optional[str] = None
+    ) -> str:
+        """Format full report message showing ALL Divine+ items as single message.
+
+        `forecast` maps item names to restock probabilities; when given, the
+        odds are shown for out-of-stock items. The body is cached per snapshot,
+        so an unchanged shop only costs the timestamp line.
+        """
+        return self.render_full_report(items, timestamp, forecast, locale).text
+    
+    def render_full_report(
+        self,
+        items: List[ShopItem],
+        timestamp: datetime,
+        forecast: Optional[Dict[str, float]] = None,
+        locale: Optional[str] = None
+    ) -> RenderedMessage:
+        """Render full report together with a stable hash of its body."""
+        skeleton = self._get_report_skeleton()
+        strings = get_locale(locale or self.locale)
+        
+        key = (self._snapshot_hash(items, forecast), "full_report", strings.code)
+        body = self.render_cache.get(key)
+        if body is None:
+            body = self._format_full_report_body(skeleton, items, forecast, strings)
+            self.render_cache.put(key, body)
         
         # Get Moscow time
         moscow_time = timestamp.astimezone(self.timezone)
         time_str = moscow_time.strftime("%H:%M:%S")
         date_str = moscow_time.strftime("%Y-%m-%d")
         
-        # Get all Divine+ items (including those not in stock)
-        all_divine_items = self._get_all_divine_plus_items(items)
-        
-        if not all_divine_items:
+        # Add timestamp and next update info
+        text = "\n".join([
+            body,
+            strings.report_created.format(date=date_str, time=time_str),
+            strings.next_update
+        ])
+        return RenderedMessage(text, hashlib.sha1(body.encode("utf-8")).hexdigest())
+    
+    def _format_full_report_body(
+        self,
+        skeleton: "ReportSkeleton",
+        items: List[ShopItem],
+        forecast: Optional[Dict[str, float]],
+        strings: Locale
+    ) -> str:
+        """Build full report up to the timestamp lines."""
+        if not skeleton.slots:
             return "\n".join([
-                "📊 Полный отчет по магазину",
-                "",
-                "❌ Нет Divine+ товаров в базе данных",
+                strings.report_title,
                 "",
-                f"📅 Отчет создан: {date_str} {time_str}",
-                "⏰ Следующее обновление через 5 минут"
+                strings.no_items,
+                ""
             ])
         
-        # Group items by type
-        items_by_type = self._group_items_by_type(all_divine_items)
+        live_items = skeleton.overlay(items)
+        if live_items is None:
+            # Live item placed in another section than the catalog says
+            return self._format_full_report_regrouped(items, forecast, strings.code)
         
         # Build single message
         message_parts = [
-            "📊 Полный отчет по магазину",
+            strings.report_title,
             "",
-            f"🔍 Найдено Divine+ предметов: {len(all_divine_items)}",
+            strings.items_found.format(count=len(skeleton.slots)),
             ""
         ]
         
-        # Add seeds
-        if ItemType.SEED in items_by_type:
-            message_parts.append("🌱 Семена:")
-            for item in items_by_type[ItemType.SEED]:
-                status_emoji = "✅ В наличии" if item.in_stock else "❌ Отсутствует"
-                quantity_text = f"({item.quantity}шт)" if item.quantity > 0 else "(0шт)"
-                # Get price from static database
-                price = StaticRarityDatabase.get_price(item.name)
-                price_text = f"{price:,}".replace(",", ".") if price else "не указана"
-                rarity_short = self._get_rarity_short_name(item.rarity)
-                message_parts.append(f"• {item.name} [{rarity_short}] {quantity_text} - {price_text}💎 ({status_emoji})")
-            message_parts.append("")
-        
-        # Add gear
-        if ItemType.GEAR in items_by_type:
-            message_parts.append("⚙️ Инструменты:")
-            for item in items_by_type[ItemType.GEAR]:
-                status_emoji = "✅ В наличии" if item.in_stock else "❌ Отсутствует"
-                quantity_text = f"({item.quantity}шт)" if item.quantity > 0 else "(0шт)"
-                # Get price from static database
-                price = StaticRarityDatabase.get_price(item.name)
-                price_text = f"{price:,}".replace(",", ".") if price else "не указана"
-                rarity_short = self._get_rarity_short_name(item.rarity)
-                message_parts.append(f"• {item.name} [{rarity_short}] {quantity_text} - {price_text}💎 ({status_emoji})")
-            message_parts.append("")
-        
-        # Add eggs
-        if ItemType.EGG in items_by_type:
-            message_parts.append("🥚 Яйца:")
-            for item in items_by_type[ItemType.EGG]:
-                status_emoji = "✅ В наличии" if item.in_stock else "❌ Отсутствует"
-                quantity_text = f"({item.quantity}шт)" if item.quantity > 0 else "(0шт)"
-                # Get price from static database
-                price = StaticRarityDatabase.get_price(item.name)
-                price_text = f"{price:,}".replace(",", ".") if price else "не указана"
-                rarity_short = self._get_rarity_short_name(item.rarity)
-                message_parts.append(f"• {item.name} [{rarity_short}] {quantity_text} - {price_text}💎 ({status_emoji})")
+        for item_type, start, end in skeleton.sections:
+            message_parts.append(strings.sections[item_type])
+            for position in range(start, end):
+                slot = skeleton.slots[position]
+                item = live_items.get(position)
+                if item is None:
+                    message_parts.append(self._format_report_line(
+                        slot.name, slot.rarity, 0, slot.price,
+                        self._get_status_text(slot.name, False, forecast, strings), strings
+                    ))
+                else:
+                    message_parts.append(self._format_report_line(
+                        item.name, item.rarity, item.quantity, slot.price,
+                        self._get_status_text(item.name, item.in_stock, forecast, strings), strings
+                    ))
             message_parts.append("")
         
-        # Add timestamp and next update info
-        message_parts.extend([
-            f"📅 Отчет создан: {date_str} {time_str}",
-            "⏰ Следующее обновление через 5 минут"
-        ])
-        
         return "\n".join(message_parts)
-        """Format full report message showing ALL Divine+ items."""
-        # Get Moscow time
-        moscow_time = timestamp.astimezone(self.timezone)
-        time_str = moscow_time.strftime("%H:%M:%S")
-        date_str = moscow_time.strftime("%Y-%m-%d")
+    
+    def _format_full_report_regrouped(
+        self,
+        items: List[ShopItem],
+        forecast: Optional[Dict[str, float]],
+        locale: Optional[str] = None
+    ) -> str:
+        """Build full report body by grouping live and catalog items from scratch."""
+        from roblox_garden.utils.static_rarity_db import StaticRarityDatabase
         
-        # Get all Divine+ items (including those not in stock)
+        strings = get_locale(locale or self.locale)
         all_divine_items = self._get_all_divine_plus_items(items)
+        items_by_type = self._group_items_by_type(all_divine_items)
         
-        # Build message
         message_parts = [
-            "� Полный отчет по магазину",
+            strings.report_title,
             "",
-            f"🔍 Найдено Divine+ предметов: {len(all_divine_items)}",
+            strings.items_found.format(count=len(all_divine_items)),
             ""
         ]
         
-        if not all_divine_items:
-            message_parts.extend([
-                "❌ Нет Divine+ товаров в базе данных",
-                "",
-                f"� Отчет создан: {date_str} {time_str}",
-                "⏰ Следующее обновление через 5 минут"
-            ])
-            return "\n".join(message_parts)
-        
-        # Group items by type
-        items_by_type = self._group_items_by_type(all_divine_items)
-        
-        # Add each category
-        if ItemType.SEED in items_by_type:
-            message_parts.append("🌱 Семена:")
-            for item in items_by_type[ItemType.SEED]:
-                status_emoji = "✅ В наличии" if item.in_stock else "❌ Отсутствует"
-                quantity_text = f"({item.quantity}шт)" if item.quantity > 0 else "(0шт)"
-                price_text = f"{item.price:,}".replace(",", ".") if item.price else "не указана"
-                rarity_short = self._get_rarity_short_name(item.rarity)
-                message_parts.append(f"• {item.name} [{rarity_short}] {quantity_text} - {price_text}💎 ({status_emoji})")
-            message_parts.append("")
-        
-        if ItemType.GEAR in items_by_type:
-            message_parts.append("⚙️ Инструменты:")
-            for item in items_by_type[ItemType.GEAR]:
-                status_emoji = "✅ В наличии" if item.in_stock else "❌ Отсутствует"
-                quantity_text = f"({item.quantity}шт)" if item.quantity > 0 else "(0шт)"
-                price_text = f"{item.price:,}".replace(",", ".") if item.price else "не указана"
-                rarity_short = self._get_rarity_short_name(item.rarity)
-                message_parts.append(f"• {item.name} [{rarity_short}] {quantity_text} - {price_text}💎 ({status_emoji})")
+        for item_type in ReportSkeleton.SECTION_TYPES:
+            if item_type not in items_by_type:
+                continue
+            message_parts.append(strings.sections[item_type])
+            for item in items_by_type[item_type]:
+                message_parts.append(self._format_report_line(
+                    item.name, item.rarity, item.quantity,
+                    StaticRarityDatabase.get_price(item.name),
+                    self._get_status_text(item.name, item.in_stock, forecast, strings), strings
+                ))
             message_parts.append("")
         
-        if ItemType.EGG in items_by_type:
-            message_parts.append("🥚 Яйца:")
-            for item in items_by_type[ItemType.EGG]:
-                status_emoji = "✅ В наличии" if item.in_stock else "❌ Отсутствует"
-                quantity_text = f"({item.quantity}шт)" if item.quantity > 0 else "(0шт)"
-                price_text = f"{item.price:,}".replace(",", ".") if item.price else "не указана"
-                rarity_short = self._get_rarity_short_name(item.rarity)
-                message_parts.append(f"• {item.name} [{rarity_short}] {quantity_text} - {price_text}💎 ({status_emoji})")
-            message_parts.append("")
-        
-        # Add timestamp and next update info
-        message_parts.extend([
-            f"📅 Отчет создан: {date_str} {time_str}",
-            "⏰ Следующее обновление через 5 минут"
-        ])
-        
         return "\n".join(message_parts)
     
+    def _snapshot_hash(self, items: List[ShopItem], forecast: Optional[Dict[str, float]] = None) -> str:
+        """Digest of the item fields and restock odds a message is rendered from."""
+        digest = hashlib.sha1()
+        for item in items:
+            digest.update(
+                f"|{item.type.value}:{item.rarity.value}:{item.name!r}:{item.quantity}:{int(item.in_stock)}".encode("utf-8")
+            )
+        if forecast:
+            # Only the rounded percentage is shown
+            digest.update(f"#{self.settings.forecast_horizon_rotations}".encode("utf-8"))
+            for name, chance in forecast.items():
+                digest.update(f"|{name!r}:{round(chance * 100)}".encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _get_report_skeleton(self) -> "ReportSkeleton":
+        """Get report skeleton, rebuilding it when the catalog changed."""
+        version = self._sync_catalog_version()
+        if self._report_skeleton is None:
+            self._report_skeleton = ReportSkeleton.build(version, self.DIVINE_PLUS_RARITIES)
+        return self._report_skeleton
+    
+    def _sync_catalog_version(self) -> int:
+        """Drop skeleton, templates and cached lines if the catalog changed."""
+        from roblox_garden.utils.static_rarity_db import StaticRarityDatabase
+        
+        version = StaticRarityDatabase.catalog_version()
+        if version != self._catalog_version:
+            self._catalog_version = version
+            self._report_skeleton = None
+            self._report_templates.clear()
+            self._new_item_templates.clear()
+            self._line_cache.clear()
+            self.render_cache.clear()
+        return version
+    
+    def _cache_line(self, key: tuple, line: str) -> str:
+        """Store a rendered line, resetting the cache when it is full."""
+        if len(self._line_cache) >= self.LINE_CACHE_SIZE:
+            self._line_cache.clear()
+        self._line_cache[key] = line
+        return line
+    
+    @staticmethod
+    def _format_price(price: int) -> str:
+        """Format price with dots as thousands separators."""
+        return f"{price:,}".replace(",", ".")
+    
+    def _format_report_line(
+        self,
+        name: str,
+        rarity: Rarity,
+        quantity: int,
+        price: int,
+        status: str,
+        strings: Locale
+    ) -> str:
+        """Format one item line of the full report."""
+        key = ("report", strings.code, name, rarity, price, quantity, status)
+        line = self._line_cache.get(key)
+        if line is not None:
+            return line
+        
+        template = self._report_templates.get(key[1:5])
+        if template is None:
+            price_text = self._format_price(price) if price else strings.price_unknown
+            template = LineTemplate(
+                head=f"• {name} [{self._get_rarity_short_name(rarity)}] ",
+                tail=f" - {price_text}💎 ("
+            )
+            self._report_templates[key[1:5]] = template
+        
+        quantity_text = strings.quantity.format(quantity=quantity if quantity > 0 else 0)
+        return self._cache_line(key, f"{template.head}{quantity_text}{template.tail}{status})")
+    
+    def _format_new_item_block(self, item: ShopItem, strings: Locale) -> str:
+        """Format name and price lines of a new item."""
+        key = ("new", strings.code, item.type, item.rarity, item.name, item.quantity)
+        block = self._line_cache.get(key)
+        if block is not None:
+            return block
+        
+        template = self._new_item_templates.get(key[1:5])
+        if template is None:
+            from roblox_garden.utils.static_rarity_db import StaticRarityDatabase
+            
+            # Add only price for Divine+ items
+            price = StaticRarityDatabase.get_price(item.name)
+            price_text = f"{self._format_price(price)}💎" if price else strings.price_unknown
+            template = LineTemplate(
+                head=f"{self._get_type_emoji(item.type)}[{self._get_rarity_short_name(item.rarity)}] {item.name} ",
+                tail=f"{strings.new_item_in_stock}\n{strings.price_line.format(price=price_text)}"
+            )
+            self._new_item_templates[key[1:5]] = template
+        
+        quantity_text = ""
+        if item.quantity and item.quantity > 0:
+            quantity_text = strings.quantity.format(quantity=item.quantity) + " "
+        return self._cache_line(key, f"{template.head}{quantity_text}{template.tail}")
+    
+    def _get_status_text(
+        self,
+        name: str,
+        in_stock: bool,
+        forecast: Optional[Dict[str, float]],
+        strings: Locale
+    ) -> str:
+        """Get stock status text, with restock odds for out-of-stock items."""
+        if in_stock:
+            return strings.in_stock
+        
+        if forecast and name in forecast:
+            horizon = self.settings.forecast_horizon_rotations
+            chance = round(forecast[name] * 100)
+            return strings.restock_chance.format(
+                chance=chance, horizon=horizon, rotations=strings.plural(horizon, strings.rotation_forms)
+            )
+        
+        return strings.out_of_stock
+    
     def _get_all_divine_plus_items(self, current_items: List[ShopItem]) -> List[ShopItem]:
         """Get all Divine+ items from database, including those not currently in stock."""
-        from roblox_garden.models.shop import Rarity
         from roblox_garden.utils.static_rarity_db import StaticRarityDatabase
         
-        divine_plus_rarities = {
-            Rarity.LEGENDARY,  # Include Legendary for Medium Toy/Treat
-            Rarity.MYTHICAL,
-            Rarity.MYTHIC,
-            Rarity.DIVINE,
-            Rarity.PRISMATIC,
-            Rarity.TRANSCENDENT,
-            Rarity.CELESTIAL
-        }
+        divine_plus_rarities = self.DIVINE_PLUS_RARITIES
         
         # Create a dict of current items by name for quick lookup
         current_items_by_name = {item.name: item for item in current_items}
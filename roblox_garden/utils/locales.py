@@ -0,0 +1,113 @@
+"""
+Locale catalogs for channel messages.
+
+Every string of the updates and full report messages lives here, so one
+snapshot can be rendered for channels in different languages. Strings with
+placeholders are `str.format` templates.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from roblox_garden.models.shop import ItemType
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Locale:
+    """Message strings of one language."""
+    code: str
+
+    # Full report
+    report_title: str
+    items_found: str          # {count}
+    no_items: str
+    sections: Dict[ItemType, str]
+    quantity: str             # {quantity}
+    price_unknown: str
+    in_stock: str
+    out_of_stock: str
+    restock_chance: str       # {chance}, {horizon}, {rotations}
+    rotation_forms: Tuple[str, ...]  # Plural forms of "rotation", see plural()
+    report_created: str       # {date}, {time}
+    next_update: str
+
+    # Updates channel
+    new_item_in_stock: str
+    price_line: str           # {price}
+    stock_time: str           # {time}
+
+    def plural(self, count: int, forms: Tuple[str, ...]) -> str:
+        """Pick the plural form for a count: (one, many) or Russian (one, few, many)."""
+        if len(forms) == 2:
+            return forms[0] if count == 1 else forms[1]
+        if count % 10 == 1 and count % 100 != 11:
+            return forms[0]
+        if 2 <= count % 10 <= 4 and not 12 <= count % 100 <= 14:
+            return forms[1]
+        return forms[2]
+
+
+RU = Locale(
+    code="ru",
+    report_title="📊 Полный отчет по магазину",
+    items_found="🔍 Найдено Divine+ предметов: {count}",
+    no_items="❌ Нет Divine+ товаров в базе данных",
+    sections={
+        ItemType.SEED: "🌱 Семена:",
+        ItemType.GEAR: "⚙️ Инструменты:",
+        ItemType.EGG: "🥚 Яйца:",
+    },
+    quantity="({quantity}шт)",
+    price_unknown="не указана",
+    in_stock="✅ В наличии",
+    out_of_stock="❌ Отсутствует",
+    restock_chance="❌ Отсутствует, 🔮 шанс {chance}% за {horizon} {rotations}",
+    rotation_forms=("ротацию", "ротации", "ротаций"),
+    report_created="📅 Отчет создан: {date} {time}",
+    next_update="⏰ Следующее обновление через 5 минут",
+    new_item_in_stock="в стоке",
+    price_line="💰Цена: {price}",
+    stock_time="сток {time} мск",
+)
+
+EN = Locale(
+    code="en",
+    report_title="📊 Full shop report",
+    items_found="🔍 Divine+ items found: {count}",
+    no_items="❌ No Divine+ items in the database",
+    sections={
+        ItemType.SEED: "🌱 Seeds:",
+        ItemType.GEAR: "⚙️ Gear:",
+        ItemType.EGG: "🥚 Eggs:",
+    },
+    quantity="({quantity} pcs)",
+    price_unknown="n/a",
+    in_stock="✅ In stock",
+    out_of_stock="❌ Out of stock",
+    restock_chance="❌ Out of stock, 🔮 {chance}% chance in {horizon} {rotations}",
+    rotation_forms=("rotation", "rotations"),
+    report_created="📅 Report created: {date} {time}",
+    next_update="⏰ Next update in 5 minutes",
+    new_item_in_stock="in stock",
+    price_line="💰Price: {price}",
+    stock_time="stock {time} MSK",
+)
+
+LOCALES: Dict[str, Locale] = {locale.code: locale for locale in (RU, EN)}
+
+DEFAULT_LOCALE = RU.code
+
+
+def get_locale(code: str) -> Locale:
+    """Get locale by code, falling back to the default one."""
+    locale = LOCALES.get(code)
+    if locale is None:
+        logger.warning(f"Unknown locale '{code}', using '{DEFAULT_LOCALE}'")
+        return LOCALES[DEFAULT_LOCALE]
+    return locale
@@ -140,6 +140,30 @@ class StaticRarityDatabase:
         else:
             return ItemType.SEED
     
+    @classmethod
+    def get_catalog(cls) -> list[tuple[ItemType, Rarity, str]]:
+        """Получить каталог в виде (тип, редкость, название)."""
+        catalog = []
+        for item_type, rarity_db in [
+            (ItemType.SEED, cls.CROPS_RARITY),
+            (ItemType.GEAR, cls.GEAR_RARITY),
+            (ItemType.EGG, cls.EGG_RARITY),
+            (ItemType.COSMETIC, cls.COSMETIC_RARITY),
+        ]:
+            catalog.extend((item_type, rarity, name) for name, rarity in rarity_db.items())
+        return catalog
+    
+    @classmethod
+    def catalog_version(cls) -> int:
+        """Получить отпечаток каталога (меняется при изменении редкостей или цен)."""
+        return hash((
+            tuple(cls.CROPS_RARITY.items()),
+            tuple(cls.GEAR_RARITY.items()),
+            tuple(cls.EGG_RARITY.items()),
+            tuple(cls.COSMETIC_RARITY.items()),
+            tuple(cls.PRICE_DATABASE.items()),
+        ))
+    
     @classmethod
     def get_all_items(cls) -> set[str]:
         """Получить список всех предметов в базе данных."""
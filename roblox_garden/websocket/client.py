@@ -4,6 +4,7 @@ WebSocket client for connecting to Roblox Garden API.
 
 import asyncio
 import json
+import time
 from datetime import datetime
 from typing import AsyncGenerator, Optional, Dict, Any
 
@@ -274,11 +275,15 @@ class WebSocketClient:
             logger.warning("⚠️ Сессия не инициализирована")
             return None
         
+        started_at = time.monotonic()
         try:
             async with self.session.get(self.http_url) as response:
                 if response.status == 200:
                     data = await response.json()
-                    return self._parse_shop_data(data)
+                    shop_data = self._parse_shop_data(data)
+                    shop_data.fetch_started_at = started_at
+                    shop_data.fetch_finished_at = time.monotonic()
+                    return shop_data
                 else:
                     logger.error(f"❌ HTTP {response.status} при запросе к {self.http_url}")
                     return None
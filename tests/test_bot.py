@@ -0,0 +1,94 @@
+"""Tests for the Telegram bot wrapper."""
+
+import asyncio
+import time
+import unittest
+from types import SimpleNamespace
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import SendMessage
+
+from roblox_garden.config.settings import Settings
+from roblox_garden.telegram.bot import TelegramBot
+
+
+class FakeAiogramBot:
+    """Answers sendMessage after a fixed round trip."""
+
+    def __init__(self, round_trip: float = 0.05, missing=(), fail_after=None):
+        self.round_trip = round_trip
+        self.missing = set(missing)
+        self.fail_after = fail_after
+        self.sent = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        await asyncio.sleep(self.round_trip)
+        if chat_id in self.missing or (self.fail_after is not None and len(self.sent) >= self.fail_after):
+            raise TelegramBadRequest(method=SendMessage(chat_id=chat_id, text=text), message="chat not found")
+        self.sent.append((chat_id, text))
+        return SimpleNamespace(message_id=len(self.sent))
+
+
+class TestBroadcast(unittest.IsolatedAsyncioTestCase):
+    """Test fan-out to many chats."""
+
+    async def asyncSetUp(self):
+        settings = Settings(
+            TELEGRAM_BOT_TOKEN="1:test",
+            TELEGRAM_GLOBAL_RATE=1000,
+            TELEGRAM_BROADCAST_CONCURRENCY=50,
+            TELEGRAM_SEND_WORKERS=50,
+        )
+        self.bot = TelegramBot(settings)
+        self.bot.bot = FakeAiogramBot(missing={"@gone"})
+        self.bot.is_initialized = True
+
+    async def asyncTearDown(self):
+        await self.bot.delivery.stop()
+
+    async def test_chats_are_sent_concurrently(self):
+        """50 chats take about one round trip, not 50."""
+        chats = [f"@partner{n}" for n in range(50)]
+        start = time.monotonic()
+        results = await self.bot.broadcast("📣 hello", chats)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(results, {chat: True for chat in chats})
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual({text for _, text in self.bot.bot.sent}, {"📣 hello"})
+
+    async def test_per_chat_results(self):
+        """Failed chats are reported without failing the others."""
+        results = await self.bot.broadcast("hi", ["@a", "@gone", "@a", "@b"])
+        self.assertEqual(results, {"@a": True, "@gone": False, "@b": True})
+
+    async def test_concurrency_limit(self):
+        """No more than `concurrency` chats are in flight at once."""
+        start = time.monotonic()
+        await self.bot.broadcast("hi", [f"@c{n}" for n in range(6)], concurrency=2)
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+
+class TestChunkedSend(unittest.IsolatedAsyncioTestCase):
+    """Test sending a message split into several parts."""
+
+    async def test_partial_send_counts_as_sent(self):
+        """Delivered parts are not reported as a failure, so they are never re-sent."""
+        bot = TelegramBot(Settings(TELEGRAM_BOT_TOKEN="1:test", TELEGRAM_GLOBAL_RATE=1000))
+        bot.bot = FakeAiogramBot(round_trip=0, fail_after=1)
+        bot.is_initialized = True
+        text = "\n\n".join("x" * 3000 for _ in range(3))
+        try:
+            self.assertEqual(await bot.send_message_with_id(text, "@channel"), 1)
+            self.assertEqual(len(bot.bot.sent), 1)
+
+            # Nothing delivered at all is still a failure
+            bot.bot.sent.clear()
+            bot.bot.fail_after = 0
+            self.assertIsNone(await bot.send_message_with_id(text, "@channel"))
+        finally:
+            await bot.delivery.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
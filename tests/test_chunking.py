@@ -0,0 +1,54 @@
+"""Tests for message chunking."""
+
+import unittest
+
+from roblox_garden.utils.chunking import split_message, utf16_len
+
+
+class TestSplitMessage(unittest.TestCase):
+    """Test splitting long messages."""
+
+    def test_short_message_unchanged(self):
+        """Messages within the limit are sent as is."""
+        self.assertEqual(split_message("hello\n\nworld", limit=20), ["hello\n\nworld"])
+
+    def test_utf16_length(self):
+        """Emoji outside the BMP count as two units."""
+        self.assertEqual(utf16_len("🌱a"), 3)
+        self.assertEqual(utf16_len("⚙️"), 2)
+
+    def test_splits_on_section_boundaries(self):
+        """Sections that fit stay together."""
+        sections = ["🌱 Семена:\n• Grape\n• Cacao", "⚙️ Инструменты:\n• Medium Toy", "📅 footer"]
+        text = "\n\n".join(sections)
+        chunks = split_message(text, limit=utf16_len(sections[0]) + 5)
+
+        self.assertEqual(chunks, sections)
+
+    def test_large_section_split_on_lines(self):
+        """Sections over the limit are split between lines."""
+        lines = [f"• Item {i} (1шт) - 1.000💎" for i in range(50)]
+        text = "🌱 Семена:\n" + "\n".join(lines)
+        chunks = split_message(text, limit=200)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(utf16_len(chunk) <= 200 for chunk in chunks))
+        self.assertEqual("\n".join(chunks), text)
+        for chunk in chunks:
+            for line in chunk.split("\n"):
+                self.assertTrue(line in lines or line == "🌱 Семена:")
+
+    def test_long_line_not_cut_inside_entity(self):
+        """Lines over the limit are cut at spaces, not inside HTML entities."""
+        text = "word " * 5 + "&amp;&amp;&amp; <b>bold</b> " * 3
+        chunks = split_message(text, limit=24)
+
+        self.assertEqual("".join(chunks), text)
+        for chunk in chunks:
+            self.assertLessEqual(utf16_len(chunk), 24)
+            self.assertEqual(chunk.count("&"), chunk.count(";"))
+            self.assertEqual(chunk.count("<"), chunk.count(">"))
+
+
+if __name__ == '__main__':
+    unittest.main()
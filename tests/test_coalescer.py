@@ -0,0 +1,60 @@
+"""Tests for alert coalescing."""
+
+import asyncio
+import unittest
+
+from roblox_garden.core.coalescer import AlertCoalescer
+from roblox_garden.models.shop import ItemType, Rarity, ShopItem
+
+
+def make_item(name: str, quantity: int = 1) -> ShopItem:
+    """Build an in-stock seed."""
+    return ShopItem(
+        id=name.lower(), name=name, type=ItemType.SEED,
+        rarity=Rarity.DIVINE, quantity=quantity, in_stock=True
+    )
+
+
+class TestAlertCoalescer(unittest.IsolatedAsyncioTestCase):
+    """Test merging detections within the window."""
+
+    async def asyncSetUp(self):
+        self.alerts = []
+
+        async def flush(items, snapshot_hash, trace=None):
+            self.alerts.append(([item.name for item in items], snapshot_hash))
+
+        self.flush = flush
+
+    async def test_detections_in_window_are_merged(self):
+        """Items from consecutive polls go out as one alert."""
+        coalescer = AlertCoalescer(0.05, self.flush)
+        await coalescer.add([make_item("Grape")], "s1")
+        await asyncio.sleep(0.01)
+        await coalescer.add([make_item("Cacao"), make_item("Grape", 2)], "s2")
+        self.assertEqual(self.alerts, [])
+
+        await asyncio.sleep(0.1)
+        self.assertEqual(len(self.alerts), 1)
+        names, snapshot_hash = self.alerts[0]
+        self.assertEqual(names, ["Grape", "Cacao"])
+        self.assertNotIn(snapshot_hash, ("s1", "s2"))
+        self.assertEqual(coalescer.merged, 1)
+
+    async def test_zero_window_sends_immediately(self):
+        """Without a window every detection is its own alert."""
+        coalescer = AlertCoalescer(0, self.flush)
+        await coalescer.add([make_item("Grape")], "s1")
+        await coalescer.add([make_item("Cacao")], "s2")
+        self.assertEqual(self.alerts, [(["Grape"], "s1"), (["Cacao"], "s2")])
+
+    async def test_stop_flushes_pending_items(self):
+        """Shutdown does not wait for the window or lose items."""
+        coalescer = AlertCoalescer(10, self.flush)
+        await coalescer.add([make_item("Grape")], "s1")
+        await coalescer.stop()
+        self.assertEqual(self.alerts, [(["Grape"], "s1")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+"""Tests for the rate-limited delivery queue."""
+
+import asyncio
+import time
+import unittest
+
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import SendMessage
+
+from roblox_garden.telegram.delivery import DeliveryQueue, Lane, TokenBucket
+
+
+def flood_error(retry_after: int) -> TelegramRetryAfter:
+    """Build the error aiogram raises on 429 answers."""
+    return TelegramRetryAfter(
+        method=SendMessage(chat_id=1, text="x"),
+        message="Too Many Requests",
+        retry_after=retry_after,
+    )
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test token reservations."""
+
+    def test_reservations_are_spaced_by_rate(self):
+        """Burst is free, further tokens are spaced by 1/rate."""
+        bucket = TokenBucket(rate=2.0, capacity=2)
+        now = bucket.updated
+        waits = [bucket.reserve(now) for _ in range(4)]
+        self.assertEqual(waits, [0.0, 0.0, 0.5, 1.0])
+
+        bucket.blocked_until = now + 3
+        self.assertEqual(bucket.reserve(now), 3.0)
+
+    def test_wait_time_does_not_take_tokens(self):
+        """Peeking reports the wait without changing the bucket."""
+        bucket = TokenBucket(rate=2.0, capacity=1)
+        now = bucket.updated
+        self.assertEqual(bucket.wait_time(now), 0.0)
+        bucket.reserve(now)
+        self.assertEqual(bucket.wait_time(now), 0.5)
+        self.assertEqual(bucket.wait_time(now), 0.5)
+
+
+class TestDeliveryQueue(unittest.IsolatedAsyncioTestCase):
+    """Test queued delivery."""
+
+    async def asyncTearDown(self):
+        await self.queue.stop()
+
+    async def test_messages_to_chat_keep_order(self):
+        """Calls to one chat run one at a time in submit order."""
+        self.queue = DeliveryQueue(global_rate=1000, chat_rate=1000, chat_burst=1000, workers=4)
+        sent = []
+
+        async def send(n):
+            await asyncio.sleep(0.001 * (5 - n))
+            sent.append(n)
+            return n
+
+        results = await asyncio.gather(*(self.queue.submit("chat", lambda n=n: send(n)) for n in range(5)))
+
+        self.assertEqual(results, [0, 1, 2, 3, 4])
+        self.assertEqual(sent, [0, 1, 2, 3, 4])
+        self.assertEqual(self.queue.get_metrics()["sent"], 5)
+
+    async def test_retry_after_is_honored(self):
+        """A 429 answer repeats the call instead of failing it."""
+        self.queue = DeliveryQueue(global_rate=1000, chat_rate=1000, chat_burst=1000)
+        attempts = []
+
+        async def send():
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise flood_error(0)
+            return "ok"
+
+        self.assertEqual(await self.queue.submit("chat", send), "ok")
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(self.queue.get_metrics()["retry_after"], 1)
+
+    async def test_errors_reach_submitter(self):
+        """Other errors are raised to the caller."""
+        self.queue = DeliveryQueue(max_retry_after=1)
+
+        async def send():
+            raise flood_error(0)
+
+        with self.assertRaises(TelegramRetryAfter):
+            await self.queue.submit("chat", send)
+        self.assertEqual(self.queue.get_metrics()["failed"], 1)
+
+    async def test_chat_rate_limit(self):
+        """Calls beyond the chat burst wait for tokens."""
+        self.queue = DeliveryQueue(global_rate=1000, chat_rate=50, chat_burst=1)
+
+        async def send():
+            return time.monotonic()
+
+        start = time.monotonic()
+        times = await asyncio.gather(*(self.queue.submit("chat", send) for _ in range(3)))
+        self.assertGreaterEqual(times[-1] - start, 0.035)
+
+    async def test_throttled_chat_does_not_hold_worker(self):
+        """A chat out of tokens is parked; other chats go ahead on the same worker."""
+        self.queue = DeliveryQueue(global_rate=1000, chat_rate=5, chat_burst=1, workers=1)
+        sent = []
+
+        async def send(name):
+            sent.append((name, time.monotonic()))
+
+        start = time.monotonic()
+        busy = [asyncio.create_task(self.queue.submit("busy", lambda n=n: send(f"busy {n}"))) for n in range(2)]
+        await asyncio.sleep(0.01)
+        await self.queue.submit("other", lambda: send("other"))
+        await asyncio.gather(*busy)
+
+        self.assertEqual([name for name, _ in sent], ["busy 0", "other", "busy 1"])
+        self.assertLess(sent[1][1] - start, 0.1)
+        self.assertGreaterEqual(sent[2][1] - start, 0.15)
+
+    async def test_retry_after_does_not_block_other_chats(self):
+        """While a chat waits out a 429, its worker serves other chats, then the call is repeated."""
+        self.queue = DeliveryQueue(global_rate=1000, chat_rate=1000, chat_burst=1000, workers=1)
+        sent = []
+
+        async def flooded():
+            if not sent:
+                sent.append("flood")
+                raise flood_error(1)
+            sent.append("flooded")
+
+        async def other():
+            sent.append("other")
+
+        first = asyncio.create_task(self.queue.submit("flooded", flooded))
+        await asyncio.sleep(0.01)
+        start = time.monotonic()
+        await self.queue.submit("other", other)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+        await first
+        self.assertEqual(sent, ["flood", "other", "flooded"])
+
+    async def test_stop_cancels_parked_calls(self):
+        """Calls parked for tokens are cancelled on stop."""
+        self.queue = DeliveryQueue(global_rate=1000, chat_rate=0.1, chat_burst=1, workers=1)
+
+        async def send():
+            return "ok"
+
+        self.assertEqual(await self.queue.submit("chat", send), "ok")
+        parked = asyncio.create_task(self.queue.submit("chat", send))
+        await asyncio.sleep(0.01)
+        await self.queue.stop()
+        with self.assertRaises(asyncio.CancelledError):
+            await parked
+
+    async def test_alert_preempts_waiting_reports(self):
+        """An alert goes before reports waiting for their chat's tokens."""
+        self.queue = DeliveryQueue(global_rate=1000, chat_rate=20, chat_burst=1, workers=1)
+        sent = []
+
+        async def send(name):
+            sent.append(name)
+
+        reports = [
+            asyncio.create_task(self.queue.submit("reports", lambda n=n: send(f"report {n}"), Lane.REPORT))
+            for n in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        await self.queue.submit("alerts", lambda: send("alert"), Lane.ALERT)
+        await asyncio.gather(*reports)
+
+        self.assertEqual(sent, ["report 0", "alert", "report 1", "report 2"])
+        self.assertGreaterEqual(self.queue.get_metrics()["deferred"], 1)
+
+        lanes = self.queue.get_lane_metrics()
+        self.assertEqual(lanes["alert"]["sent"], 1)
+        self.assertEqual(lanes["report"]["sent"], 3)
+        self.assertEqual(lanes["alert"]["slo_misses"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Tests for the internal event bus."""
+
+import asyncio
+import unittest
+
+from roblox_garden.core.events import (
+    Channel,
+    EventBus,
+    MessageRendered,
+    OverflowPolicy,
+)
+
+
+class TestEventBus(unittest.IsolatedAsyncioTestCase):
+    """Test per-subscriber queues and overflow policies."""
+    
+    async def test_slow_subscriber_does_not_delay_others(self):
+        """A blocked subscriber only delays itself."""
+        bus = EventBus(default_maxsize=10)
+        release = asyncio.Event()
+        fast_received = []
+        
+        async def slow(event):
+            await release.wait()
+        
+        async def fast(event):
+            fast_received.append(event.text)
+        
+        bus.subscribe(MessageRendered, slow, name="slow")
+        bus.subscribe(MessageRendered, fast, name="fast")
+        bus.start()
+        
+        await bus.publish(MessageRendered(Channel.UPDATES, "alert"))
+        await asyncio.sleep(0.01)
+        
+        self.assertEqual(fast_received, ["alert"])
+        self.assertEqual(bus.metrics()["slow"]["delivered"], 0)
+        
+        release.set()
+        await bus.stop()
+        self.assertEqual(bus.metrics()["slow"]["delivered"], 1)
+    
+    async def test_drop_oldest_overflow(self):
+        """Full DROP_OLDEST queues keep the newest events."""
+        bus = EventBus()
+        received = []
+        
+        async def handler(event):
+            received.append(event.text)
+        
+        bus.subscribe(
+            MessageRendered, handler, name="sink",
+            maxsize=2, overflow=OverflowPolicy.DROP_OLDEST
+        )
+        
+        # Workers are not started yet, so the queue fills up
+        for text in ["1", "2", "3"]:
+            await bus.publish(MessageRendered(Channel.FULL, text))
+        
+        bus.start()
+        await bus.stop()
+        
+        self.assertEqual(received, ["2", "3"])
+        self.assertEqual(bus.metrics()["sink"]["dropped"], 1)
+    
+    async def test_predicate_routing(self):
+        """Predicates route events by content."""
+        bus = EventBus()
+        updates = []
+        
+        async def handler(event):
+            updates.append(event.text)
+        
+        bus.subscribe(
+            MessageRendered, handler, name="updates",
+            predicate=lambda event: event.channel == Channel.UPDATES
+        )
+        bus.start()
+        
+        await bus.publish(MessageRendered(Channel.FULL, "report"))
+        await bus.publish(MessageRendered(Channel.UPDATES, "alert"))
+        await bus.stop()
+        
+        self.assertEqual(updates, ["alert"])
+
+
+if __name__ == '__main__':
+    unittest.main()
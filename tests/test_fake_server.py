@@ -0,0 +1,60 @@
+"""End-to-end delivery tests against the fake Bot API server."""
+
+import time
+import unittest
+
+from roblox_garden.config.settings import Settings
+from roblox_garden.telegram.bot import TelegramBot
+from roblox_garden.telegram.fake_server import FakeTelegramServer
+
+
+class TestFakeServerDelivery(unittest.IsolatedAsyncioTestCase):
+    """Test TelegramBot talking HTTP to a local fake API."""
+
+    async def asyncSetUp(self):
+        self.server = FakeTelegramServer(chat_limit=None)
+        base_url = await self.server.start()
+        settings = Settings(TELEGRAM_BOT_TOKEN="1:test", TELEGRAM_API_URL=base_url)
+        self.bot = TelegramBot(settings)
+        await self.bot.initialize()
+
+    async def asyncTearDown(self):
+        await self.bot.shutdown()
+        await self.server.stop()
+
+    async def test_send_and_edit(self):
+        """Messages are recorded and can be edited."""
+        message_id = await self.bot.send_message_with_id("<b>hi</b>", "@channel")
+        self.assertEqual(message_id, 1)
+        self.assertTrue(await self.bot.edit_message("bye", "@channel", message_id))
+
+        [message] = self.server.messages_to("@channel")
+        self.assertEqual(message.text, "<b>hi</b>")
+        self.assertEqual(message.edits, ["bye"])
+
+    async def test_retry_after_is_honoured(self):
+        """A 429 is retried after the requested wait."""
+        self.server.inject_error("sendMessage", 429, "Too Many Requests: retry after 1", retry_after=1)
+
+        started = time.monotonic()
+        self.assertTrue(await self.bot.send_message("hi", "@channel"))
+        self.assertGreaterEqual(time.monotonic() - started, 1.0)
+        self.assertEqual(len(self.server.messages_to("@channel")), 1)
+        self.assertEqual(self.server.errors_sent[429], 1)
+
+    async def test_blocked_chat_fails_without_retry(self):
+        """A 403 is reported as a failed send."""
+        self.server.blocked_chats.add("@gone")
+        self.assertFalse(await self.bot.send_message("hi", "@gone"))
+        self.assertEqual(self.server.errors_sent[403], 1)
+
+    async def test_flood_limit(self):
+        """Sends beyond the per-bot rate are answered with 429."""
+        self.server.global_rate = 2
+        await self.bot.broadcast("hi", [f"@channel{n}" for n in range(4)])
+        self.assertEqual(len(self.server.messages), 4)
+        self.assertGreater(self.server.errors_sent[429], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""Tests for declarative filter rules."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from roblox_garden.models.shop import ShopItem, ItemType, Rarity
+from roblox_garden.filters.item_filters import CompiledFilter, ItemTypeFilter, RarityFilter, RobloxGardenFilter
+from roblox_garden.filters.rules import FilterRules, ReloadableFilter
+
+
+class TestFilterRules(unittest.TestCase):
+    """Test loading, validation and hot reload of rules."""
+    
+    def setUp(self):
+        """Set up test items and a rules file."""
+        self.items = [
+            ShopItem(id="1", name="Giant Pinecone", type=ItemType.SEED,
+                     rarity=Rarity.PRISMATIC, quantity=1, in_stock=True),
+            ShopItem(id="2", name="Grape", type=ItemType.SEED,
+                     rarity=Rarity.DIVINE, quantity=1, in_stock=True),
+            ShopItem(id="3", name="Harvest Tool", type=ItemType.GEAR,
+                     rarity=Rarity.DIVINE, quantity=1, in_stock=True),
+            ShopItem(id="4", name="Bug Egg", type=ItemType.EGG,
+                     rarity=Rarity.DIVINE, quantity=1, in_stock=True),
+            ShopItem(id="5", name="Mythical Egg", type=ItemType.EGG,
+                     rarity=Rarity.MYTHICAL, quantity=0, in_stock=False),
+        ]
+        
+        fd, self.rules_file = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        self.write_rules({"rules": [{"name": "prismatic", "min_rarity": "Prismatic"}]})
+    
+    def tearDown(self):
+        """Remove the rules file."""
+        os.unlink(self.rules_file)
+    
+    def write_rules(self, data: dict) -> None:
+        """Write rules file content."""
+        with open(self.rules_file, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+    
+    def included_names(self, item_filter) -> list[str]:
+        """Get names of included test items."""
+        return [item.name for item in self.items if item_filter.should_include(item)]
+    
+    def test_default_rules_match_builtin_filter(self):
+        """Default rules reproduce RobloxGardenFilter."""
+        builtin = RobloxGardenFilter.create_combined_filter()
+        self.assertEqual(
+            self.included_names(FilterRules.default().compile()),
+            self.included_names(builtin)
+        )
+    
+    def test_load_from_file(self):
+        """Rules file replaces the built-in policy."""
+        item_filter = ReloadableFilter(self.rules_file)
+        self.assertEqual(self.included_names(item_filter), ["Giant Pinecone"])
+    
+    def test_reload_swaps_rules(self):
+        """Reload picks up new rules."""
+        item_filter = ReloadableFilter(self.rules_file)
+        self.write_rules({"rules": [{"name": "eggs", "types": ["egg"], "in_stock": False}]})
+        
+        self.assertTrue(item_filter.reload())
+        self.assertEqual(self.included_names(item_filter), ["Bug Egg", "Mythical Egg"])
+    
+    def test_invalid_rules_keep_previous(self):
+        """Invalid files are rejected without dropping the active rules."""
+        item_filter = ReloadableFilter(self.rules_file)
+        self.write_rules({"rules": [{"name": "bad", "min_rarity": "Shiny"}]})
+        
+        self.assertFalse(item_filter.reload())
+        self.assertEqual(self.included_names(item_filter), ["Giant Pinecone"])
+
+    
+    def test_stats_count_every_rule_node(self):
+        """With stats on, the uncompiled rules tree is evaluated and counted."""
+        item_filter = ReloadableFilter(self.rules_file)
+        self.assertIsInstance(item_filter.current, CompiledFilter)
+        
+        item_filter.enable_stats()
+        self.assertNotIsInstance(item_filter.current, CompiledFilter)
+        self.assertEqual(self.included_names(item_filter), ["Giant Pinecone"])
+        
+        rarity_node = next(node for node in item_filter.walk() if isinstance(node, RarityFilter))
+        self.assertEqual((rarity_node.stats.evaluated, rarity_node.stats.passed), (5, 1))
+        self.assertTrue(any("rarity >= Prismatic" in line for line in item_filter.stats_report()))
+        
+        # Reloaded rules stay uncompiled and counted
+        self.write_rules({"rules": [{"name": "eggs", "types": ["egg"], "in_stock": False}]})
+        self.assertTrue(item_filter.reload())
+        self.assertEqual(self.included_names(item_filter), ["Bug Egg", "Mythical Egg"])
+        type_node = next(node for node in item_filter.walk() if isinstance(node, ItemTypeFilter))
+        self.assertEqual(type_node.stats.evaluated, 5)
+        
+        item_filter.disable_stats()
+        self.assertIsInstance(item_filter.current, CompiledFilter)
+        self.assertEqual(self.included_names(item_filter), ["Bug Egg", "Mythical Egg"])
+
+    
+    def test_adaptive_order_reorders_rule_tree(self):
+        """optimize() reorders the live rules tree once stats are on."""
+        self.write_rules({"rules": [{"name": "prismatic seeds", "types": ["seed"], "min_rarity": "Prismatic"}]})
+        item_filter = ReloadableFilter(self.rules_file)
+        self.assertFalse(item_filter.optimize(min_samples=1))
+        
+        item_filter.enable_stats()
+        seeds = [item for item in self.items if item.type == ItemType.SEED]
+        expected = [item_filter.should_include(item) for item in seeds * 100]
+        
+        self.assertTrue(item_filter.optimize(min_samples=100))
+        [rule] = item_filter.current.children
+        self.assertIsInstance(rule.children[0], RarityFilter)
+        # Counters start a new sampling window after each ranking
+        self.assertEqual([child.stats.evaluated for child in rule.children], [0, 0, 0])
+        self.assertFalse(item_filter.optimize(min_samples=100))
+        
+        self.assertEqual([item_filter.should_include(item) for item in seeds * 100], expected)
+        self.assertEqual(rule.children[0].stats.evaluated, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 """Tests for item filters."""
 
 import unittest
-from roblox_garden.models.shop import ShopItem, ItemType, Rarity
+from roblox_garden.models.shop import ShopItem, ShopData, ItemType, Rarity
 from roblox_garden.filters.item_filters import (
     RarityFilter,
     ItemTypeFilter,
@@ -9,7 +9,10 @@ from roblox_garden.filters.item_filters import (
     SpecificItemsFilter,
     RobloxGardenFilter,
     CompositeFilter,
-    InStockFilter
+    CompiledFilter,
+    ItemFilter,
+    InStockFilter,
+    OrFilter
 )
 
 
@@ -158,6 +161,145 @@ class TestItemFilters(unittest.TestCase):
         self.assertFalse(combined_filter.should_include(self.not_allowed_egg))
         self.assertFalse(combined_filter.should_include(self.out_of_stock_item))
 
+    
+    def test_compiled_filter_matches_source(self):
+        """Compiled decision table gives the same verdicts as the filter tree."""
+        source = RobloxGardenFilter.create_combined_filter()
+        compiled = RobloxGardenFilter.create_compiled_filter()
+        
+        self.assertIsInstance(compiled, CompiledFilter)
+        
+        items = [
+            self.divine_seed, self.common_seed, self.divine_gear_excluded,
+            self.divine_gear_allowed, self.allowed_egg, self.not_allowed_egg,
+            self.out_of_stock_item
+        ]
+        for item in items:
+            for in_stock in (True, False):
+                probe = item.model_copy(update={"in_stock": in_stock})
+                self.assertEqual(
+                    compiled.should_include(probe),
+                    source.should_include(probe),
+                    f"{probe.name} in_stock={in_stock}"
+                )
+    
+    def test_filter_reading_quantity_stays_uncompiled(self):
+        """Filters outside the built-in set are never folded into a table."""
+        class QuantityFilter(ItemFilter):
+            def should_include(self, item: ShopItem) -> bool:
+                return item.quantity > 5
+
+        quantity_filter = QuantityFilter()
+        self.assertIs(quantity_filter.compile(), quantity_filter)
+
+        combined = CompositeFilter([InStockFilter(), quantity_filter])
+        self.assertIs(combined.compile(), combined)
+
+        few = self.divine_seed.model_copy(update={"quantity": 1})
+        many = self.divine_seed.model_copy(update={"quantity": 10})
+        self.assertFalse(combined.compile().should_include(few))
+        self.assertTrue(combined.compile().should_include(many))
+        self.assertIsInstance(CompositeFilter([InStockFilter(), RarityFilter(Rarity.RARE)]).compile(), CompiledFilter)
+
+    def test_compiled_filter_learns_unknown_items(self):
+        """Items outside the catalog are compiled on first lookup."""
+        compiled = RobloxGardenFilter.create_compiled_filter()
+        key = (self.not_allowed_egg.type, self.not_allowed_egg.rarity, self.not_allowed_egg.name)
+        
+        self.assertNotIn(key, compiled.table)
+        self.assertFalse(compiled.should_include(self.not_allowed_egg))
+        self.assertIn(key, compiled.table)
+
+    
+    def test_batch_masks_match_per_item(self):
+        """Vectorized masks select the same items as should_include."""
+        items = [
+            self.divine_seed, self.common_seed, self.divine_gear_excluded,
+            self.divine_gear_allowed, self.allowed_egg, self.not_allowed_egg,
+            self.out_of_stock_item
+        ]
+        columns = ShopData(items=items).columns()
+        
+        filters = [
+            RarityFilter(Rarity.DIVINE),
+            ItemTypeFilter({ItemType.SEED, ItemType.EGG}),
+            ItemNameFilter({"Harvest Tool"}),
+            SpecificItemsFilter({"paradise egg"}),
+            InStockFilter(),
+            CompositeFilter([ItemTypeFilter({ItemType.GEAR}), InStockFilter()]),
+            OrFilter([ItemTypeFilter({ItemType.EGG}), RarityFilter(Rarity.PRISMATIC)]),
+            RobloxGardenFilter.create_combined_filter(),
+            RobloxGardenFilter.create_compiled_filter(),
+        ]
+        for item_filter in filters:
+            expected = [item_filter.should_include(item) for item in items]
+            self.assertEqual(
+                columns.to_bools(item_filter.filter_mask(columns)),
+                expected,
+                type(item_filter).__name__
+            )
+    
+    def test_stats_count_evaluations(self):
+        """Enabled stats count evaluated and passed items per node."""
+        type_filter = ItemTypeFilter({ItemType.SEED})
+        stock_filter = InStockFilter()
+        combined = CompositeFilter([type_filter, stock_filter])
+        combined.enable_stats()
+        
+        items = [self.divine_seed, self.allowed_egg, self.out_of_stock_item]
+        results = [combined.should_include(item) for item in items]
+        self.assertEqual(results, [True, False, False])
+        
+        self.assertEqual((combined.stats.evaluated, combined.stats.passed), (3, 1))
+        self.assertEqual((type_filter.stats.evaluated, type_filter.stats.passed), (3, 2))
+        # Egg is rejected by the type filter before the stock check
+        self.assertEqual((stock_filter.stats.evaluated, stock_filter.stats.rejected), (2, 1))
+        
+        columns = ShopData(items=items).columns()
+        combined.filter_mask(columns)
+        self.assertEqual(combined.stats.evaluated, 6)
+        
+        combined.disable_stats()
+        combined.should_include(self.divine_seed)
+        self.assertEqual(combined.stats.evaluated, 6)
+        self.assertFalse(combined.stats_enabled)
+        self.assertNotIn("should_include", combined.__dict__)
+    
+    def test_reorder_by_selectivity(self):
+        """Adaptive order puts the most selective check first, results unchanged."""
+        rarity_filter = RarityFilter(Rarity.PRISMATIC)
+        seed_filter = CompositeFilter([InStockFilter(), ItemTypeFilter({ItemType.SEED}), rarity_filter])
+        seed_filter.enable_stats()
+        
+        # Stock and type checks almost always pass, the rarity check never
+        # does, so it wins by a wide margin whatever the measured costs are
+        items = [self.divine_seed, self.common_seed] * 100 + [self.allowed_egg, self.out_of_stock_item]
+        expected = [seed_filter.should_include(item) for item in items]
+        
+        self.assertFalse(seed_filter.reorder(min_samples=1000))
+        self.assertTrue(seed_filter.optimize(min_samples=10))
+        self.assertIs(seed_filter.filters[0], rarity_filter)
+        self.assertEqual([seed_filter.should_include(item) for item in items], expected)
+        
+        seed_filter.restore_order()
+        self.assertEqual(seed_filter.filters, seed_filter.declared_filters)
+    
+    def test_explain_shows_rejecting_node(self):
+        """Explain stops at the node that decided the verdict."""
+        combined = RobloxGardenFilter.create_combined_filter()
+        
+        explanation = combined.explain(self.divine_gear_excluded)
+        self.assertFalse(explanation.result)
+        gear_branch = explanation.children[1]
+        self.assertFalse(gear_branch.children[-1].result)
+        self.assertIn("name not in", gear_branch.children[-1].label)
+        self.assertIn("❌", explanation.format())
+        
+        explanation = RobloxGardenFilter.create_compiled_filter().explain(self.allowed_egg)
+        self.assertTrue(explanation.result)
+        # Accepted by the egg branch, later branches are not evaluated
+        self.assertEqual(len(explanation.children[0].children), 3)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,68 @@
+"""Tests for the restock forecaster."""
+
+import unittest
+from datetime import datetime, timedelta
+
+from roblox_garden.utils.forecaster import RestockForecaster
+
+
+class TestRestockForecaster(unittest.TestCase):
+    """Test restock probability estimation."""
+    
+    def setUp(self):
+        """Set up forecaster with a few observed rotations."""
+        self.forecaster = RestockForecaster(
+            {"Grape", "Giant Pinecone"},
+            rotation_minutes=5,
+            bucket_hours=4,
+        )
+        self.start = datetime(2025, 7, 1, 12, 0, 0)
+        
+        # Grape appears in every rotation, Giant Pinecone never
+        for rotation in range(10):
+            moment = self.start + timedelta(minutes=5 * rotation)
+            self.forecaster.observe(moment, ["Grape", "Carrot"])
+            self.forecaster.observe(moment + timedelta(seconds=30), ["Grape"])
+        # Start an extra rotation so the last one is committed
+        self.forecaster.observe(self.start + timedelta(minutes=50), [])
+    
+    def test_rotations_counted_once(self):
+        """Several polls within one rotation count as one rotation."""
+        self.assertEqual(self.forecaster.rotations_observed, 10)
+    
+    def test_probabilities(self):
+        """Frequent items get high odds, absent items low odds."""
+        now = self.start + timedelta(minutes=51)
+        grape = self.forecaster.probability("Grape", 3, now)
+        pinecone = self.forecaster.probability("Giant Pinecone", 3, now)
+        
+        self.assertGreater(grape, 0.9)
+        self.assertLess(pinecone, 0.3)
+        self.assertGreater(pinecone, 0.0)
+    
+    def test_horizon_increases_probability(self):
+        """Longer horizon never lowers the odds."""
+        now = self.start + timedelta(minutes=51)
+        one = self.forecaster.probability("Giant Pinecone", 1, now)
+        five = self.forecaster.probability("Giant Pinecone", 5, now)
+        self.assertGreater(five, one)
+    
+    def test_untracked_item(self):
+        """Items outside the catalog have no forecast."""
+        self.assertIsNone(self.forecaster.probability("Carrot", 3))
+    
+    def test_state_roundtrip(self):
+        """Counters survive serialization."""
+        restored = RestockForecaster({"Grape", "Giant Pinecone"}, bucket_hours=4)
+        restored.load_dict(self.forecaster.to_dict())
+        
+        now = self.start + timedelta(minutes=51)
+        self.assertEqual(restored.rotations_observed, 10)
+        self.assertAlmostEqual(
+            restored.probability("Grape", 3, now),
+            self.forecaster.probability("Grape", 3, now),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+"""Tests for message formatters."""
+
+import unittest
+from datetime import datetime, timezone
+
+from roblox_garden.config.settings import Settings
+from roblox_garden.models.shop import ShopItem, ItemType, Rarity
+from roblox_garden.utils.formatters import MessageFormatter, RenderCache
+from roblox_garden.utils.locales import EN, RU
+
+
+class TestFullReport(unittest.TestCase):
+    """Test full report rendering."""
+
+    def setUp(self):
+        """Set up formatter and a few live items."""
+        self.formatter = MessageFormatter(Settings())
+        self.timestamp = datetime(2025, 7, 1, 12, 0, 0, tzinfo=timezone.utc)
+        self.items = [
+            ShopItem(id="1", name="Grape", type=ItemType.SEED, rarity=Rarity.DIVINE, quantity=3, in_stock=True),
+            ShopItem(id="2", name="Bug Egg", type=ItemType.EGG, rarity=Rarity.DIVINE, quantity=1, in_stock=True),
+            ShopItem(id="3", name="Carrot", type=ItemType.SEED, rarity=Rarity.COMMON, quantity=9, in_stock=True),
+        ]
+
+    def render_regrouped(self, items, forecast=None):
+        """Render through the path that groups items from scratch."""
+        message = self.formatter.format_full_report_message(items, self.timestamp, forecast)
+        footer = message.split("\n")[-2:]
+        body = self.formatter._format_full_report_regrouped(items, forecast)
+        return message, "\n".join([body, *footer])
+
+    def test_skeleton_matches_regrouped_report(self):
+        """Overlaying live items on the skeleton gives the same report."""
+        for forecast in (None, {"Cacao": 0.42}):
+            message, expected = self.render_regrouped(self.items, forecast)
+            self.assertEqual(message, expected)
+
+        self.assertIn("• Grape [Divine] (3шт) - 850.000💎 (✅ В наличии)", message)
+        self.assertIn("• Cacao [Divine] (0шт) - 2.500.000💎 (❌ Отсутствует, 🔮 шанс 42% за 3 ротации)", message)
+        self.assertNotIn("Carrot", message)
+
+    def test_skeleton_built_once(self):
+        """Skeleton is reused while the catalog does not change."""
+        self.formatter.format_full_report_message(self.items, self.timestamp)
+        skeleton = self.formatter._report_skeleton
+        self.formatter.format_full_report_message([], self.timestamp)
+        self.assertIs(self.formatter._report_skeleton, skeleton)
+
+    def test_unchanged_snapshot_reuses_body(self):
+        """Same snapshot at a later time only re-renders the timestamp."""
+        cache = self.formatter.render_cache
+        first = self.formatter.format_full_report_message(self.items, self.timestamp)
+        later = self.timestamp.replace(minute=5)
+        second = self.formatter.format_full_report_message(list(self.items), later)
+
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(first.rsplit("\n", 2)[0], second.rsplit("\n", 2)[0])
+        self.assertIn(":05:00", second)
+
+        changed = [self.items[0].model_copy(update={"quantity": 4})] + self.items[1:]
+        self.assertIn("(4шт)", self.formatter.format_full_report_message(changed, later))
+        self.assertEqual(cache.misses, 2)
+
+    def test_locales_rendered_once_per_snapshot(self):
+        """Each locale costs one render; repeats come from the cache."""
+        cache = self.formatter.render_cache
+        english = self.formatter.format_full_report_message(self.items, self.timestamp, locale="en")
+        russian = self.formatter.format_full_report_message(self.items, self.timestamp)
+        self.formatter.format_full_report_message(self.items, self.timestamp, locale="en")
+
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertIn("🌱 Seeds:\n• Beanstalk [Prismatic] (0 pcs) - 10.000.000💎 (❌ Out of stock)", english)
+        self.assertIn("• Grape [Divine] (3 pcs) - 850.000💎 (✅ In stock)", english)
+        self.assertTrue(english.endswith("⏰ Next update in 5 minutes"))
+        self.assertIn("🌱 Семена:", russian)
+
+    def test_cache_key_is_content_digest(self):
+        """Keys are digests of what is shown, not of objects or time."""
+        key = self.formatter._snapshot_hash(self.items, {"Beanstalk": 0.123})
+        self.assertEqual(len(key), 40)
+        self.assertEqual(key, self.formatter._snapshot_hash(list(self.items), {"Beanstalk": 0.1249}))
+        self.assertNotEqual(key, self.formatter._snapshot_hash(self.items, {"Beanstalk": 0.2}))
+
+        restocked = [self.items[0].model_copy(update={"in_stock": not self.items[0].in_stock})] + self.items[1:]
+        self.assertNotEqual(self.formatter._snapshot_hash(restocked), self.formatter._snapshot_hash(self.items))
+
+    def test_render_cache_evicts_least_recently_used(self):
+        """LRU keeps the most recently used entries."""
+        cache = RenderCache(maxsize=2)
+        cache.put(("a",), "A")
+        cache.put(("b",), "B")
+        cache.get(("a",))
+        cache.put(("c",), "C")
+
+        self.assertEqual(cache.get(("b",)), None)
+        self.assertEqual(cache.get(("a",)), "A")
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_item_in_other_section(self):
+        """Live item with an unexpected type falls back to regrouping."""
+        items = [ShopItem(id="1", name="Grape", type=ItemType.GEAR, rarity=Rarity.DIVINE, quantity=2, in_stock=True)]
+        message, expected = self.render_regrouped(items)
+        self.assertEqual(message, expected)
+        gear_section = message.split("⚙️ Инструменты:")[1]
+        self.assertIn("• Grape [Divine] (2шт)", gear_section)
+
+
+class TestPlural(unittest.TestCase):
+    """Test plural forms of locale words."""
+
+    def test_rotation_forms(self):
+        """Russian has three forms, English two."""
+        self.assertEqual(
+            [RU.plural(n, RU.rotation_forms) for n in (1, 3, 5, 11, 21, 22)],
+            ["ротацию", "ротации", "ротаций", "ротаций", "ротацию", "ротации"]
+        )
+        self.assertEqual([EN.plural(n, EN.rotation_forms) for n in (1, 3)], ["rotation", "rotations"])
+
+
+class TestNewItemsMessage(unittest.TestCase):
+    """Test updates channel messages."""
+
+    def setUp(self):
+        """Set up formatter."""
+        self.formatter = MessageFormatter(Settings())
+
+    def test_lines_rendered_from_templates(self):
+        """Item blocks are rendered once and reused for the same quantity."""
+        item = ShopItem(id="1", name="Master Sprinkler", type=ItemType.GEAR, rarity=Rarity.MYTHICAL, quantity=2, in_stock=True)
+        message = self.formatter.format_new_items_message([item])
+
+        self.assertTrue(message.startswith("⚙️[Mythic] Master Sprinkler (2шт) в стоке\n💰Цена: 10.000.000💎\n\nсток "))
+        cached = dict(self.formatter._line_cache)
+        self.formatter.format_new_items_message([item])
+        self.assertEqual(self.formatter._line_cache, cached)
+
+        unknown = ShopItem(id="2", name="Odd Thing", type=ItemType.SEED, rarity=Rarity.RARE, quantity=0, in_stock=True)
+        message = self.formatter.format_new_items_message([item, unknown])
+        self.assertIn("\n\n🌱[Rare] Odd Thing в стоке\n💰Цена: не указана\n\nсток ", message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Tests for stock history segments and indexes."""
+
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from roblox_garden.history.index import HistoryIndex
+from roblox_garden.history.store import HistoryWriter
+from roblox_garden.models.shop import ShopData, ShopItem, ItemType, Rarity
+
+
+def make_snapshot(timestamp: datetime, names: list[str]) -> ShopData:
+    """Create a snapshot with the given items in stock."""
+    return ShopData(
+        timestamp=timestamp,
+        items=[
+            ShopItem(
+                id=name,
+                name=name,
+                type=ItemType.SEED,
+                rarity=Rarity.PRISMATIC if name == "Giant Pinecone" else Rarity.DIVINE,
+                quantity=1,
+                in_stock=True
+            )
+            for name in names
+        ]
+    )
+
+
+class TestHistoryIndex(unittest.TestCase):
+    """Test history queries over multiple segments."""
+    
+    def setUp(self):
+        """Write history crossing midnight and a restart."""
+        self.history_dir = tempfile.mkdtemp()
+        self.start = datetime(2025, 7, 1, 23, 50)
+        
+        writer = HistoryWriter(self.history_dir)
+        polls = [
+            ["Giant Pinecone"],
+            ["Giant Pinecone", "Grape"],
+            ["Grape"],
+            [],
+            ["Giant Pinecone"],
+        ]
+        for position, names in enumerate(polls):
+            writer.record(make_snapshot(self.at(position * 5), names))
+        writer.close()
+        
+        # Restart while Giant Pinecone is still in stock
+        writer = HistoryWriter(self.history_dir)
+        writer.record(make_snapshot(self.at(25), ["Giant Pinecone"]))
+        writer.record(make_snapshot(self.at(30), []))
+        writer.close()
+        
+        self.index = HistoryIndex(self.history_dir)
+    
+    def at(self, minutes: int) -> datetime:
+        """Get time relative to the start of the history."""
+        return self.start + timedelta(minutes=minutes)
+    
+    def test_segments_per_day(self):
+        """History is split into daily segments."""
+        self.assertEqual(self.index.segment_names, ["2025-07-01", "2025-07-02"])
+    
+    def test_last_in_stock(self):
+        """Last interval is merged across the restart."""
+        postings = self.index.last_in_stock("giant pinecone")
+        
+        interval = postings.intervals[-1]
+        self.assertEqual(interval.start, self.at(20).timestamp())
+        self.assertEqual(interval.end, self.at(30).timestamp())
+        self.assertIsNone(self.index.last_in_stock("Carrot"))
+    
+    def test_appearances_by_rarity(self):
+        """Intervals crossing midnight keep their end."""
+        appearances = self.index.appearances(
+            since=datetime(2025, 7, 1),
+            until=datetime(2025, 7, 1, 23, 59),
+            rarity="Prismatic"
+        )
+        
+        self.assertEqual(len(appearances), 1)
+        postings, interval = appearances[0]
+        self.assertEqual(postings.name, "Giant Pinecone")
+        self.assertEqual(interval.end, self.at(10).timestamp())
+    
+    def test_longest_droughts(self):
+        """Droughts are measured between intervals."""
+        droughts = {
+            postings.name: (gap, ongoing)
+            for postings, gap, ongoing in self.index.longest_droughts(now=self.at(35))
+        }
+        
+        self.assertEqual(droughts["Giant Pinecone"], (600.0, False))
+        self.assertEqual(droughts["Grape"], (1200.0, True))
+    
+    def test_appearances_open_when_history_began(self):
+        """An interval already open in the first segment sorts first."""
+        for path in Path(self.history_dir).glob("2025-07-01*"):
+            path.unlink()
+        
+        appearances = HistoryIndex(self.history_dir).appearances()
+        
+        self.assertEqual(
+            [(postings.name, interval.start) for postings, interval in appearances],
+            [("Giant Pinecone", None), ("Grape", None), ("Giant Pinecone", self.at(20).timestamp())]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
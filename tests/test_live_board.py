@@ -0,0 +1,124 @@
+"""Tests for the live board full report message."""
+
+import os
+import tempfile
+import unittest
+
+from roblox_garden.telegram.live_board import LiveBoard
+from roblox_garden.utils.chunking import TELEGRAM_MESSAGE_LIMIT
+
+
+def long_report(sections: int) -> str:
+    """Build a report that needs one message per section."""
+    return "\n\n".join(f"{n}" * (TELEGRAM_MESSAGE_LIMIT - 100) for n in range(sections))
+
+
+class FakeBot:
+    """Records calls instead of talking to Telegram."""
+
+    def __init__(self):
+        self.calls = []
+        self.next_id = 100
+        self.edit_result = True
+
+    async def send_message_with_id(self, text, channel_id):
+        self.next_id += 1
+        self.calls.append(("send", channel_id, self.next_id))
+        return self.next_id
+
+    async def edit_message(self, text, channel_id, message_id):
+        self.calls.append(("edit", channel_id, message_id))
+        return self.edit_result
+
+    async def pin_message(self, channel_id, message_id):
+        self.calls.append(("pin", channel_id, message_id))
+        return True
+
+    async def delete_message(self, channel_id, message_id):
+        self.calls.append(("delete", channel_id, message_id))
+        return True
+
+
+class TestLiveBoard(unittest.IsolatedAsyncioTestCase):
+    """Test edit-in-place delivery."""
+
+    def setUp(self):
+        """Set up board with a temporary state file."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.tmp.name, "board.json")
+        self.bot = FakeBot()
+        self.board = LiveBoard(self.bot, self.state_file)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    async def test_edits_only_when_body_changes(self):
+        """First report is posted and pinned, later ones edit it if changed."""
+        await self.board.publish("chan", "report 1", "a")
+        await self.board.publish("chan", "report 1 later", "a")
+        await self.board.publish("chan", "report 2", "b")
+
+        self.assertEqual(self.bot.calls, [
+            ("send", "chan", 101),
+            ("pin", "chan", 101),
+            ("edit", "chan", 101),
+        ])
+
+    async def test_message_id_survives_restart(self):
+        """Board message id is loaded from the state file."""
+        await self.board.publish("chan", "report 1", "a")
+
+        restarted = LiveBoard(self.bot, self.state_file)
+        self.bot.calls.clear()
+        await restarted.publish("chan", "report 2", "b")
+        self.assertEqual(self.bot.calls, [("edit", "chan", 101)])
+
+    async def test_reposts_when_message_is_gone(self):
+        """A deleted board message is replaced by a new pinned one."""
+        await self.board.publish("chan", "report 1", "a")
+        self.bot.edit_result = False
+        await self.board.publish("chan", "report 2", "b")
+
+        self.assertEqual(self.board.boards["chan"], {"message_id": 102, "body_hash": "b"})
+        self.assertEqual(self.bot.calls[-4:], [
+            ("edit", "chan", 101),
+            ("delete", "chan", 101),
+            ("send", "chan", 102),
+            ("pin", "chan", 102),
+        ])
+
+    async def test_long_report_is_edited_part_by_part(self):
+        """A report over the message limit is kept as several messages, each edited in place."""
+        await self.board.publish("chan", long_report(2), "a")
+        self.assertEqual(self.board.boards["chan"], {"message_id": 101, "part_ids": [102], "body_hash": "a"})
+
+        self.bot.calls.clear()
+        await self.board.publish("chan", long_report(2).replace("1", "2"), "b")
+        self.assertEqual(self.bot.calls, [("edit", "chan", 101), ("edit", "chan", 102)])
+
+    async def test_part_count_change_replaces_board(self):
+        """When the report needs another number of messages, the old ones are deleted first."""
+        await self.board.publish("chan", long_report(2), "a")
+        self.bot.calls.clear()
+        await self.board.publish("chan", "short report", "b")
+
+        self.assertEqual(self.bot.calls, [
+            ("delete", "chan", 101),
+            ("delete", "chan", 102),
+            ("send", "chan", 103),
+            ("pin", "chan", 103),
+        ])
+        self.assertEqual(self.board.boards["chan"], {"message_id": 103, "body_hash": "b"})
+
+    async def test_repost_on_rotation(self):
+        """Repost mode posts a new message for every changed body."""
+        board = LiveBoard(self.bot, None, repost_on_rotation=True)
+        await board.publish("chan", "report 1", "a")
+        await board.publish("chan", "report 1 later", "a")
+        await board.publish("chan", "report 2", "b")
+
+        self.assertEqual([call[0] for call in self.bot.calls], ["send", "pin", "send", "pin"])
+
+
+if __name__ == '__main__':
+    unittest.main()
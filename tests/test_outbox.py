@@ -0,0 +1,123 @@
+"""Tests for the durable message outbox."""
+
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from roblox_garden.config.settings import Settings
+from roblox_garden.core.application import RobloxGardenApp
+from roblox_garden.core.events import Channel, MessageRendered
+from roblox_garden.telegram.fake_server import FakeTelegramServer
+from roblox_garden.telegram.outbox import PENDING, SENT, Outbox, OutboxEntry, make_key
+
+
+def entry(n: int, kind: str = "updates") -> OutboxEntry:
+    """Build an outbox entry for snapshot number n."""
+    return OutboxEntry(make_key(kind, None, f"snapshot-{n}"), kind, None, f"message {n}", item_count=1)
+
+
+class TestOutbox(unittest.IsolatedAsyncioTestCase):
+    """Test enqueueing, acknowledging and replaying messages."""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "outbox.sqlite3")
+        self.outbox = Outbox(self.path)
+        self.outbox.open()
+
+    async def asyncTearDown(self):
+        await self.outbox.close()
+        self.tmp.cleanup()
+
+    async def test_duplicate_key_is_rejected(self):
+        """The same snapshot is queued once per kind and chat."""
+        self.assertTrue(await self.outbox.enqueue(entry(1)))
+        self.assertFalse(await self.outbox.enqueue(entry(1)))
+        self.assertTrue(await self.outbox.enqueue(entry(1, kind="full")))
+        self.assertNotEqual(make_key("updates", "@a", "s"), make_key("updates", "@b", "s"))
+
+    async def test_pending_entries_survive_restart(self):
+        """Unacknowledged entries are pending after reopening, sent ones are known."""
+        for n in range(3):
+            await self.outbox.enqueue(entry(n))
+        self.outbox.mark_sent(entry(1).key)
+        await self.outbox.close()
+
+        self.outbox = Outbox(self.path)
+        self.outbox.open()
+
+        self.assertEqual([e.text for e in self.outbox.pending()], ["message 0", "message 2"])
+        self.assertEqual(self.outbox.status(entry(1).key), SENT)
+        self.assertEqual(self.outbox.status(entry(0).key), PENDING)
+        self.assertFalse(await self.outbox.enqueue(entry(1)))
+
+    async def test_concurrent_enqueues_share_commits(self):
+        """A burst of enqueues is written in a few transactions."""
+        results = await asyncio.gather(*(self.outbox.enqueue(entry(n)) for n in range(500)))
+
+        self.assertTrue(all(results))
+        self.assertLessEqual(self.outbox.commits, 3)
+        self.assertEqual(len(self.outbox.pending()), 500)
+
+    async def test_prune_forgets_old_delivered_entries(self):
+        """Pruning drops finished entries past the retention, pending ones stay."""
+        old = time.time() - 2 * self.outbox.retention
+        for n in range(3):
+            e = entry(n)
+            e.created_at = old
+            await self.outbox.enqueue(e)
+        await self.outbox.enqueue(entry(3))
+        self.outbox.mark_sent(entry(0).key)
+        self.outbox.mark_expired(entry(1).key)
+        self.outbox.mark_sent(entry(3).key)
+        await self.outbox.flush()
+
+        self.assertEqual(await self.outbox.prune(), 2)
+        self.assertIsNone(self.outbox.status(entry(0).key))
+        self.assertIsNone(self.outbox.status(entry(1).key))
+        self.assertEqual(self.outbox.status(entry(2).key), PENDING)
+        self.assertEqual(self.outbox.status(entry(3).key), SENT)
+
+
+class TestOutboxRetry(unittest.IsolatedAsyncioTestCase):
+    """Test in-process retries of failed sends."""
+
+    async def test_failed_send_is_retried_while_running(self):
+        tmp = tempfile.TemporaryDirectory()
+        server = FakeTelegramServer()
+        base_url = await server.start()
+        settings = Settings(
+            TELEGRAM_BOT_TOKEN="1:test", TELEGRAM_API_URL=base_url, UPDATES_CHANNEL_ID="@updates",
+            OUTBOX_FILE=str(Path(tmp.name) / "outbox.sqlite3"), OUTBOX_RETRY_INTERVAL=0.05,
+            HISTORY_ENABLED=False, FORECAST_ENABLED=False
+        )
+        app = RobloxGardenApp(settings)
+        await app.telegram_bot.initialize()
+        app.outbox.open()
+        retry_task = asyncio.create_task(app._outbox_retry_loop())
+        try:
+            server.blocked_chats.add("@updates")
+            await app._on_message_rendered(MessageRendered(Channel.UPDATES, "hello", snapshot_hash="s1"))
+            [pending] = app.outbox.pending()
+            self.assertEqual(server.errors_sent[403], 1)
+
+            server.blocked_chats.clear()
+            for _ in range(50):
+                if not app.outbox.pending():
+                    break
+                await asyncio.sleep(0.02)
+
+            self.assertEqual(app.outbox.status(pending.key), SENT)
+            self.assertEqual([m.text for m in server.messages_to("@updates")], ["hello"])
+        finally:
+            retry_task.cancel()
+            await app.outbox.close()
+            await app.telegram_bot.shutdown()
+            await server.stop()
+            tmp.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
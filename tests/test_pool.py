@@ -0,0 +1,146 @@
+"""Tests for the multi-token bot pool."""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from aiogram.exceptions import TelegramRetryAfter, TelegramUnauthorizedError
+from aiogram.methods import SendMessage
+
+from roblox_garden.config.settings import Settings
+from roblox_garden.telegram.bot import TelegramBot
+from roblox_garden.telegram.delivery import DeliveryQueue
+from roblox_garden.telegram.pool import BotPool, HashRing, PoolMember
+
+CHATS = [f"@channel{n}" for n in range(200)]
+
+
+class FakeAiogramBot:
+    """Records sends; a revoked bot answers 401, a flooded one 429."""
+
+    def __init__(self, name: str, revoked: bool = False):
+        self.name = name
+        self.revoked = revoked
+        self.flooded = False
+        self.sent = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        method = SendMessage(chat_id=chat_id, text=text)
+        if self.revoked:
+            raise TelegramUnauthorizedError(method=method, message="Unauthorized")
+        if self.flooded:
+            raise TelegramRetryAfter(method=method, message="Too Many Requests", retry_after=30)
+        self.sent.append((chat_id, text))
+        return SimpleNamespace(message_id=len(self.sent))
+
+
+class TestHashRing(unittest.TestCase):
+    """Test consistent hashing of chats to tokens."""
+
+    def test_removal_only_moves_chats_of_removed_node(self):
+        """Chats of remaining nodes keep their node."""
+        ring = HashRing(["a", "b", "c"])
+        before = {chat: next(ring.nodes_for(chat)) for chat in CHATS}
+        self.assertEqual(set(before.values()), {"a", "b", "c"})
+
+        ring.remove("b")
+        after = {chat: next(ring.nodes_for(chat)) for chat in CHATS}
+        for chat in CHATS:
+            if before[chat] != "b":
+                self.assertEqual(after[chat], before[chat])
+        self.assertNotIn("b", after.values())
+
+
+class TestBotPool(unittest.TestCase):
+    """Test routing around throttled and revoked tokens."""
+
+    def setUp(self):
+        self.pool = BotPool(
+            [PoolMember(f"{n}:secret", DeliveryQueue()) for n in (1, 2, 3)],
+            throttle_threshold=10
+        )
+
+    def test_private_chats_use_first_token(self):
+        """Only the bot a user started can message them."""
+        self.assertIs(self.pool.member_for("123456"), self.pool.primary)
+
+    def test_throttled_token_is_skipped(self):
+        """Long flood waits on several chats move new messages to other tokens meanwhile."""
+        chat = CHATS[0]
+        owner = self.pool.member_for(chat)
+        other_chat = next(c for c in CHATS[1:] if self.pool.member_for(c) is owner)
+        self.pool.report_retry_after(owner, chat, 5)
+        self.pool.report_retry_after(owner, other_chat, 5)
+        self.assertIs(self.pool.member_for(chat), owner)
+
+        # One flooded chat is not a bot-wide limit
+        self.pool.report_retry_after(owner, chat, 30)
+        self.assertIs(self.pool.member_for(chat), owner)
+
+        self.pool.report_retry_after(owner, other_chat, 30)
+        self.assertIsNot(self.pool.member_for(chat), owner)
+        # Calls on messages the owner sent still go to it
+        self.assertIs(self.pool.member_for(chat, owner=True), owner)
+
+
+class TestTelegramBotPool(unittest.IsolatedAsyncioTestCase):
+    """Test sending through several tokens."""
+
+    async def asyncSetUp(self):
+        settings = Settings(TELEGRAM_BOT_TOKEN="1:a", TELEGRAM_EXTRA_BOT_TOKENS=["2:b", "3:c"])
+        self.bot = TelegramBot(settings)
+        for member in self.bot.pool.members.values():
+            member.bot = FakeAiogramBot(member.name)
+        self.bot.is_initialized = True
+
+    async def asyncTearDown(self):
+        await self.bot.shutdown()
+
+    async def test_chats_are_spread_over_tokens(self):
+        """Every token sends, each chat through one of them."""
+        for chat in CHATS[:30]:
+            self.assertTrue(await self.bot.send_message("hi", chat))
+
+        senders = {name: [chat for chat, _ in member.bot.sent] for name, member in self.bot.pool.members.items()}
+        self.assertTrue(all(senders.values()))
+        self.assertEqual(sorted(sum(senders.values(), [])), sorted(CHATS[:30]))
+
+    async def test_revoked_token_is_replaced(self):
+        """Messages of a rejected token go out through the others."""
+        chat = CHATS[0]
+        owner = self.bot.pool.member_for(chat)
+        owner.bot.revoked = True
+
+        self.assertTrue(await self.bot.send_message("hi", chat))
+        self.assertTrue(owner.revoked)
+        self.assertIsNot(self.bot.pool.member_for(chat), owner)
+
+    async def test_bot_wide_flood_moves_queued_calls(self):
+        """Calls waiting on a throttled token go out through the chat's new token, in order."""
+        chat = CHATS[0]
+        owner = self.bot.pool.member_for(chat)
+        other_chat = next(c for c in CHATS[1:] if self.bot.pool.member_for(c) is owner)
+        owner.bot.flooded = True
+
+        first = asyncio.create_task(self.bot.send_message("first", chat))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(self.bot.send_message("second", chat))
+        await asyncio.sleep(0.01)
+        # A single flooded chat waits on its own token
+        self.assertFalse(first.done())
+        self.assertIs(self.bot.pool.member_for(chat), owner)
+
+        # A second flooded chat makes the limit bot-wide
+        self.assertTrue(await asyncio.wait_for(self.bot.send_message("hi", other_chat), 1))
+        self.assertTrue(await asyncio.wait_for(first, 1))
+        self.assertTrue(await asyncio.wait_for(second, 1))
+
+        new_owner = self.bot.pool.member_for(chat)
+        self.assertIsNot(new_owner, owner)
+        self.assertEqual([text for c, text in new_owner.bot.sent if c == chat], ["first", "second"])
+        self.assertEqual(owner.bot.sent, [])
+        self.assertGreaterEqual(owner.delivery.get_metrics()["rerouted"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
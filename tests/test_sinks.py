@@ -0,0 +1,111 @@
+"""Tests for event sinks."""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import unittest
+import warnings
+
+from aiohttp import web
+
+from roblox_garden.models.shop import ItemType, Rarity, ShopItem
+from roblox_garden.sinks import Sink, SinkBatcher, SinkEvent, WebhookSink
+from roblox_garden.sinks.base import NEW_ITEMS
+from roblox_garden.telegram.bot import TelegramBot
+
+GRAPE = ShopItem(id="grape", name="Grape", type=ItemType.SEED, rarity=Rarity.DIVINE, quantity=1, in_stock=True)
+
+
+class Receiver:
+    """Local webhook endpoint recording request bodies and connections."""
+
+    def __init__(self):
+        self.bodies = []
+        self.peers = set()
+        self.fail_next = 0
+        self.app = web.Application()
+        self.app.router.add_post("/hook", self.handle)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.peers.add(request.transport.get_extra_info("peername"))
+        if self.fail_next:
+            self.fail_next -= 1
+            return web.Response(status=503)
+        self.bodies.append((await request.read(), request.headers.get("X-Signature")))
+        return web.Response(status=204)
+
+    async def start(self) -> str:
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        return f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/hook"
+
+    async def stop(self) -> None:
+        await self.runner.cleanup()
+
+
+class TestWebhookSink(unittest.IsolatedAsyncioTestCase):
+    """Test batching, keep-alive and retries against a local receiver."""
+
+    async def asyncSetUp(self):
+        self.receiver = Receiver()
+        url = await self.receiver.start()
+        self.sink = WebhookSink(url, secret="s3cret", retry_delay=0.01)
+        self.batcher = SinkBatcher(self.sink, batch_size=10, flush_interval=0.05)
+        await self.batcher.start()
+
+    async def asyncTearDown(self):
+        await self.batcher.stop()
+        await self.receiver.stop()
+
+    async def test_events_are_batched_into_one_post(self):
+        """A burst of events becomes one signed JSON document."""
+        self.assertIsInstance(self.sink, Sink)
+        for n in range(3):
+            self.batcher.submit(SinkEvent(NEW_ITEMS, [GRAPE], snapshot_hash=f"h{n}"))
+        await asyncio.sleep(0.2)
+
+        [(body, signature)] = self.receiver.bodies
+        self.assertEqual(signature, hmac.new(b"s3cret", body, hashlib.sha256).hexdigest())
+        events = json.loads(body)["events"]
+        self.assertEqual([event["snapshot_hash"] for event in events], ["h0", "h1", "h2"])
+        self.assertEqual(events[0]["items"][0]["rarity"], "Divine")
+
+    async def test_connection_is_reused(self):
+        """Consecutive batches go over the same connection."""
+        for n in range(25):
+            self.batcher.submit(SinkEvent(NEW_ITEMS, [GRAPE]))
+        await asyncio.sleep(0.2)
+        self.batcher.submit(SinkEvent(NEW_ITEMS, [GRAPE]))
+        await asyncio.sleep(0.2)
+
+        self.assertEqual(len(self.receiver.bodies), 4)
+        self.assertEqual(len(self.receiver.peers), 1)
+        self.assertEqual(self.sink.metrics.events_sent, 26)
+
+    async def test_server_errors_are_retried(self):
+        """5xx answers are retried; repeated failures mark the sink unhealthy."""
+        self.receiver.fail_next = 1
+        self.assertTrue(await self.sink.send_batch([SinkEvent(NEW_ITEMS, [GRAPE])]))
+        self.assertEqual(len(self.receiver.bodies), 1)
+
+        self.receiver.fail_next = 100
+        for _ in range(3):
+            self.assertFalse(await self.sink.send_batch([SinkEvent(NEW_ITEMS, [GRAPE])]))
+        self.assertFalse(self.sink.healthy)
+
+
+class TestBotAiogramAlias(unittest.TestCase):
+    """Test the old module name."""
+
+    def test_alias(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            from roblox_garden.telegram import bot_aiogram
+        self.assertIs(bot_aiogram.TelegramBot, TelegramBot)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+"""Tests for user subscriptions managed through bot commands."""
+
+import os
+import tempfile
+import unittest
+
+from roblox_garden.config.settings import Settings
+from roblox_garden.core.application import RobloxGardenApp
+from roblox_garden.core.events import Channel, SnapshotReceived
+from roblox_garden.filters.query import QueryError, parse_query
+from roblox_garden.filters.subscriptions import SubscriptionIndex, SubscriptionStore
+from roblox_garden.models.shop import ItemType, Rarity, ShopData, ShopItem
+from roblox_garden.telegram.fake_server import FakeTelegramServer
+from roblox_garden.telegram.outbox import EXPIRED, SENT, make_key
+from roblox_garden.telegram.subscriber_bot import SubscriberBot
+
+
+def make_item(name: str, item_type: ItemType, rarity: Rarity) -> ShopItem:
+    """Build an in-stock item."""
+    return ShopItem(id=name.lower(), name=name, type=item_type, rarity=rarity, quantity=1, in_stock=True)
+
+
+GRAPE = make_item("Grape", ItemType.SEED, Rarity.DIVINE)
+BEANSTALK = make_item("Beanstalk", ItemType.SEED, Rarity.PRISMATIC)
+BUG_EGG = make_item("Bug Egg", ItemType.EGG, Rarity.DIVINE)
+
+
+class TestParseQuery(unittest.TestCase):
+    """Test the subscription query language."""
+
+    def test_types_and_rarities(self):
+        """Type and rarity words narrow the rule."""
+        rule = parse_query("prismatic seeds")
+        self.assertEqual(rule.types, {ItemType.SEED})
+        self.assertEqual(rule.rarities, {Rarity.PRISMATIC})
+
+        item_filter = rule.to_filter()
+        self.assertTrue(item_filter.should_include(BEANSTALK))
+        self.assertFalse(item_filter.should_include(GRAPE))
+
+    def test_min_rarity_and_names(self):
+        """`rarity+` sets the minimum rarity, quoted names select items."""
+        rule = parse_query('divine+ "bug egg"')
+        self.assertEqual(rule.min_rarity, Rarity.DIVINE)
+        self.assertEqual(rule.include_names, {"Bug Egg"})
+
+    def test_invalid_queries(self):
+        """Unknown words and broken quotes are rejected."""
+        for query in ("", "shiny seeds", '"grape', "divine+ mythical+"):
+            with self.assertRaises(QueryError):
+                parse_query(query)
+
+
+class TestSubscriberBot(unittest.TestCase):
+    """Test command handling against the store and the index."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_file = os.path.join(self.tmp.name, "subscribers.sqlite3")
+        self.index = SubscriptionIndex()
+        self.store = SubscriptionStore(self.db_file)
+        self.subscriber_bot = SubscriberBot(None, self.store, self.index, max_per_chat=2)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_subscribe_updates_index(self):
+        """A new subscription matches on the next poll."""
+        reply = self.subscriber_bot.handle_command("42", "/subscribe prismatic seeds")
+        self.assertIn("✅", reply)
+        self.assertEqual(self.index.match_items([GRAPE, BEANSTALK]), {"42": [BEANSTALK]})
+
+    def test_unsubscribe_and_list(self):
+        """Subscriptions can be listed and removed one by one or all at once."""
+        self.subscriber_bot.handle_command("42", "/subscribe prismatic seeds")
+        self.subscriber_bot.handle_command("42", "/subscribe@garden_bot divine+ eggs")
+        self.assertIn("divine+ eggs", self.subscriber_bot.handle_command("42", "/list"))
+        self.assertIn("❌", self.subscriber_bot.handle_command("42", "/subscribe all"))
+
+        row_id = self.store.list("42")[0][0]
+        self.subscriber_bot.handle_command("42", f"/unsubscribe {row_id}")
+        self.assertEqual(self.index.match_items([BEANSTALK, BUG_EGG]), {"42": [BUG_EGG]})
+
+        self.subscriber_bot.handle_command("42", "/unsubscribe")
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.store.list("42"), [])
+
+    def test_subscriptions_survive_restart(self):
+        """Stored subscriptions are loaded into a fresh index."""
+        self.subscriber_bot.handle_command("42", '/subscribe "Grape"')
+        self.subscriber_bot.handle_command("7", "/subscribe prismatic")
+        self.store.close()
+
+        self.store = SubscriptionStore(self.db_file)
+        index = SubscriptionIndex()
+        self.assertEqual(SubscriberBot(None, self.store, index).load(), 2)
+        self.assertEqual(index.match_items([GRAPE, BEANSTALK]), {"42": [GRAPE], "7": [BEANSTALK]})
+
+
+
+class TestSubscriptionDelivery(unittest.IsolatedAsyncioTestCase):
+    """Test fan-out of subscription messages to user chats."""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.server = FakeTelegramServer()
+        base_url = await self.server.start()
+        settings = Settings(
+            TELEGRAM_BOT_TOKEN="1:test", TELEGRAM_API_URL=base_url, UPDATES_CHANNEL_ID="@updates",
+            SUBSCRIBER_BOT_ENABLED=True, SUBSCRIBER_DB_FILE=os.path.join(self.tmp.name, "subscribers.sqlite3"),
+            OUTBOX_FILE=os.path.join(self.tmp.name, "outbox.sqlite3"),
+            HISTORY_ENABLED=False, FORECAST_ENABLED=False
+        )
+        self.app = RobloxGardenApp(settings)
+        await self.app.telegram_bot.initialize()
+        self.app.outbox.open()
+
+        self.published = []
+
+        async def publish(event):
+            self.published.append(event)
+
+        self.app.event_bus.publish = publish
+
+    async def asyncTearDown(self):
+        await self.app.outbox.close()
+        await self.app.telegram_bot.shutdown()
+        self.app.subscriber_bot.store.close()
+        await self.server.stop()
+        self.tmp.cleanup()
+
+    async def test_same_items_go_out_as_one_broadcast(self):
+        """Chats matching the same items share one render; a blocked chat loses its subscriptions."""
+        for chat_id in ("1", "2", "3"):
+            self.app.subscriber_bot.handle_command(chat_id, "/subscribe prismatic seeds")
+        self.app.subscriber_bot.handle_command("4", "/subscribe divine+ eggs")
+        self.server.blocked_chats.add("3")
+
+        shop_data = ShopData(items=[GRAPE, BEANSTALK, BUG_EGG])
+        await self.app._on_snapshot_for_subscriptions(SnapshotReceived(shop_data))
+
+        self.assertEqual(sorted(len(event.chat_ids) for event in self.published), [1, 3])
+        for event in self.published:
+            self.assertEqual(event.channel, Channel.DIRECT)
+            await self.app._on_message_rendered(event)
+
+        for chat_id in ("1", "2", "4"):
+            self.assertEqual(len(self.server.messages_to(chat_id)), 1)
+        self.assertEqual(self.server.errors_sent[403], 1)
+
+        key = make_key(Channel.DIRECT.value, "3", shop_data.snapshot_hash())
+        self.assertEqual(self.app.outbox.status(key), EXPIRED)
+        self.assertEqual(self.app.outbox.status(make_key(Channel.DIRECT.value, "1", shop_data.snapshot_hash())), SENT)
+        self.assertEqual(self.app.outbox.pending(), [])
+        self.assertEqual(self.app.subscriber_bot.store.count("3"), 0)
+        self.assertNotIn("3", self.app.subscription_index.match_items([BEANSTALK]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Tests for the subscription index."""
+
+import random
+import unittest
+
+from roblox_garden.models.shop import ShopItem, ItemType, Rarity
+from roblox_garden.filters.rules import FilterRule
+from roblox_garden.filters.subscriptions import Subscription, SubscriptionIndex
+
+NAMES = ["Giant Pinecone", "Grape", "Master Sprinkler", "Harvest Tool", "Bug Egg", "Paradise Egg"]
+TYPES = [ItemType.SEED, ItemType.GEAR, ItemType.EGG]
+RARITIES = [Rarity.COMMON, Rarity.LEGENDARY, Rarity.DIVINE, Rarity.MYTHICAL, Rarity.PRISMATIC]
+
+
+def random_rule(rng: random.Random, position: int) -> FilterRule:
+    """Build a random rule."""
+    return FilterRule(
+        name=f"rule {position}",
+        types=set(rng.sample(TYPES, rng.randint(0, 2))),
+        min_rarity=rng.choice([None, Rarity.DIVINE, Rarity.PRISMATIC]),
+        rarities=rng.choice([None, set(rng.sample(RARITIES, 3))]),
+        include_names=rng.choice([None, set(rng.sample(NAMES, 2))]),
+        exclude_names=set(rng.sample(NAMES, rng.randint(0, 1))),
+        in_stock=rng.random() < 0.8,
+    )
+
+
+class TestSubscriptionIndex(unittest.TestCase):
+    """Test index matching against brute-force filter evaluation."""
+    
+    def setUp(self):
+        """Build random subscriptions and items."""
+        rng = random.Random(42)
+        self.index = SubscriptionIndex()
+        self.filters = {}
+        
+        for position in range(200):
+            rule = random_rule(rng, position)
+            self.index.add(Subscription(position, f"chat{position % 50}", rule))
+            self.filters[position] = rule.to_filter()
+        
+        self.items = [
+            ShopItem(
+                id=f"{item_type.value}_{name}_{rarity.value}_{in_stock}",
+                name=name,
+                type=item_type,
+                rarity=rarity,
+                quantity=int(in_stock),
+                in_stock=in_stock
+            )
+            for name in NAMES
+            for item_type in TYPES
+            for rarity in RARITIES
+            for in_stock in (True, False)
+        ]
+    
+    def brute_force(self, item: ShopItem) -> set:
+        """Match item by evaluating every subscription filter."""
+        return {sid for sid, f in self.filters.items() if f.should_include(item)}
+    
+    def test_match_equals_brute_force(self):
+        """Index returns exactly the subscriptions whose filters accept the item."""
+        for item in self.items:
+            self.assertEqual(self.index.match(item), self.brute_force(item), item.id)
+    
+    def test_match_leaves_index_untouched(self):
+        """Matches are fresh sets; editing one never changes the index."""
+        for item in self.items:
+            self.index.match(item).clear()
+        for item in self.items:
+            self.assertEqual(self.index.match(item), self.brute_force(item), item.id)
+    
+    def test_remove_subscriptions(self):
+        """Removed subscriptions no longer match."""
+        for sid in range(0, 200, 2):
+            self.assertTrue(self.index.remove(sid))
+            del self.filters[sid]
+        
+        self.assertFalse(self.index.remove(0))
+        self.assertEqual(len(self.index), 100)
+        for item in self.items:
+            self.assertEqual(self.index.match(item), self.brute_force(item), item.id)
+    
+    def test_match_items_groups_by_subscriber(self):
+        """Items are grouped per subscriber without duplicates."""
+        index = SubscriptionIndex()
+        index.add(Subscription("a", "chat", FilterRule(name="seeds", types={ItemType.SEED})))
+        index.add(Subscription("b", "chat", FilterRule(name="divine", min_rarity=Rarity.DIVINE)))
+        
+        seed = self.items[0]
+        self.assertEqual(index.match_items([seed]), {"chat": [seed]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Tests for alert latency tracing."""
+
+import asyncio
+import time
+import unittest
+
+from roblox_garden.config.settings import Settings
+from roblox_garden.core.application import RobloxGardenApp
+from roblox_garden.core.events import SnapshotReceived
+from roblox_garden.core.tracing import STAGES, Histogram, LatencyTracer
+from roblox_garden.models.shop import ItemType, Rarity, ShopData, ShopItem
+from roblox_garden.telegram.fake_server import FakeTelegramServer
+
+
+def make_snapshot(fetch_time: float = 0.0) -> ShopData:
+    """Build a snapshot with one in-stock item fetched just now."""
+    now = time.monotonic()
+    item = ShopItem(id="grape", name="Grape", type=ItemType.SEED, rarity=Rarity.DIVINE, quantity=1, in_stock=True)
+    return ShopData(items=[item], fetch_started_at=now - fetch_time, fetch_finished_at=now)
+
+
+class TestLatencyTracer(unittest.TestCase):
+    """Test histograms and the slowest cycles."""
+
+    def test_histogram_percentiles(self):
+        """Percentiles are bucket bounds, never above the maximum."""
+        histogram = Histogram()
+        for value in [0.004] * 90 + [0.7] * 10:
+            histogram.observe(value)
+        self.assertEqual(histogram.percentile(50), 0.005)
+        self.assertEqual(histogram.percentile(95), 0.7)
+        self.assertAlmostEqual(histogram.mean, 0.0736)
+
+    def test_slowest_cycles_are_kept(self):
+        """Only the N slowest traces are retained, with their stages."""
+        tracer = LatencyTracer(slowest=2)
+        for fetch_time in (0.1, 0.5, 0.3):
+            trace = tracer.start(make_snapshot(fetch_time), "alert")
+            tracer.finish(trace)
+            tracer.finish(trace)
+
+        self.assertEqual(tracer.histograms["total"].count, 3)
+        slowest = tracer.slowest()
+        self.assertEqual(len(slowest), 2)
+        self.assertGreater(slowest[0].total, slowest[1].total)
+        self.assertAlmostEqual(slowest[1].breakdown()["polling"], 0.3, places=3)
+
+
+class TestAlertTracing(unittest.IsolatedAsyncioTestCase):
+    """Test stage marks along the whole alert pipeline."""
+
+    async def test_alert_is_traced_to_acknowledgement(self):
+        server = FakeTelegramServer(latency=0.05)
+        base_url = await server.start()
+        settings = Settings(
+            TELEGRAM_BOT_TOKEN="1:test", TELEGRAM_API_URL=base_url, UPDATES_CHANNEL_ID="@updates",
+            OUTBOX_FILE="", HISTORY_ENABLED=False, FORECAST_ENABLED=False, ALERT_COALESCE_WINDOW=0
+        )
+        app = RobloxGardenApp(settings)
+        await app.telegram_bot.initialize()
+        app.event_bus.start()
+        try:
+            await app.event_bus.publish(SnapshotReceived(make_snapshot(0.2)))
+            for _ in range(50):
+                if app.latency_tracer.histograms:
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            await app.event_bus.stop()
+            await app.telegram_bot.shutdown()
+            await server.stop()
+
+        [trace] = app.latency_tracer.slowest()
+        durations = trace.durations()
+        self.assertEqual(list(durations), list(STAGES))
+        self.assertAlmostEqual(durations["fetch"], 0.2, places=3)
+        self.assertGreaterEqual(durations["send"], 0.05)
+        self.assertAlmostEqual(sum(durations.values()), trace.total)
+
+
+if __name__ == '__main__':
+    unittest.main()